@@ -1,6 +1,7 @@
 import asyncio
 
 from . import server
+from .async_client import AsyncFetcher
 from .jira import JiraFetcher
 from .types import Document
 
@@ -12,4 +13,4 @@ def main():
     asyncio.run(server.main())
 
 
-__all__ = ["main", "server", "__version__", "JiraFetcher", "Document"]
+__all__ = ["main", "server", "__version__", "JiraFetcher", "AsyncFetcher", "Document"]
@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("mcp-atlassian")
+
+# Shared pool for blocking Atlassian API calls, sized by MCP_ATLASSIAN_MAX_WORKERS
+DEFAULT_MAX_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool used to run blocking API calls."""
+    global _executor
+    if _executor is None:
+        max_workers = int(os.getenv("MCP_ATLASSIAN_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-atlassian")
+    return _executor
+
+
+class AsyncFetcher:
+    """
+    Async facade over a synchronous fetcher (JiraFetcher, ConfluenceFetcher, ...).
+
+    Every method call is run in a bounded thread pool, so blocking HTTP calls made
+    by atlassian-python-api don't stall the event loop and concurrent tool calls
+    are served in parallel.
+    """
+
+    def __init__(self, fetcher: Any, executor: Optional[ThreadPoolExecutor] = None):
+        self._fetcher = fetcher
+        self._executor = executor or get_executor()
+
+    @property
+    def fetcher(self) -> Any:
+        """The wrapped synchronous fetcher."""
+        return self._fetcher
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable in the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._fetcher, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,65 @@
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger("mcp-atlassian")
+
+
+def atomic_write_json(path: Path, data: Any):
+    """Write JSON to path via a temporary file and rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PageCache:
+    """
+    On-disk cache of processed Confluence page content, keyed by page ID and version.
+
+    A page's content never changes without its version number changing, so entries
+    don't expire; storing a new version removes the older ones for that page.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def _path(self, page_id: str, version: int) -> Path:
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", str(page_id))
+        return self.directory / f"{safe_id}-{version}.json"
+
+    def get(self, page_id: str, version: Optional[int]) -> Optional[dict]:
+        """Get cached content for a page version, or None on a miss."""
+        if version is None:
+            return None
+        path = self._path(page_id, version)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read page cache {path}: {e}")
+            return None
+
+    def put(self, page_id: str, version: Optional[int], content: dict):
+        """Store content for a page version and drop older versions of the page."""
+        if version is None:
+            return
+        path = self._path(page_id, version)
+        try:
+            atomic_write_json(path, content)
+            for old in self.directory.glob(f"{path.name.rsplit('-', 1)[0]}-*.json"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Could not write page cache {path}: {e}")
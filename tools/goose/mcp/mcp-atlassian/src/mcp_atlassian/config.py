@@ -1,4 +1,7 @@
+import os
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
 
 
 @dataclass
@@ -27,3 +30,20 @@ class JiraConfig:
     def is_cloud(self) -> bool:
         """Check if this is a cloud instance."""
         return "atlassian.net" in self.url
+
+
+def get_cache_dir() -> Optional[Path]:
+    """Directory for on-disk caches; set MCP_ATLASSIAN_CACHE_DIR to an empty string to disable."""
+    cache_dir = os.getenv("MCP_ATLASSIAN_CACHE_DIR", str(Path.home() / ".cache" / "mcp-atlassian"))
+    return Path(cache_dir).expanduser() if cache_dir else None
+
+
+def get_user_cache_ttl() -> float:
+    """Seconds a resolved user display name stays cached."""
+    return float(os.getenv("MCP_ATLASSIAN_USER_CACHE_TTL", 86400))
+
+
+def get_index_path() -> Optional[Path]:
+    """Location of the local search index; the index is disabled unless MCP_ATLASSIAN_INDEX_PATH is set."""
+    index_path = os.getenv("MCP_ATLASSIAN_INDEX_PATH")
+    return Path(index_path).expanduser() if index_path else None
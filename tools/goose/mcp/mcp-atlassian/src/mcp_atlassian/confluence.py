@@ -1,13 +1,15 @@
 import logging
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 
 from atlassian import Confluence
 from dotenv import load_dotenv
 
-from .config import ConfluenceConfig
+from .cache import PageCache
+from .config import ConfluenceConfig, get_cache_dir, get_user_cache_ttl
 from .preprocessing import TextPreprocessor
 from .types import Document
+from .user_resolver import UserResolver
 
 # Load environment variables
 load_dotenv()
@@ -34,7 +36,27 @@ class ConfluenceFetcher:
             password=self.config.api_token,  # API token is used as password
             cloud=True,
         )
-        self.preprocessor = TextPreprocessor(self.config.url, self.confluence)
+        cache_dir = get_cache_dir()
+        self.user_resolver = UserResolver(
+            bulk_lookup=self._bulk_user_lookup,
+            single_lookup=self._single_user_lookup,
+            ttl=get_user_cache_ttl(),
+            cache_path=cache_dir / "confluence_users.json" if cache_dir else None,
+        )
+        self.preprocessor = TextPreprocessor(self.config.url, self.confluence, user_resolver=self.user_resolver)
+        self.page_cache = PageCache(cache_dir / "pages") if cache_dir else None
+
+    def _bulk_user_lookup(self, account_ids: List[str]) -> Dict[str, str]:
+        """Resolve display names for several account IDs in one request."""
+        response = self.confluence.get("rest/api/user/bulk", params={"accountId": ",".join(account_ids)})
+        return {
+            user["accountId"]: user.get("displayName", user["accountId"])
+            for user in (response or {}).get("results", [])
+        }
+
+    def _single_user_lookup(self, account_id: str) -> Optional[str]:
+        """Resolve the display name for a single account ID."""
+        return self.confluence.get_user_details_by_accountid(account_id).get("displayName")
 
     def _process_html_content(self, html_content: str, space_key: str) -> tuple[str, str]:
         return self.preprocessor.process_html_content(html_content, space_key)
@@ -48,11 +70,20 @@ class ConfluenceFetcher:
         page = self.confluence.get_page_by_id(page_id=page_id, expand="body.storage,version,space")
         space_key = page.get("space", {}).get("key", "")
 
-        content = page["body"]["storage"]["value"]
-        processed_html, processed_markdown = self._process_html_content(content, space_key)
-
         # Get author information from version
         version = page.get("version", {})
+
+        # Unchanged pages are served from the cache without re-running the conversion
+        cached = self.page_cache.get(page_id, version.get("number")) if self.page_cache else None
+        if cached:
+            processed_html, processed_markdown = cached["html"], cached["markdown"]
+        else:
+            content = page["body"]["storage"]["value"]
+            processed_html, processed_markdown = self._process_html_content(content, space_key)
+            if self.page_cache:
+                self.page_cache.put(
+                    page_id, version.get("number"), {"html": processed_html, "markdown": processed_markdown}
+                )
         author = version.get("by", {})
 
         metadata = {
@@ -1,10 +1,13 @@
 import logging
 import os
+from typing import Dict, List, Optional
+
 from dotenv import load_dotenv
 from atlassian import Jira
 
-from .config import JiraConfig
+from .config import JiraConfig, get_cache_dir, get_user_cache_ttl
 from .preprocessing import TextPreprocessor
+from .user_resolver import UserResolver
 
 # Load environment variables
 load_dotenv()
@@ -30,7 +33,30 @@ class JiraClient:
             password=self.config.api_token,  # API token is used as password
             cloud=True,
         )
-        self.preprocessor = TextPreprocessor(self.config.url)
+        cache_dir = get_cache_dir()
+        self.user_resolver = UserResolver(
+            bulk_lookup=self._bulk_user_lookup,
+            single_lookup=self._single_user_lookup,
+            ttl=get_user_cache_ttl(),
+            cache_path=cache_dir / "jira_users.json" if cache_dir else None,
+        )
+        self.preprocessor = TextPreprocessor(self.config.url, user_resolver=self.user_resolver)
+
+    def _bulk_user_lookup(self, account_ids: List[str]) -> Dict[str, str]:
+        """Resolve display names for several account IDs in one request."""
+        response = self.jira.get(
+            "rest/api/3/user/bulk",
+            params={"accountId": account_ids, "maxResults": len(account_ids)},
+        )
+        return {
+            user["accountId"]: user.get("displayName", user["accountId"])
+            for user in (response or {}).get("values", [])
+        }
+
+    def _single_user_lookup(self, account_id: str) -> Optional[str]:
+        """Resolve the display name for a single account ID."""
+        user = self.jira.user(account_id=account_id)
+        return (user or {}).get("displayName")
 
     def _clean_text(self, text: str) -> str:
         """
@@ -1,9 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from .jira_client import JiraClient, logger
 from .types import Document
 
+# Fields needed to build an issue Document without a further fetch
+DOCUMENT_FIELDS = ("summary", "issuetype", "status", "created", "description", "comment", "priority")
+REQUIRED_FIELDS = ("issuetype", "status", "created")
+
+# Jira accepts at most 50 issues per /issue/bulk request
+BULK_BATCH_SIZE = 50
+# Concurrent requests for bulk operations without a bulk endpoint
+BULK_WORKERS = 8
+
+
 class JiraIssues(JiraClient):
     """Handles Jira issue operations."""
 
@@ -38,26 +49,46 @@ class JiraIssues(JiraClient):
         """
         try:
             issue = self.jira.issue(issue_key, expand=expand)
+            return self._build_document(issue)
+
+        except Exception as e:
+            logger.error(f"Error fetching issue {issue_key}: {str(e)}")
+            raise
+
+    def _build_document(self, issue: dict) -> Document:
+        """
+        Build a Document from a raw issue, as returned by the issue or search endpoints.
+
+        Args:
+            issue: Raw issue dict containing at least the fields in DOCUMENT_FIELDS
 
-            # Process description and comments
-            description = self._clean_text(issue["fields"].get("description", ""))
-
-            # Get comments
-            comments = []
-            if "comment" in issue["fields"]:
-                for comment in issue["fields"]["comment"]["comments"]:
-                    processed_comment = self._clean_text(comment["body"])
-                    created = self._parse_date(comment["created"])
-                    author = comment["author"].get("displayName", "Unknown")
-                    comments.append(
-                        {"body": processed_comment, "created": created, "author": author}
-                    )
-
-            # Format created date
-            created_date = self._parse_date(issue["fields"]["created"])
-
-            # Combine content in a more structured way
-            content = f"""Issue: {issue_key}
+        Returns:
+            Document containing issue content and metadata
+        """
+        issue_key = issue["key"]
+
+        # Resolve all user mentions in this issue with one lookup
+        self.preprocessor.prefetch_jira_mentions(self._issue_texts(issue))
+
+        # Process description and comments
+        description = self._clean_text(issue["fields"].get("description", ""))
+
+        # Get comments
+        comments = []
+        if issue["fields"].get("comment"):
+            for comment in issue["fields"]["comment"]["comments"]:
+                processed_comment = self._clean_text(comment["body"])
+                created = self._parse_date(comment["created"])
+                author = comment["author"].get("displayName", "Unknown")
+                comments.append(
+                    {"body": processed_comment, "created": created, "author": author}
+                )
+
+        # Format created date
+        created_date = self._parse_date(issue["fields"]["created"])
+
+        # Combine content in a more structured way
+        content = f"""Issue: {issue_key}
 Title: {issue['fields'].get('summary', '')}
 Type: {issue['fields']['issuetype']['name']}
 Status: {issue['fields']['status']['name']}
@@ -68,25 +99,29 @@ Description:
 
 Comments:
 """ + "\n".join(
-                [f"{c['created']} - {c['author']}: {c['body']}" for c in comments]
-            )
-
-            # Streamlined metadata with only essential information
-            metadata = {
-                "key": issue_key,
-                "title": issue["fields"].get("summary", ""),
-                "type": issue["fields"]["issuetype"]["name"],
-                "status": issue["fields"]["status"]["name"],
-                "created_date": created_date,
-                "priority": issue["fields"].get("priority", {}).get("name", "None"),
-                "link": f"{self.config.url.rstrip('/')}/browse/{issue_key}",
-            }
-
-            return Document(page_content=content, metadata=metadata)
-
-        except Exception as e:
-            logger.error(f"Error fetching issue {issue_key}: {str(e)}")
-            raise
+            [f"{c['created']} - {c['author']}: {c['body']}" for c in comments]
+        )
+
+        # Streamlined metadata with only essential information
+        metadata = {
+            "key": issue_key,
+            "title": issue["fields"].get("summary", ""),
+            "type": issue["fields"]["issuetype"]["name"],
+            "status": issue["fields"]["status"]["name"],
+            "created_date": created_date,
+            "priority": (issue["fields"].get("priority") or {}).get("name", "None"),
+            "link": f"{self.config.url.rstrip('/')}/browse/{issue_key}",
+        }
+
+        return Document(page_content=content, metadata=metadata)
+
+    def _issue_texts(self, issue: dict) -> List[str]:
+        """Get the description and comment bodies of a raw issue."""
+        fields = issue.get("fields") or {}
+        texts = [fields.get("description") or ""]
+        for comment in (fields.get("comment") or {}).get("comments", []):
+            texts.append(comment.get("body") or "")
+        return texts
 
     def create_issue(
         self,
@@ -114,20 +149,7 @@ Comments:
             Document containing the created issue
         """
         try:
-            fields = {
-                "project": {"key": project_key},
-                "summary": summary,
-                "description": description,
-                "issuetype": {"name": issue_type},
-            }
-
-            if priority:
-                fields["priority"] = {"name": priority}
-            if assignee:
-                fields["assignee"] = {"name": assignee}
-            if labels:
-                fields["labels"] = labels
-
+            fields = self._create_fields(project_key, summary, description, issue_type, priority, assignee, labels)
             new_issue = self.jira.create_issue(fields=fields)
             
             # Return the newly created issue as a Document
@@ -137,6 +159,64 @@ Comments:
             logger.error(f"Error creating issue in project {project_key}: {str(e)}")
             raise
 
+    def _create_fields(
+        self,
+        project_key: str,
+        summary: str,
+        description: str,
+        issue_type: str = "Task",
+        priority: Optional[str] = None,
+        assignee: Optional[str] = None,
+        labels: Optional[List[str]] = None,
+    ) -> dict:
+        """Build the fields payload for a new issue."""
+        fields = {
+            "project": {"key": project_key},
+            "summary": summary,
+            "description": description,
+            "issuetype": {"name": issue_type},
+        }
+
+        if priority:
+            fields["priority"] = {"name": priority}
+        if assignee:
+            fields["assignee"] = {"name": assignee}
+        if labels:
+            fields["labels"] = labels
+        return fields
+
+    def _update_fields(
+        self,
+        summary: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[str] = None,
+        assignee: Optional[str] = None,
+        labels: Optional[List[str]] = None,
+    ) -> dict:
+        """Build the fields payload for an issue update, skipping unset values."""
+        fields = {}
+
+        if summary is not None:
+            fields["summary"] = summary
+        if description is not None:
+            fields["description"] = description
+        if priority is not None:
+            fields["priority"] = {"name": priority}
+        if assignee is not None:
+            fields["assignee"] = {"name": assignee}
+        if labels is not None:
+            fields["labels"] = labels
+        return fields
+
+    def _transition(self, issue_key: str, status: str) -> bool:
+        """Transition an issue to the named status; returns False if no such transition exists."""
+        transitions = self.jira.get_issue_transitions(issue_key)
+        for t in transitions:
+            if t["name"].lower() == status.lower():
+                self.jira.transition_issue(issue_key, t["id"])
+                return True
+        return False
+
     def update_issue(
         self,
         issue_key: str,
@@ -163,36 +243,15 @@ Comments:
             Document containing the updated issue
         """
         try:
-            fields = {}
-            
-            if summary is not None:
-                fields["summary"] = summary
-            if description is not None:
-                fields["description"] = description
-            if priority is not None:
-                fields["priority"] = {"name": priority}
-            if assignee is not None:
-                fields["assignee"] = {"name": assignee}
-            if labels is not None:
-                fields["labels"] = labels
+            fields = self._update_fields(summary, description, priority, assignee, labels)
 
             # Update the issue fields
             if fields:
                 self.jira.update_issue_field(issue_key, fields)
 
             # Handle status transition if requested
-            if status is not None:
-                transitions = self.jira.get_issue_transitions(issue_key)
-                transition_id = None
-                for t in transitions:
-                    if t["name"].lower() == status.lower():
-                        transition_id = t["id"]
-                        break
-                
-                if transition_id:
-                    self.jira.transition_issue(issue_key, transition_id)
-                else:
-                    logger.warning(f"Could not find transition to status '{status}' for issue {issue_key}")
+            if status is not None and not self._transition(issue_key, status):
+                logger.warning(f"Could not find transition to status '{status}' for issue {issue_key}")
 
             # Return the updated issue
             return self.get_issue(issue_key)
@@ -218,4 +277,122 @@ Comments:
 
         except Exception as e:
             logger.error(f"Error adding comment to issue {issue_key}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def bulk_create_issues(self, issues: List[dict]) -> dict:
+        """
+        Create several issues through Jira's /issue/bulk endpoint.
+
+        Args:
+            issues: Issue definitions with the create_issue arguments
+                (project_key, summary, description, issue_type, priority, assignee, labels)
+
+        Returns:
+            Dict with "created" ({index, key}) and "failed" ({index, error}) entries,
+            where index is the position in the input list
+        """
+        created = []
+        failed = []
+        for batch_start in range(0, len(issues), BULK_BATCH_SIZE):
+            # Invalid definitions fail on their own instead of failing the whole request
+            issue_updates = []
+            positions = []
+            for i, issue in enumerate(issues[batch_start : batch_start + BULK_BATCH_SIZE], batch_start):
+                try:
+                    issue_updates.append({"fields": self._create_fields(**issue)})
+                    positions.append(i)
+                except TypeError as e:
+                    failed.append({"index": i, "error": str(e)})
+            if not issue_updates:
+                continue
+
+            try:
+                response = self.jira.post("rest/api/2/issue/bulk", data={"issueUpdates": issue_updates}) or {}
+            except Exception as e:
+                logger.error(f"Error bulk creating issues {positions[0]}-{positions[-1]}: {str(e)}")
+                failed.extend({"index": i, "error": str(e)} for i in positions)
+                continue
+
+            # Jira reports failures by position within the request; successes come back in order
+            errors = {error.get("failedElementNumber"): error for error in response.get("errors", [])}
+            new_issues = iter(response.get("issues", []))
+            for element, i in enumerate(positions):
+                if element in errors:
+                    element_errors = errors[element].get("elementErrors", {})
+                    messages = element_errors.get("errorMessages", []) + [
+                        f"{field}: {message}" for field, message in element_errors.get("errors", {}).items()
+                    ]
+                    failed.append({"index": i, "error": "; ".join(messages) or "Unknown error"})
+                else:
+                    new_issue = next(new_issues, None)
+                    if new_issue is None:
+                        failed.append({"index": i, "error": "Missing from bulk response"})
+                    else:
+                        created.append({"index": i, "key": new_issue["key"]})
+
+        failed.sort(key=lambda f: f["index"])
+        return {"created": created, "failed": failed}
+
+    def _run_bulk(self, items: List[dict], operation: Callable[[dict], None]) -> dict:
+        """Apply a per-issue operation concurrently and collect per-issue results."""
+        def run(item: dict) -> Optional[str]:
+            if not isinstance(item, dict) or not item.get("issue_key"):
+                return "Missing issue_key"
+            try:
+                operation(item)
+                return None
+            except Exception as e:
+                logger.error(f"Bulk operation failed for {item.get('issue_key')}: {str(e)}")
+                return str(e)
+
+        if not items:
+            return {"updated": [], "failed": []}
+        with ThreadPoolExecutor(max_workers=min(BULK_WORKERS, len(items))) as executor:
+            errors = list(executor.map(run, items))
+
+        return {
+            "updated": [item["issue_key"] for item, error in zip(items, errors) if error is None],
+            "failed": [
+                {"issue_key": item.get("issue_key") if isinstance(item, dict) else None, "error": error}
+                for item, error in zip(items, errors)
+                if error is not None
+            ],
+        }
+
+    def bulk_transition_issues(self, issue_keys: List[str], status: str) -> dict:
+        """
+        Transition several issues to a status concurrently.
+
+        Args:
+            issue_keys: Keys of the issues to transition
+            status: Target status name
+
+        Returns:
+            Dict with "updated" keys and "failed" ({issue_key, error}) entries
+        """
+        def transition(item: dict):
+            if not self._transition(item["issue_key"], status):
+                raise ValueError(f"No transition to status '{status}'")
+
+        return self._run_bulk([{"issue_key": key} for key in issue_keys], transition)
+
+    def bulk_update_issues(self, updates: List[dict]) -> dict:
+        """
+        Update fields of several issues concurrently.
+
+        Args:
+            updates: Updates with issue_key plus any of summary, description,
+                priority, assignee and labels
+
+        Returns:
+            Dict with "updated" keys and "failed" ({issue_key, error}) entries
+        """
+        def update(item: dict):
+            fields = self._update_fields(
+                **{k: v for k, v in item.items() if k in ("summary", "description", "priority", "assignee", "labels")}
+            )
+            if not fields:
+                raise ValueError("No fields to update")
+            self.jira.update_issue_field(item["issue_key"], fields)
+
+        return self._run_bulk(updates, update)
@@ -1,8 +1,16 @@
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .jira_client import JiraClient, logger
 from .types import Document
 
+# Fields needed to describe a node and discover its neighbours
+GRAPH_FIELDS = "summary,status,issuetype,issuelinks,subtasks,parent"
+GRAPH_RELATIONS = ("links", "subtasks", "epic")
+# JQL `key in (...)` batch size and concurrent searches per BFS level
+GRAPH_BATCH_SIZE = 50
+GRAPH_FETCH_WORKERS = 8
+
 class JiraLinks(JiraClient):
     """Handles Jira issue link operations."""
 
@@ -106,4 +114,156 @@ class JiraLinks(JiraClient):
 
         except Exception as e:
             logger.error(f"Error removing link {link_id} from issue {issue_key}: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def _search_all(self, jql: str, limit: Optional[int] = None) -> List[dict]:
+        """Run a JQL search with GRAPH_FIELDS and return raw issues, page by page up to `limit`."""
+        issues = []
+        start = 0
+        while limit is None or len(issues) < limit:
+            page_size = GRAPH_BATCH_SIZE if limit is None else min(GRAPH_BATCH_SIZE, limit - len(issues))
+            # "warn" reports deleted or inaccessible keys instead of failing the whole batch
+            results = self.jira.jql(jql, fields=GRAPH_FIELDS, start=start, limit=page_size, validate_query="warn")
+            page = results.get("issues", [])
+            issues.extend(page)
+            start += len(page)
+            if len(page) < page_size:
+                break
+        return issues
+
+    def _batched_search(self, clause: str, keys: List[str], limit: Optional[int] = None) -> Dict[str, dict]:
+        """Run `<clause> in (...)` searches over key batches concurrently, each up to `limit` issues."""
+        if not keys:
+            return {}
+        batches = [keys[i : i + GRAPH_BATCH_SIZE] for i in range(0, len(keys), GRAPH_BATCH_SIZE)]
+        jqls = []
+        for batch in batches:
+            quoted = ", ".join(f'"{k}"' for k in batch)
+            jqls.append(f"{clause} in ({quoted})")
+        with ThreadPoolExecutor(max_workers=min(GRAPH_FETCH_WORKERS, len(jqls))) as executor:
+            pages = list(executor.map(lambda jql: self._search_all(jql, limit), jqls))
+        return {issue["key"]: issue for page in pages for issue in page}
+
+    def _neighbours(self, issue: dict, relations: Iterable[str]) -> List[Tuple[str, str, str]]:
+        """Get (from_key, to_key, relation) edges from an issue's own fields."""
+        key = issue["key"]
+        fields = issue.get("fields") or {}
+        edges = []
+        if "links" in relations:
+            for link in fields.get("issuelinks") or []:
+                if "outwardIssue" in link:
+                    edges.append((key, link["outwardIssue"]["key"], link["type"].get("outward", link["type"]["name"])))
+                elif "inwardIssue" in link:
+                    edges.append((link["inwardIssue"]["key"], key, link["type"].get("outward", link["type"]["name"])))
+        if "subtasks" in relations:
+            for subtask in fields.get("subtasks") or []:
+                edges.append((key, subtask["key"], "subtask"))
+        if fields.get("parent"):
+            # A sub-task's parent is the same relation as the parent's subtasks field
+            if (fields.get("issuetype") or {}).get("subtask"):
+                if "subtasks" in relations:
+                    edges.append((fields["parent"]["key"], key, "subtask"))
+            elif "epic" in relations:
+                edges.append((fields["parent"]["key"], key, "parent of"))
+        return edges
+
+    def get_issue_graph(
+        self,
+        issue_key: str,
+        depth: int = 2,
+        max_issues: int = 200,
+        relations: Iterable[str] = GRAPH_RELATIONS,
+    ) -> dict:
+        """
+        Get the subgraph of issues reachable from an issue via links, subtasks and epic/parent relations.
+
+        The graph is expanded breadth-first. Each level is fetched with batched
+        `key in (...)` searches run concurrently, plus one batched `parent in (...)`
+        search for the children of epics on that level.
+
+        Args:
+            issue_key: The issue to start from
+            depth: How many relations away from the starting issue to expand
+            max_issues: Maximum number of issues in the graph
+            relations: Relations to follow: links, subtasks and/or epic
+
+        Returns:
+            Dict with the nodes, the edges between them, and whether max_issues cut the graph short
+        """
+        try:
+            relations = tuple(relations)
+            fetched: Dict[str, dict] = {}
+            nodes: Dict[str, dict] = {}
+            edges = set()
+            seen = {issue_key}
+            frontier = [issue_key]
+            truncated = False
+
+            for level in range(depth + 1):
+                if not frontier:
+                    break
+                fetched.update(self._batched_search("key", [k for k in frontier if k not in fetched]))
+
+                next_frontier = []
+
+                def visit(current: str, from_key: str, to_key: str, relation: str):
+                    nonlocal truncated
+                    edges.add((from_key, to_key, relation))
+                    neighbour = to_key if from_key == current else from_key
+                    if neighbour in seen:
+                        return
+                    if len(seen) >= max_issues:
+                        truncated = True
+                        return
+                    seen.add(neighbour)
+                    next_frontier.append(neighbour)
+
+                epics = []
+                for key in frontier:
+                    issue = fetched.get(key)
+                    if issue is None:
+                        continue
+                    fields = issue.get("fields") or {}
+                    nodes[key] = {
+                        "key": key,
+                        "summary": fields.get("summary", ""),
+                        "status": (fields.get("status") or {}).get("name"),
+                        "type": (fields.get("issuetype") or {}).get("name"),
+                        "depth": level,
+                    }
+                    if level == depth:
+                        # Don't expand the last level, but keep its edges to issues already in the graph
+                        for from_key, to_key, relation in self._neighbours(issue, relations):
+                            if from_key in seen and to_key in seen:
+                                edges.add((from_key, to_key, relation))
+                        continue
+                    for edge in self._neighbours(issue, relations):
+                        visit(key, *edge)
+                    if "epic" in relations and nodes[key]["type"] == "Epic":
+                        epics.append(key)
+
+                if epics:
+                    # Only fetch as many children as the graph still has room for, plus one to detect truncation
+                    budget = max_issues - len(seen) + 1
+                    children = self._batched_search("parent", epics, limit=budget)
+                    fetched.update(children)
+                    for child in children.values():
+                        epic_key = child["fields"]["parent"]["key"]
+                        visit(epic_key, epic_key, child["key"], "parent of")
+
+                frontier = next_frontier
+
+            # Only keep edges between issues that made it into the graph
+            graph_edges = [
+                {"from": f, "to": t, "relation": r} for f, t, r in sorted(edges) if f in nodes and t in nodes
+            ]
+            return {
+                "root": issue_key,
+                "nodes": sorted(nodes.values(), key=lambda n: (n["depth"], n["key"])),
+                "edges": graph_edges,
+                "truncated": truncated,
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting issue graph for {issue_key}: {str(e)}")
+            raise
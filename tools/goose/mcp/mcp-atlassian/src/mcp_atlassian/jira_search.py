@@ -1,9 +1,13 @@
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 
 from .jira_client import JiraClient, logger
-from .jira_issues import JiraIssues
+from .jira_issues import DOCUMENT_FIELDS, REQUIRED_FIELDS, JiraIssues
 from .types import Document
 
+# Upper bound on concurrent get_issue calls when hydrating search results
+MAX_HYDRATION_WORKERS = 8
+
 class JiraSearch(JiraClient):
     """Handles Jira search operations."""
 
@@ -11,41 +15,111 @@ class JiraSearch(JiraClient):
         super().__init__()
         self.issues = JiraIssues()
 
+    def _search_fields(self, fields: str) -> str:
+        """Make sure the fields needed to build Documents are part of the search."""
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        if "*all" in requested:
+            return fields
+        return ",".join(requested + [f for f in DOCUMENT_FIELDS if f not in requested])
+
     def search_issues(
-        self, jql: str, fields: str = "*all", start: int = 0, limit: int = 50, expand: Optional[str] = None
+        self,
+        jql: str,
+        fields: str = "*all",
+        start: int = 0,
+        limit: int = 50,
+        expand: Optional[str] = None,
+        hydrate: bool = False,
     ) -> List[Document]:
         """
         Search for issues using JQL.
 
+        Documents are built directly from the search response. Issues are only
+        fetched individually (concurrently) when hydrate is set, or when the
+        response lacks fields needed to build the Document.
+
         Args:
             jql: JQL query string
             fields: Comma-separated string of fields to return
             start: Starting index
             limit: Maximum results to return
             expand: Fields to expand
+            hydrate: Fetch full issue details for every result
 
         Returns:
             List of Documents containing matching issues
         """
+        documents, _ = self._search_page(jql, fields, start, limit, expand, hydrate)
+        return documents
+
+    def _search_page(
+        self,
+        jql: str,
+        fields: str = "*all",
+        start: int = 0,
+        limit: int = 50,
+        expand: Optional[str] = None,
+        hydrate: bool = False,
+    ) -> Tuple[List[Document], int]:
+        """
+        Run one page of a JQL search.
+
+        Returns:
+            Documents for the page and the number of raw issues the page contained
+        """
         try:
-            results = self.jira.jql(jql, fields=fields, start=start, limit=limit, expand=expand)
+            results = self.jira.jql(jql, fields=self._search_fields(fields), start=start, limit=limit, expand=expand)
+            issues = results["issues"]
 
-            documents = []
-            for issue in results["issues"]:
+            # Resolve user mentions across all results with one bulk lookup
+            self.issues.preprocessor.prefetch_jira_mentions(
+                text for issue in issues for text in self.issues._issue_texts(issue)
+            )
+
+            documents: List[Optional[Document]] = [None] * len(issues)
+            to_hydrate = []
+            for i, issue in enumerate(issues):
+                issue_fields = issue.get("fields") or {}
+                if hydrate or any(not issue_fields.get(f) for f in REQUIRED_FIELDS):
+                    to_hydrate.append(i)
+                    continue
                 try:
-                    # Get full issue details
-                    doc = self.issues.get_issue(issue["key"], expand=expand)
-                    documents.append(doc)
+                    documents[i] = self.issues._build_document(issue)
                 except Exception as e:
                     logger.error(f"Error processing issue {issue['key']}: {str(e)}")
-                    continue
 
-            return documents
+            if to_hydrate:
+                hydrated = self._hydrate_issues([issues[i]["key"] for i in to_hydrate], expand)
+                for i, doc in zip(to_hydrate, hydrated):
+                    documents[i] = doc
+
+            return [doc for doc in documents if doc is not None], len(issues)
 
         except Exception as e:
             logger.error(f"Error searching issues with JQL {jql}: {str(e)}")
             raise
 
+    def _hydrate_issues(self, issue_keys: List[str], expand: Optional[str] = None) -> List[Optional[Document]]:
+        """
+        Fetch full issue details concurrently.
+
+        Args:
+            issue_keys: Keys of the issues to fetch
+            expand: Fields to expand
+
+        Returns:
+            Documents in the same order as issue_keys, None for issues that failed
+        """
+        def fetch(issue_key: str) -> Optional[Document]:
+            try:
+                return self.issues.get_issue(issue_key, expand=expand)
+            except Exception as e:
+                logger.error(f"Error processing issue {issue_key}: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(MAX_HYDRATION_WORKERS, len(issue_keys))) as executor:
+            return list(executor.map(fetch, issue_keys))
+
     def get_project_issues(self, project_key: str, start: int = 0, limit: int = 50) -> List[Document]:
         """
         Get all issues for a project.
@@ -59,4 +133,34 @@ class JiraSearch(JiraClient):
             List of Documents containing project issues
         """
         jql = f"project = {project_key} ORDER BY created DESC"
-        return self.search_issues(jql, start=start, limit=limit)
\ No newline at end of file
+        return self.search_issues(jql, start=start, limit=limit)
+
+    def iter_project_issues(
+        self, project_key: str, after_key: Optional[str] = None, page_size: int = 50
+    ) -> Iterator[Document]:
+        """
+        Lazily iterate over all issues of a project, one search page at a time.
+
+        Issues are ordered by key descending so that a key works as a stable cursor:
+        passing the last key seen as after_key continues where a previous read stopped.
+
+        Args:
+            project_key: The project key
+            after_key: Only return issues ordered after this key
+            page_size: Issues fetched per request
+
+        Yields:
+            Documents containing project issues
+        """
+        jql = f"project = {project_key}"
+        if after_key:
+            jql += f' AND key < "{after_key}"'
+        jql += " ORDER BY key DESC"
+
+        start = 0
+        while True:
+            documents, fetched = self._search_page(jql, start=start, limit=page_size)
+            yield from documents
+            if fetched < page_size:
+                return
+            start += page_size
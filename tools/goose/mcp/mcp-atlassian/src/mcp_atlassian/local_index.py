@@ -0,0 +1,360 @@
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger("mcp-atlassian")
+
+# Fields fetched when mirroring issues; enough to build the issue Document
+INDEX_FIELDS = "summary,issuetype,status,priority,assignee,labels,created,updated,description,comment"
+
+# JQL compares `updated` in the user's profile timezone at minute precision, so
+# incremental syncs re-fetch a window before the watermark; upserts are idempotent
+SYNC_OVERLAP = timedelta(days=1)
+
+# Finding deleted or moved issues means listing every key of a project, so
+# incremental syncs only do it this often unless a prune is requested
+PRUNE_INTERVAL = timedelta(days=7)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    summary TEXT,
+    status TEXT,
+    issue_type TEXT,
+    priority TEXT,
+    assignee TEXT,
+    labels TEXT,
+    updated TEXT,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_project ON issues(project);
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(key UNINDEXED, summary, content);
+
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    space_key TEXT NOT NULL,
+    title TEXT,
+    version INTEGER,
+    last_modified TEXT,
+    url TEXT,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_space ON pages(space_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(page_id UNINDEXED, title, content);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    watermark TEXT,
+    synced_at TEXT,
+    PRIMARY KEY (source, scope)
+);
+"""
+
+
+def _parse_jira_datetime(value: str) -> datetime:
+    """Parse a Jira timestamp such as 2024-03-20T10:15:30.000+0000."""
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def _fts_query(query: str) -> str:
+    """Quote each term so arbitrary user input is a valid FTS5 query."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class LocalIndex:
+    """
+    Local SQLite FTS5 mirror of Jira issues and Confluence pages.
+
+    Issues are synced incrementally per project using the `updated` watermark,
+    pages per space by comparing version numbers. Searches run entirely locally.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One connection per operation keeps the index usable from the worker threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get_watermark(self, source: str, scope: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT watermark FROM sync_state WHERE source = ? AND scope = ?", (source, scope)
+            ).fetchone()
+        return row["watermark"] if row else None
+
+    def _get_synced_at(self, source: str, scope: str) -> Optional[datetime]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT synced_at FROM sync_state WHERE source = ? AND scope = ?", (source, scope)
+            ).fetchone()
+        return datetime.fromisoformat(row["synced_at"]) if row and row["synced_at"] else None
+
+    def _set_watermark(self, conn: sqlite3.Connection, source: str, scope: str, watermark: Optional[str]):
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (source, scope, watermark, synced_at) VALUES (?, ?, ?, ?)",
+            (source, scope, watermark, datetime.now(timezone.utc).isoformat()),
+        )
+
+    def sync_jira_project(self, jira_fetcher, project_key: str, page_size: int = 100, prune: bool = False) -> int:
+        """
+        Mirror issues of a project updated since the last sync.
+
+        Issues that were deleted or moved to another project are dropped on a
+        full sync, and on incremental syncs every PRUNE_INTERVAL or when prune is set.
+
+        Args:
+            jira_fetcher: JiraFetcher used to query Jira and build issue content
+            project_key: The project key
+            page_size: Issues fetched per request
+            prune: Drop deleted and moved issues even if the last prune is recent
+
+        Returns:
+            Number of issues written to the index
+        """
+        watermark = self._get_watermark("jira", project_key)
+        jql = f"project = {project_key}"
+        if watermark:
+            since = datetime.fromisoformat(watermark) - SYNC_OVERLAP
+            jql += f' AND updated >= "{since.strftime("%Y/%m/%d %H:%M")}"'
+        jql += " ORDER BY updated ASC"
+
+        newest = datetime.fromisoformat(watermark) if watermark else None
+        seen: Set[str] = set()
+        start = 0
+        count = 0
+        while True:
+            results = jira_fetcher.jira.jql(jql, fields=INDEX_FIELDS, start=start, limit=page_size)
+            issues = results.get("issues", [])
+            seen.update(issue["key"] for issue in issues)
+            rows = []
+            for issue in issues:
+                try:
+                    fields = issue["fields"]
+                    updated = _parse_jira_datetime(fields["updated"]).astimezone(timezone.utc)
+                    doc = jira_fetcher._build_document(issue)
+                    rows.append(
+                        (
+                            issue["key"],
+                            project_key,
+                            fields.get("summary", ""),
+                            doc.metadata["status"],
+                            doc.metadata["type"],
+                            doc.metadata["priority"],
+                            (fields.get("assignee") or {}).get("displayName"),
+                            ",".join(fields.get("labels") or []),
+                            updated.isoformat(),
+                            doc.page_content,
+                        )
+                    )
+                    newest = max(newest, updated) if newest else updated
+                except Exception as e:
+                    logger.error(f"Error indexing issue {issue.get('key')}: {str(e)}")
+
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.executemany("DELETE FROM issues_fts WHERE key = ?", [(row[0],) for row in rows])
+                conn.executemany(
+                    "INSERT INTO issues_fts (key, summary, content) VALUES (?, ?, ?)",
+                    [(row[0], row[2], row[9]) for row in rows],
+                )
+                # Advance the watermark per page so an interrupted sync resumes where it stopped
+                self._set_watermark(conn, "jira", project_key, newest.isoformat() if newest else None)
+            count += len(rows)
+
+            start += len(issues)
+            # `total` is not returned by every deployment, so only a short page ends the listing
+            if len(issues) < page_size:
+                break
+
+        # A full sync has seen every issue; otherwise the keys still in the project are listed
+        if watermark:
+            pruned_at = self._get_synced_at("jira-prune", project_key)
+            if not prune and pruned_at and datetime.now(timezone.utc) - pruned_at < PRUNE_INTERVAL:
+                return count
+            seen = self._list_jira_keys(jira_fetcher, project_key, page_size)
+        with self._connect() as conn:
+            known = [row["key"] for row in conn.execute("SELECT key FROM issues WHERE project = ?", (project_key,))]
+            removed = [(key,) for key in known if key not in seen]
+            conn.executemany("DELETE FROM issues WHERE key = ?", removed)
+            conn.executemany("DELETE FROM issues_fts WHERE key = ?", removed)
+            self._set_watermark(conn, "jira-prune", project_key, None)
+
+        return count
+
+    def _list_jira_keys(self, jira_fetcher, project_key: str, page_size: int) -> Set[str]:
+        """List the keys of all issues currently in a project."""
+        keys: Set[str] = set()
+        start = 0
+        while True:
+            results = jira_fetcher.jira.jql(
+                f"project = {project_key} ORDER BY key ASC", fields="key", start=start, limit=page_size
+            )
+            issues = results.get("issues", [])
+            keys.update(issue["key"] for issue in issues)
+            if len(issues) < page_size:
+                break
+            start += len(issues)
+        return keys
+
+    def sync_confluence_space(self, confluence_fetcher, space_key: str, page_size: int = 100) -> int:
+        """
+        Mirror pages of a space whose version changed since the last sync,
+        and drop pages that no longer exist.
+
+        Args:
+            confluence_fetcher: ConfluenceFetcher used to list and read pages
+            space_key: The space key
+            page_size: Pages listed per request
+
+        Returns:
+            Number of pages written to the index
+        """
+        with self._connect() as conn:
+            known = {
+                row["page_id"]: row["version"]
+                for row in conn.execute("SELECT page_id, version FROM pages WHERE space_key = ?", (space_key,))
+            }
+
+        # Listing with only the version expanded is cheap; bodies are fetched for changed pages
+        current: Dict[str, int] = {}
+        start = 0
+        while True:
+            pages = confluence_fetcher.confluence.get_all_pages_from_space(
+                space=space_key, start=start, limit=page_size, expand="version"
+            )
+            for page in pages:
+                current[page["id"]] = page.get("version", {}).get("number")
+            if len(pages) < page_size:
+                break
+            start += len(pages)
+
+        count = 0
+        for page_id, version in current.items():
+            if known.get(page_id) == version:
+                continue
+            try:
+                doc = confluence_fetcher.get_page_content(page_id)
+            except Exception as e:
+                logger.error(f"Error indexing page {page_id}: {str(e)}")
+                continue
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        page_id,
+                        space_key,
+                        doc.metadata["title"],
+                        doc.metadata["version"],
+                        doc.metadata.get("last_modified"),
+                        doc.metadata["url"],
+                        doc.page_content,
+                    ),
+                )
+                conn.execute("DELETE FROM pages_fts WHERE page_id = ?", (page_id,))
+                conn.execute(
+                    "INSERT INTO pages_fts (page_id, title, content) VALUES (?, ?, ?)",
+                    (page_id, doc.metadata["title"], doc.page_content),
+                )
+            count += 1
+
+        removed = [(page_id,) for page_id in known if page_id not in current]
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM pages WHERE page_id = ?", removed)
+            conn.executemany("DELETE FROM pages_fts WHERE page_id = ?", removed)
+            self._set_watermark(conn, "confluence", space_key, None)
+
+        return count
+
+    def _run_search(self, conn: sqlite3.Connection, sql: str, query: Optional[str], params: list) -> List[sqlite3.Row]:
+        """Run a search, retrying with quoted terms if the raw FTS5 syntax is invalid."""
+        if not query:
+            return conn.execute(sql, params).fetchall()
+        try:
+            return conn.execute(sql, [query] + params).fetchall()
+        except sqlite3.OperationalError:
+            return conn.execute(sql, [_fts_query(query)] + params).fetchall()
+
+    def search_issues(
+        self,
+        query: Optional[str] = None,
+        project: Optional[str] = None,
+        status: Optional[str] = None,
+        issue_type: Optional[str] = None,
+        assignee: Optional[str] = None,
+        label: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[dict]:
+        """
+        Search mirrored issues by keywords (FTS5 syntax) and/or field values.
+
+        Returns:
+            Matching issues, best match first (most recently updated without a query)
+        """
+        filters = []
+        params: list = []
+        for column, value in (("project", project), ("status", status), ("issue_type", issue_type), ("assignee", assignee)):
+            if value:
+                filters.append(f"i.{column} = ? COLLATE NOCASE")
+                params.append(value)
+        if label:
+            filters.append("(',' || i.labels || ',') LIKE ?")
+            params.append(f"%,{label},%")
+
+        columns = "i.key, i.project, i.summary, i.status, i.issue_type, i.priority, i.assignee, i.labels, i.updated"
+        if query:
+            where = " AND ".join(["issues_fts MATCH ?"] + filters)
+            sql = (
+                f"SELECT {columns}, snippet(issues_fts, 2, '[', ']', '...', 16) AS excerpt "
+                f"FROM issues_fts JOIN issues i ON i.key = issues_fts.key "
+                f"WHERE {where} ORDER BY bm25(issues_fts) LIMIT ?"
+            )
+        else:
+            where = " AND ".join(filters) or "1"
+            sql = (
+                f"SELECT {columns}, substr(i.content, 1, 300) AS excerpt FROM issues i "
+                f"WHERE {where} ORDER BY i.updated DESC LIMIT ?"
+            )
+
+        with self._connect() as conn:
+            rows = self._run_search(conn, sql, query, params + [limit])
+        return [dict(row) for row in rows]
+
+    def search_pages(self, query: str, space_key: Optional[str] = None, limit: int = 20) -> List[dict]:
+        """
+        Search mirrored Confluence pages by keywords (FTS5 syntax).
+
+        Returns:
+            Matching pages, best match first
+        """
+        filters = ["pages_fts MATCH ?"]
+        params: list = []
+        if space_key:
+            filters.append("p.space_key = ?")
+            params.append(space_key)
+
+        sql = (
+            "SELECT p.page_id, p.space_key, p.title, p.version, p.last_modified, p.url, "
+            "snippet(pages_fts, 2, '[', ']', '...', 16) AS excerpt "
+            "FROM pages_fts JOIN pages p ON p.page_id = pages_fts.page_id "
+            f"WHERE {' AND '.join(filters)} ORDER BY bm25(pages_fts) LIMIT ?"
+        )
+        with self._connect() as conn:
+            rows = self._run_search(conn, sql, query, params + [limit])
+        return [dict(row) for row in rows]
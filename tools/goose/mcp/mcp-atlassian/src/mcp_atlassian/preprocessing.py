@@ -1,49 +1,91 @@
+import html
 import logging
 import re
 import warnings
-from typing import Tuple
+from typing import Iterable, Optional, Tuple
 
 from bs4 import BeautifulSoup
-from markdownify import markdownify as md
+from markdownify import MarkdownConverter
+
+from .user_resolver import UserResolver
 
 logger = logging.getLogger("mcp-atlassian")
 
+# lxml is a dependency and considerably faster than html.parser; the fallback only covers broken installs
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+JIRA_MENTION_PATTERN = re.compile(r"\[~accountid:(.*?)\]")
+# lxml's HTML parser drops CDATA sections, which Confluence uses for code macro bodies
+CDATA_PATTERN = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
 
 class TextPreprocessor:
     """Handles text preprocessing for Confluence and Jira content."""
 
-    def __init__(self, base_url: str, confluence_client=None):
+    def __init__(self, base_url: str, confluence_client=None, user_resolver: Optional[UserResolver] = None):
         self.base_url = base_url.rstrip("/")
         self.confluence_client = confluence_client
+        if user_resolver is None and confluence_client is not None:
+            # No bulk endpoint available; still cache single lookups in memory
+            user_resolver = UserResolver(
+                bulk_lookup=lambda ids: {
+                    i: confluence_client.get_user_details_by_accountid(i).get("displayName", i) for i in ids
+                }
+            )
+        self.user_resolver = user_resolver
+        self.markdown_converter = MarkdownConverter()
+
+    def _parse_html(self, html_content: str) -> BeautifulSoup:
+        """Parse HTML with the fastest available parser."""
+        if HTML_PARSER == "lxml":
+            html_content = CDATA_PATTERN.sub(lambda m: html.escape(m.group(1)), html_content)
+        return BeautifulSoup(html_content, HTML_PARSER)
+
+    def _serialize(self, soup: BeautifulSoup) -> str:
+        """Serialize a parsed fragment without the html/body wrapper lxml adds."""
+        if HTML_PARSER == "lxml" and soup.body is not None:
+            return soup.body.decode_contents()
+        return str(soup)
+
+    def prefetch_jira_mentions(self, texts: Iterable[str]):
+        """Resolve all user mentions in the given Jira texts with one bulk lookup."""
+        if not self.user_resolver:
+            return
+        account_ids = set()
+        for text in texts:
+            if text:
+                account_ids.update(JIRA_MENTION_PATTERN.findall(text))
+        self.user_resolver.prefetch(account_ids)
 
     def process_html_content(self, html_content: str, space_key: str = "") -> Tuple[str, str]:
         """Process HTML content to replace user refs and page links."""
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
+            soup = self._parse_html(html_content)
 
-            # Process user mentions
+            # Process user mentions, resolving all unique IDs in one bulk lookup
             user_mentions = soup.find_all("ri:user")
+            if self.user_resolver:
+                self.user_resolver.prefetch(user.get("ri:account-id") for user in user_mentions)
             for user in user_mentions:
                 account_id = user.get("ri:account-id")
-                if account_id and self.confluence_client:
-                    try:
-                        # Fetch user info using the Confluence API
-                        user_info = self.confluence_client.get_user_details_by_accountid(account_id)
-                        display_name = user_info.get("displayName", account_id)
-
-                        # Replace the entire ac:link structure with @mention
-                        link_tag = user.find_parent("ac:link")
-                        if link_tag:
-                            link_tag.replace_with(f"@{display_name}")
-                    except Exception as e:
-                        logger.warning(f"Could not fetch user info for {account_id}: {e}")
-                        # Fallback: just use the account ID
-                        link_tag = user.find_parent("ac:link")
-                        if link_tag:
-                            link_tag.replace_with(f"@user_{account_id}")
-
-            processed_html = str(soup)
-            processed_markdown = md(processed_html)
+                if account_id and self.user_resolver:
+                    display_name = self.user_resolver.resolve(account_id)
+
+                    # Replace the entire ac:link structure with @mention,
+                    # falling back to the account ID
+                    link_tag = user.find_parent("ac:link")
+                    if link_tag:
+                        link_tag.replace_with(f"@{display_name}" if display_name else f"@user_{account_id}")
+
+            # Convert the parsed tree directly instead of serialising and re-parsing it
+            processed_html = self._serialize(soup)
+            processed_markdown = self.markdown_converter.convert_soup(soup)
 
             return processed_html, processed_markdown
 
@@ -61,8 +103,7 @@ class TextPreprocessor:
             return ""
 
         # Process user mentions
-        mention_pattern = r"\[~accountid:(.*?)\]"
-        text = self._process_mentions(text, mention_pattern)
+        text = self._process_mentions(text, JIRA_MENTION_PATTERN)
 
         # Process Jira smart links
         text = self._process_smart_links(text)
@@ -72,16 +113,17 @@ class TextPreprocessor:
 
         return text.strip()
 
-    def _process_mentions(self, text: str, pattern: str) -> str:
+    def _process_mentions(self, text: str, pattern: "re.Pattern[str]") -> str:
         """Process user mentions in text."""
-        mentions = re.findall(pattern, text)
+        mentions = set(pattern.findall(text))
+        if not mentions:
+            return text
+        if self.user_resolver:
+            self.user_resolver.prefetch(mentions)
         for account_id in mentions:
-            try:
-                # Note: This is a placeholder - actual user fetching should be injected
-                display_name = f"User:{account_id}"
-                text = text.replace(f"[~accountid:{account_id}]", display_name)
-            except Exception as e:
-                logger.error(f"Error getting user info for {account_id}: {str(e)}")
+            display_name = self.user_resolver.resolve(account_id) if self.user_resolver else None
+            replacement = f"@{display_name}" if display_name else f"@user_{account_id}"
+            text = text.replace(f"[~accountid:{account_id}]", replacement)
         return text
 
     def _process_smart_links(self, text: str) -> str:
@@ -117,13 +159,12 @@ class TextPreprocessor:
 
     def _convert_html_to_markdown(self, text: str) -> str:
         """Convert HTML content to markdown if needed."""
-        if re.search(r"<[^>]+>", text):
+        if HTML_TAG_PATTERN.search(text):
             try:
                 with warnings.catch_warnings():
                     warnings.filterwarnings("ignore", category=UserWarning)
-                    soup = BeautifulSoup(f"<div>{text}</div>", "html.parser")
-                    html = str(soup.div.decode_contents()) if soup.div else text
-                    text = md(html)
+                    soup = self._parse_html(f"<div>{text}</div>")
+                    text = self.markdown_converter.convert_soup(soup.div) if soup.div else text
             except Exception as e:
                 logger.warning(f"Error converting HTML to markdown: {e}")
         return text
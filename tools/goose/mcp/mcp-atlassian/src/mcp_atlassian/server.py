@@ -1,13 +1,21 @@
 import json
 import logging
+import os
+import re
+import sqlite3
 from collections.abc import Sequence
-from typing import Any
+from typing import Any, Optional
+from urllib.parse import parse_qs
 
 from mcp.server import Server
 from mcp.types import Resource, TextContent, Tool
 from pydantic import AnyUrl
 
+from .async_client import AsyncFetcher
+from .config import get_index_path
+from .confluence import ConfluenceFetcher
 from .jira import JiraFetcher
+from .local_index import LocalIndex
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +28,29 @@ except ValueError as e:
     logger.error(f"Jira initialization failed: {str(e)}")
     raise
 
+# Confluence is optional; it is only used to mirror pages into the local index
+try:
+    confluence_fetcher = ConfluenceFetcher()
+except ValueError as e:
+    logger.info(f"Confluence not configured: {str(e)}")
+    confluence_fetcher = None
+
+# Blocking Jira calls run in a bounded thread pool so the event loop stays free
+async_jira = AsyncFetcher(jira_fetcher)
+
+# The local index is opt-in; a path that can't be created disables it instead of stopping the server
+index_path = get_index_path()
+try:
+    local_index = LocalIndex(index_path) if index_path else None
+except (OSError, sqlite3.Error) as e:
+    logger.error(f"Local index unavailable at {index_path}: {str(e)}")
+    local_index = None
+async_index = AsyncFetcher(local_index) if local_index else None
+
+# Maximum size of a single resource read; larger projects are continued via a cursor URI
+RESOURCE_BYTE_BUDGET = int(os.getenv("MCP_ATLASSIAN_RESOURCE_BYTE_BUDGET", 200_000))
+ISSUE_KEY_PATTERN = re.compile(r"[A-Z][A-Z0-9_]*-\d+")
+
 app = Server("mcp-atlassian")
 
 
@@ -30,7 +61,7 @@ async def list_resources() -> list[Resource]:
 
     # Add Jira projects
     try:
-        projects = jira_fetcher.jira.projects()
+        projects = await async_jira.run(jira_fetcher.jira.projects)
         resources.extend(
             [
                 Resource(
@@ -55,26 +86,58 @@ async def read_resource(uri: AnyUrl) -> str:
 
     # Handle Jira resources
     if uri_str.startswith("jira://"):
-        parts = uri_str.replace("jira://", "").split("/")
+        path, _, query = uri_str.replace("jira://", "").partition("?")
+        parts = path.split("/")
 
         # Handle project listing
         if len(parts) == 1:
-            project_key = parts[0]
-            issues = jira_fetcher.get_project_issues(project_key)
-            content = []
-            for issue in issues:
-                content.append(f"# {issue.metadata['key']}: {issue.metadata['title']}\n\n{issue.page_content}\n---")
-            return "\n\n".join(content)
+            cursor = parse_qs(query).get("cursor", [None])[0]
+            if cursor and not ISSUE_KEY_PATTERN.fullmatch(cursor):
+                raise ValueError(f"Invalid cursor: {cursor}")
+            return await read_project_issues(parts[0], cursor)
 
         # Handle specific issue
         elif len(parts) >= 3 and parts[1] == "issues":
             issue_key = parts[2]
-            issue = jira_fetcher.get_issue(issue_key)
+            issue = await async_jira.get_issue(issue_key)
             return issue.page_content
 
     raise ValueError(f"Invalid resource URI: {uri}")
 
 
+async def read_project_issues(project_key: str, cursor: Optional[str] = None) -> str:
+    """
+    Read a project's issues page by page until the byte budget is reached.
+
+    When more issues remain, the content ends with a continuation URI whose
+    cursor is the key of the last issue included.
+    """
+    issues = jira_fetcher.iter_project_issues(project_key, after_key=cursor)
+    content = []
+    size = 0
+    last_key = None
+    try:
+        while True:
+            # Each step may fetch the next search page, so keep it off the event loop
+            issue = await async_jira.run(next, issues, None)
+            if issue is None:
+                return "\n\n".join(content)
+
+            chunk = f"# {issue.metadata['key']}: {issue.metadata['title']}\n\n{issue.page_content}\n---"
+            chunk_size = len(chunk.encode("utf-8"))
+            # Always include at least one issue so every read makes progress
+            if content and size + chunk_size > RESOURCE_BYTE_BUDGET:
+                break
+            content.append(chunk)
+            size += chunk_size
+            last_key = issue.metadata["key"]
+    finally:
+        issues.close()
+
+    content.append(f"More issues available. Continue reading: jira://{project_key}?cursor={last_key}")
+    return "\n\n".join(content)
+
+
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List available Jira tools."""
@@ -106,6 +169,11 @@ async def list_tools() -> list[Tool]:
                         "minimum": 1,
                         "maximum": 50,
                     },
+                    "hydrate": {
+                        "type": "boolean",
+                        "description": "Fetch full details for each result instead of using the search response",
+                        "default": False,
+                    },
                 },
                 "required": ["jql"],
             },
@@ -162,6 +230,71 @@ async def list_tools() -> list[Tool]:
                 "required": ["issue_key"],
             },
         ),
+        Tool(
+            name="jira_bulk_create_issues",
+            description="Create several Jira issues in as few requests as possible; reports per-issue failures",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "issues": {
+                        "type": "array",
+                        "description": "Issues to create",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "project_key": {"type": "string", "description": "The project key"},
+                                "summary": {"type": "string", "description": "Issue title/summary"},
+                                "description": {"type": "string", "description": "Detailed description of the issue"},
+                                "issue_type": {"type": "string", "description": "Type of issue", "default": "Task"},
+                                "priority": {"type": "string", "description": "Priority level"},
+                                "assignee": {"type": "string", "description": "Username of the assignee"},
+                                "labels": {"type": "array", "items": {"type": "string"}, "description": "List of labels"},
+                            },
+                            "required": ["project_key", "summary", "description"],
+                        },
+                    },
+                },
+                "required": ["issues"],
+            },
+        ),
+        Tool(
+            name="jira_bulk_transition_issues",
+            description="Transition several Jira issues to the same status; reports per-issue failures",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "issue_keys": {"type": "array", "items": {"type": "string"}, "description": "Issue keys to transition"},
+                    "status": {"type": "string", "description": "Target status"},
+                },
+                "required": ["issue_keys", "status"],
+            },
+        ),
+        Tool(
+            name="jira_bulk_update_issues",
+            description="Update fields of several Jira issues; reports per-issue failures",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "updates": {
+                        "type": "array",
+                        "description": "Per-issue field updates",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "issue_key": {"type": "string", "description": "The issue key to update"},
+                                "summary": {"type": "string", "description": "New summary/title"},
+                                "description": {"type": "string", "description": "New description"},
+                                "priority": {"type": "string", "description": "New priority level"},
+                                "assignee": {"type": "string", "description": "New assignee username"},
+                                "labels": {"type": "array", "items": {"type": "string"}, "description": "New list of labels"},
+                            },
+                            "required": ["issue_key"],
+                        },
+                    },
+                },
+                "required": ["updates"],
+            },
+        ),
         Tool(
             name="jira_add_comment",
             description="Add a comment to a Jira issue",
@@ -199,6 +332,25 @@ async def list_tools() -> list[Tool]:
                 "required": ["issue_key"],
             },
         ),
+        Tool(
+            name="jira_get_issue_graph",
+            description="Get all issues reachable from an issue via links, subtasks and epic/parent relations, up to a depth, in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "issue_key": {"type": "string", "description": "The issue to start from (e.g., 'PROJ-123')"},
+                    "depth": {"type": "number", "description": "How many relations away to expand (1-5)", "default": 2, "minimum": 1, "maximum": 5},
+                    "max_issues": {"type": "number", "description": "Maximum number of issues in the graph", "default": 200},
+                    "relations": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["links", "subtasks", "epic"]},
+                        "description": "Relations to follow",
+                        "default": ["links", "subtasks", "epic"],
+                    },
+                },
+                "required": ["issue_key"],
+            },
+        ),
         Tool(
             name="jira_remove_link",
             description="Remove a link between Jira issues",
@@ -211,6 +363,47 @@ async def list_tools() -> list[Tool]:
                 "required": ["issue_key", "link_id"],
             },
         ),
+        Tool(
+            name="atlassian_index_sync",
+            description="Incrementally mirror Jira projects and Confluence spaces into the local search index",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "jira_projects": {"type": "array", "items": {"type": "string"}, "description": "Project keys to sync", "default": []},
+                    "confluence_spaces": {"type": "array", "items": {"type": "string"}, "description": "Space keys to sync", "default": []},
+                    "prune": {"type": "boolean", "description": "Also drop deleted and moved Jira issues now (lists every key of the projects)", "default": False},
+                },
+            },
+        ),
+        Tool(
+            name="jira_local_search",
+            description="Search locally mirrored Jira issues by keywords and/or fields, without calling Jira (run atlassian_index_sync first)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Keywords (SQLite FTS5 syntax, e.g. 'login AND timeout', 'deploy*')"},
+                    "project": {"type": "string", "description": "Project key"},
+                    "status": {"type": "string", "description": "Status name"},
+                    "issue_type": {"type": "string", "description": "Issue type name"},
+                    "assignee": {"type": "string", "description": "Assignee display name"},
+                    "label": {"type": "string", "description": "Label"},
+                    "limit": {"type": "number", "description": "Maximum number of results", "default": 20},
+                },
+            },
+        ),
+        Tool(
+            name="confluence_local_search",
+            description="Search locally mirrored Confluence pages by keywords, without calling Confluence (run atlassian_index_sync first)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Keywords (SQLite FTS5 syntax)"},
+                    "space_key": {"type": "string", "description": "Space key"},
+                    "limit": {"type": "number", "description": "Maximum number of results", "default": 20},
+                },
+                "required": ["query"],
+            },
+        ),
     ]
 
 
@@ -219,14 +412,17 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     """Handle tool calls for Jira operations."""
     try:
         if name == "jira_get_issue":
-            doc = jira_fetcher.get_issue(arguments["issue_key"], expand=arguments.get("expand"))
+            doc = await async_jira.get_issue(arguments["issue_key"], expand=arguments.get("expand"))
             result = {"content": doc.page_content, "metadata": doc.metadata}
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
         elif name == "jira_search":
             limit = min(int(arguments.get("limit", 10)), 50)
-            documents = jira_fetcher.search_issues(
-                arguments["jql"], fields=arguments.get("fields", "*all"), limit=limit
+            documents = await async_jira.search_issues(
+                arguments["jql"],
+                fields=arguments.get("fields", "*all"),
+                limit=limit,
+                hydrate=bool(arguments.get("hydrate", False)),
             )
             search_results = [
                 {
@@ -245,7 +441,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
 
         elif name == "jira_get_project_issues":
             limit = min(int(arguments.get("limit", 10)), 50)
-            documents = jira_fetcher.get_project_issues(arguments["project_key"], limit=limit)
+            documents = await async_jira.get_project_issues(arguments["project_key"], limit=limit)
             project_issues = [
                 {
                     "key": doc.metadata["key"],
@@ -260,7 +456,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             return [TextContent(type="text", text=json.dumps(project_issues, indent=2))]
 
         elif name == "jira_create_issue":
-            doc = jira_fetcher.create_issue(
+            doc = await async_jira.create_issue(
                 project_key=arguments["project_key"],
                 summary=arguments["summary"],
                 description=arguments["description"],
@@ -273,7 +469,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
         elif name == "jira_update_issue":
-            doc = jira_fetcher.update_issue(
+            doc = await async_jira.update_issue(
                 issue_key=arguments["issue_key"],
                 summary=arguments.get("summary"),
                 description=arguments.get("description"),
@@ -285,8 +481,20 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             result = {"content": doc.page_content, "metadata": doc.metadata}
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
+        elif name == "jira_bulk_create_issues":
+            result = await async_jira.bulk_create_issues(arguments["issues"])
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        elif name == "jira_bulk_transition_issues":
+            result = await async_jira.bulk_transition_issues(arguments["issue_keys"], arguments["status"])
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+        elif name == "jira_bulk_update_issues":
+            result = await async_jira.bulk_update_issues(arguments["updates"])
+            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
         elif name == "jira_add_comment":
-            doc = jira_fetcher.add_comment(
+            doc = await async_jira.add_comment(
                 issue_key=arguments["issue_key"],
                 comment=arguments["comment"],
             )
@@ -294,7 +502,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
         elif name == "jira_link_issues":
-            doc = jira_fetcher.link_issues(
+            doc = await async_jira.link_issues(
                 inward_issue=arguments["inward_issue"],
                 outward_issue=arguments["outward_issue"],
                 link_type=arguments.get("link_type", "Relates"),
@@ -304,17 +512,61 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
         elif name == "jira_get_links":
-            links = jira_fetcher.get_issue_links(arguments["issue_key"])
+            links = await async_jira.get_issue_links(arguments["issue_key"])
             return [TextContent(type="text", text=json.dumps(links, indent=2))]
 
+        elif name == "jira_get_issue_graph":
+            graph = await async_jira.get_issue_graph(
+                arguments["issue_key"],
+                depth=max(1, min(int(arguments.get("depth", 2)), 5)),
+                max_issues=int(arguments.get("max_issues", 200)),
+                relations=arguments.get("relations") or ["links", "subtasks", "epic"],
+            )
+            return [TextContent(type="text", text=json.dumps(graph, indent=2))]
+
         elif name == "jira_remove_link":
-            doc = jira_fetcher.remove_link(
+            doc = await async_jira.remove_link(
                 issue_key=arguments["issue_key"],
                 link_id=arguments["link_id"],
             )
             result = {"content": doc.page_content, "metadata": doc.metadata}
             return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
+        elif name in ("atlassian_index_sync", "jira_local_search", "confluence_local_search"):
+            if async_index is None:
+                raise ValueError("Local index is disabled (set MCP_ATLASSIAN_INDEX_PATH)")
+
+            if name == "atlassian_index_sync":
+                synced = {"jira_projects": {}, "confluence_spaces": {}}
+                for project_key in arguments.get("jira_projects") or []:
+                    synced["jira_projects"][project_key] = await async_index.sync_jira_project(
+                        jira_fetcher, project_key, prune=bool(arguments.get("prune", False))
+                    )
+                for space_key in arguments.get("confluence_spaces") or []:
+                    if confluence_fetcher is None:
+                        raise ValueError("Confluence is not configured")
+                    synced["confluence_spaces"][space_key] = await async_index.sync_confluence_space(
+                        confluence_fetcher, space_key
+                    )
+                return [TextContent(type="text", text=json.dumps({"updated": synced}, indent=2))]
+
+            elif name == "jira_local_search":
+                issues = await async_index.search_issues(
+                    query=arguments.get("query"),
+                    project=arguments.get("project"),
+                    status=arguments.get("status"),
+                    issue_type=arguments.get("issue_type"),
+                    assignee=arguments.get("assignee"),
+                    label=arguments.get("label"),
+                    limit=int(arguments.get("limit", 20)),
+                )
+                return [TextContent(type="text", text=json.dumps(issues, indent=2))]
+
+            pages = await async_index.search_pages(
+                arguments["query"], space_key=arguments.get("space_key"), limit=int(arguments.get("limit", 20))
+            )
+            return [TextContent(type="text", text=json.dumps(pages, indent=2))]
+
         raise ValueError(f"Unknown tool: {name}")
 
     except Exception as e:
@@ -0,0 +1,149 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .cache import atomic_write_json
+
+logger = logging.getLogger("mcp-atlassian")
+
+# Maximum number of account IDs sent in a single bulk lookup
+BULK_CHUNK_SIZE = 100
+
+# Seconds an ID whose lookups failed stays cached as unresolved, so an outage
+# costs one round of requests per ID instead of one per mention
+FAILURE_TTL = 300
+
+
+class UserResolver:
+    """
+    Resolves Atlassian account IDs to display names.
+
+    Lookups go through an LRU cache with a TTL that is shared by all documents
+    processed by the owning client and persisted to disk between runs. Callers
+    prefetch every unique ID in a document with a single bulk lookup before
+    rendering it, so individual mentions never hit the network.
+    """
+
+    def __init__(
+        self,
+        bulk_lookup: Callable[[List[str]], Dict[str, str]],
+        single_lookup: Optional[Callable[[str], Optional[str]]] = None,
+        max_size: int = 2048,
+        ttl: float = 86400,
+        cache_path: Optional[Path] = None,
+        failure_ttl: float = FAILURE_TTL,
+    ):
+        """
+        Args:
+            bulk_lookup: Maps a list of account IDs to {account_id: display_name}
+            single_lookup: Fallback for a single account ID when the bulk lookup fails
+            max_size: Maximum number of cached entries
+            ttl: Seconds a cached display name stays valid
+            cache_path: JSON file used to persist the cache, or None to keep it in memory
+            failure_ttl: Seconds an ID whose lookups failed is treated as unresolved
+        """
+        self.bulk_lookup = bulk_lookup
+        self.single_lookup = single_lookup
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.failure_ttl = failure_ttl
+        self._cache: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load non-expired entries from the persisted cache."""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path) as f:
+                entries = json.load(f)
+            now = time.time()
+            for account_id, (name, expires_at) in entries.items():
+                if expires_at > now:
+                    self._cache[account_id] = (name, expires_at)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        except Exception as e:
+            logger.warning(f"Could not load user cache {self.cache_path}: {e}")
+
+    def _save(self):
+        """Persist the cache atomically so concurrent processes never see a partial file."""
+        if not self.cache_path:
+            return
+        try:
+            with self._lock:
+                entries = {k: list(v) for k, v in self._cache.items()}
+            atomic_write_json(self.cache_path, entries)
+        except Exception as e:
+            logger.warning(f"Could not save user cache {self.cache_path}: {e}")
+
+    def _get(self, account_id: str) -> Optional[str]:
+        """Get a cached name; "" marks an ID known not to resolve, None a cache miss."""
+        with self._lock:
+            entry = self._cache.get(account_id)
+            if entry is None:
+                return None
+            name, expires_at = entry
+            if expires_at <= time.time():
+                del self._cache[account_id]
+                return None
+            self._cache.move_to_end(account_id)
+            return name
+
+    def _put_many(self, names: Dict[str, str], ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            for account_id, name in names.items():
+                self._cache[account_id] = (name, expires_at)
+                self._cache.move_to_end(account_id)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def prefetch(self, account_ids: Iterable[str]):
+        """Resolve every uncached account ID with as few bulk lookups as possible."""
+        missing = sorted({a for a in account_ids if a and self._get(a) is None})
+        if not missing:
+            return
+
+        resolved: Dict[str, str] = {}
+        failed: Dict[str, str] = {}
+        for i in range(0, len(missing), BULK_CHUNK_SIZE):
+            chunk = missing[i : i + BULK_CHUNK_SIZE]
+            try:
+                names = self.bulk_lookup(chunk)
+                # Cache unknown IDs as empty names so they aren't looked up again until expiry
+                resolved.update({account_id: names.get(account_id, "") for account_id in chunk})
+            except Exception as e:
+                logger.warning(f"Bulk user lookup failed, falling back to single lookups: {e}")
+                for account_id in chunk:
+                    try:
+                        name = self.single_lookup(account_id) if self.single_lookup else None
+                    except Exception as e:
+                        logger.warning(f"Could not fetch user info for {account_id}: {e}")
+                        name = None
+                    if name:
+                        resolved[account_id] = name
+                    else:
+                        failed[account_id] = ""
+
+        if resolved:
+            self._put_many(resolved)
+        if failed:
+            # Failed lookups expire sooner than names, so they are retried once the outage is over
+            self._put_many(failed, ttl=self.failure_ttl)
+        if resolved or failed:
+            self._save()
+
+    def resolve(self, account_id: str) -> Optional[str]:
+        """Get the display name for an account ID, fetching it if not cached."""
+        name = self._get(account_id)
+        if name is None:
+            self.prefetch([account_id])
+            name = self._get(account_id)
+        return name or None
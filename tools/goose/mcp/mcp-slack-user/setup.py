@@ -8,9 +8,9 @@ setup(
     install_requires=[
         "mcp>=0.1.0",
         "slack-sdk>=3.26.0",
+        "aiohttp>=3.9.0",
         "pydantic>=2.0.0",
         "python-dotenv>=1.0.0",
-        "markdownify>=0.11.0",
         "uvicorn>=0.24.0",
     ],
 )
\ No newline at end of file
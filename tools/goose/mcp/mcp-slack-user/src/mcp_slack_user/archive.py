@@ -0,0 +1,225 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger("mcp-slack")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    channel_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    thread_ts TEXT,
+    user TEXT,
+    in_history INTEGER NOT NULL DEFAULT 0,
+    data TEXT,
+    PRIMARY KEY (channel_id, ts)
+);
+CREATE INDEX IF NOT EXISTS messages_history ON messages(channel_id, in_history, ts);
+CREATE INDEX IF NOT EXISTS messages_thread ON messages(channel_id, thread_ts, ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    channel_id UNINDEXED, ts UNINDEXED, text, tokenize = 'unicode61'
+);
+CREATE TABLE IF NOT EXISTS threads (
+    channel_id TEXT NOT NULL,
+    thread_ts TEXT NOT NULL,
+    latest_reply TEXT,
+    PRIMARY KEY (channel_id, thread_ts)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    channel_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL
+);
+"""
+
+
+def _fts_query(query: str) -> str:
+    """Quote each term so arbitrary user input is a valid FTS5 query."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class MessageArchive:
+    """
+    Local SQLite archive of channel and thread history with full-text search.
+
+    Channels are synced incrementally: each sync only asks Slack for messages
+    newer than the channel's watermark (the newest archived ts, passed as
+    `oldest`), and threads only for replies newer than their latest archived
+    reply. Edits and deletions of already archived messages are not picked up.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection keeps reads fast; the lock makes it safe across threads
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def get_watermark(self, channel_id: str) -> Optional[str]:
+        """Newest archived history ts of a channel, or None if it was never synced."""
+        with self._lock:
+            row = self._conn.execute("SELECT watermark FROM sync_state WHERE channel_id = ?", (channel_id,)).fetchone()
+        return row["watermark"] if row else None
+
+    def synced_at(self, channel_id: str) -> Optional[float]:
+        """Time of the last sync of a channel, or None if it was never synced."""
+        with self._lock:
+            row = self._conn.execute("SELECT synced_at FROM sync_state WHERE channel_id = ?", (channel_id,)).fetchone()
+        return row["synced_at"] if row else None
+
+    def is_complete(self, channel_id: str) -> bool:
+        """Whether the archive holds a channel's history back to its first message."""
+        with self._lock:
+            row = self._conn.execute("SELECT complete FROM sync_state WHERE channel_id = ?", (channel_id,)).fetchone()
+        return bool(row and row["complete"])
+
+    def _write_messages(self, conn: sqlite3.Connection, channel_id: str, messages: Iterable[dict], in_history: bool):
+        rows = [
+            (channel_id, m["ts"], m.get("thread_ts"), m.get("user"), int(in_history), json.dumps(m))
+            for m in messages
+            if m.get("ts")
+        ]
+        # A thread parent is returned by both history and replies; keep its in_history flag
+        conn.executemany(
+            "INSERT INTO messages (channel_id, ts, thread_ts, user, in_history, data) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (channel_id, ts) DO UPDATE SET data = excluded.data, "
+            "in_history = max(in_history, excluded.in_history)",
+            rows,
+        )
+        conn.executemany(
+            "DELETE FROM messages_fts WHERE channel_id = ? AND ts = ?", [(row[0], row[1]) for row in rows]
+        )
+        conn.executemany(
+            "INSERT INTO messages_fts (channel_id, ts, text) VALUES (?, ?, ?)",
+            [(row[0], row[1], json.loads(row[5]).get("text") or "") for row in rows],
+        )
+
+    def add_history(self, channel_id: str, messages: List[dict], complete: bool = False):
+        """
+        Store messages from conversations.history and advance the channel watermark.
+
+        Args:
+            channel_id: The channel ID
+            messages: Messages newer than the current watermark
+            complete: Whether this initial sync reached the channel's first message
+        """
+        with self._lock, self._conn as conn:
+            self._write_messages(conn, channel_id, messages, in_history=True)
+            for m in messages:
+                if m.get("reply_count"):
+                    conn.execute(
+                        "INSERT OR IGNORE INTO threads (channel_id, thread_ts, latest_reply) VALUES (?, ?, NULL)",
+                        (channel_id, m["ts"]),
+                    )
+            row = conn.execute(
+                "SELECT watermark, complete FROM sync_state WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+            known = [row["watermark"]] if row and row["watermark"] else []
+            newest = max([m["ts"] for m in messages if m.get("ts")] + known, key=float, default=None)
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (channel_id, watermark, complete, synced_at) VALUES (?, ?, ?, ?)",
+                (channel_id, newest, int(complete or bool(row and row["complete"])), time.time()),
+            )
+
+    def add_replies(self, channel_id: str, thread_ts: str, replies: List[dict]):
+        """Store messages from conversations.replies and advance the thread's latest reply."""
+        with self._lock, self._conn as conn:
+            self._write_messages(conn, channel_id, replies, in_history=False)
+            row = conn.execute(
+                "SELECT latest_reply FROM threads WHERE channel_id = ? AND thread_ts = ?", (channel_id, thread_ts)
+            ).fetchone()
+            known = [row["latest_reply"]] if row and row["latest_reply"] else []
+            latest = max([m["ts"] for m in replies if m.get("ts")] + known, key=float, default=None)
+            conn.execute(
+                "INSERT OR REPLACE INTO threads (channel_id, thread_ts, latest_reply) VALUES (?, ?, ?)",
+                (channel_id, thread_ts, latest),
+            )
+
+    def get_latest_reply(self, channel_id: str, thread_ts: str) -> Optional[str]:
+        """Latest archived reply ts of a thread, or None if its replies were never synced."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latest_reply FROM threads WHERE channel_id = ? AND thread_ts = ?", (channel_id, thread_ts)
+            ).fetchone()
+        return row["latest_reply"] if row else None
+
+    def threads_to_sync(self, channel_id: str, active_since: float) -> Dict[str, Optional[str]]:
+        """
+        Threads whose replies should be fetched: never synced, or active since the given time.
+
+        Returns:
+            {thread_ts: latest archived reply ts or None}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_ts, latest_reply FROM threads WHERE channel_id = ? "
+                "AND (latest_reply IS NULL OR CAST(latest_reply AS REAL) >= ?)",
+                (channel_id, active_since),
+            ).fetchall()
+        return {row["thread_ts"]: row["latest_reply"] for row in rows}
+
+    def get_history(self, channel_id: str, limit: int) -> List[dict]:
+        """Newest archived top-level messages of a channel, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                # Slack timestamps are fixed-width, so text order is time order and the index applies
+                "SELECT data FROM messages WHERE channel_id = ? AND in_history = 1 "
+                "ORDER BY ts DESC LIMIT ?",
+                (channel_id, limit),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_thread(self, channel_id: str, thread_ts: str) -> List[dict]:
+        """Archived messages of a thread, parent first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE channel_id = ? AND (ts = ? OR thread_ts = ?) "
+                "ORDER BY ts",
+                (channel_id, thread_ts, thread_ts),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        channel_id: Optional[str] = None,
+        user: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[dict]:
+        """
+        Search archived messages by keywords (FTS5 syntax).
+
+        Returns:
+            Matching messages, best match first, with channel_id and a highlighted excerpt
+        """
+        filters = ["messages_fts MATCH ?"]
+        params: list = []
+        if channel_id:
+            filters.append("m.channel_id = ?")
+            params.append(channel_id)
+        if user:
+            filters.append("m.user = ?")
+            params.append(user)
+
+        sql = (
+            "SELECT m.channel_id, m.ts, m.thread_ts, m.user, "
+            "snippet(messages_fts, 2, '[', ']', '...', 16) AS excerpt "
+            "FROM messages_fts JOIN messages m ON m.channel_id = messages_fts.channel_id AND m.ts = messages_fts.ts "
+            f"WHERE {' AND '.join(filters)} ORDER BY bm25(messages_fts) LIMIT ?"
+        )
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, [query] + params + [limit]).fetchall()
+            except sqlite3.OperationalError:
+                # Invalid FTS5 syntax; search the terms literally
+                rows = self._conn.execute(sql, [_fts_query(query)] + params + [limit]).fetchall()
+        return [dict(row) for row in rows]
@@ -1,10 +1,17 @@
+import asyncio
 import logging
 import os
+import time
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Dict, Iterable, List, Optional
 from dotenv import load_dotenv
-from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 
-from .config import SlackConfig
+from .archive import MessageArchive
+from .config import SlackConfig, get_archive_enabled, get_cache_dir
+from .directory import SlackDirectory
+from .rate_limit import RateLimiter
 
 # Load environment variables
 load_dotenv()
@@ -12,9 +19,40 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger("mcp-slack")
 
+# Largest page size each cursor-paginated method accepts; Slack requires `limit` to be under 1000
+PAGE_SIZES = {
+    "conversations.history": 999,
+    "conversations.list": 999,
+    "conversations.members": 999,
+    "conversations.replies": 999,
+    "users.list": 999,
+}
+DEFAULT_PAGE_SIZE = 200
+
+# Times a rate limited request is retried after waiting for Retry-After
+MAX_RATE_LIMIT_RETRIES = 5
+# Wait used when a 429 response carries no Retry-After header
+DEFAULT_RETRY_AFTER = 30
+
+async def gather_limited(aws: Iterable[Awaitable], limit: int) -> list:
+    """Await several awaitables with at most `limit` running at once, returning results in order."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
 class SlackClient:
     """Base client for Slack operations."""
 
+    # Rate limits apply per token, so handlers sharing a token share a limiter
+    _rate_limiters: Dict[str, RateLimiter] = {}
+    # Directories are per workspace and shared by all handlers
+    _directories: Dict[Path, SlackDirectory] = {}
+    _archives: Dict[Path, MessageArchive] = {}
+
     def __init__(self):
         token = os.getenv("SLACK_USER_TOKEN")
         default_channel = os.getenv("SLACK_DEFAULT_CHANNEL")
@@ -29,20 +67,105 @@ class SlackClient:
             workspace_id=workspace_id
         )
         
-        self.client = WebClient(token=self.config.token)
-        
-        # Test connection
+        self.client = AsyncWebClient(token=self.config.token)
+        self.rate_limiter = SlackClient._rate_limiters.setdefault(self.config.token, RateLimiter())
+        self.team_id: Optional[str] = None
+
+    async def connect(self):
+        """Test the connection and identify the workspace; call before any other operation."""
         try:
-            self.client.auth_test()
+            response = await self._call("auth.test")
+            self.team_id = response.get("team_id")
             logger.info("Successfully connected to Slack")
         except SlackApiError as e:
             logger.error(f"Failed to connect to Slack: {str(e)}")
             raise
 
+    @property
+    def directory(self) -> SlackDirectory:
+        """Local user and channel directory for this workspace."""
+        path = get_cache_dir() / f"directory-{self.team_id or 'default'}.db"
+        if path not in SlackClient._directories:
+            SlackClient._directories[path] = SlackDirectory(path)
+        return SlackClient._directories[path]
+
+    @property
+    def archive(self) -> Optional[MessageArchive]:
+        """Local message archive for this workspace, or None unless SLACK_ARCHIVE is set."""
+        if not get_archive_enabled():
+            return None
+        path = get_cache_dir() / f"archive-{self.team_id or 'default'}.db"
+        if path not in SlackClient._archives:
+            SlackClient._archives[path] = MessageArchive(path)
+        return SlackClient._archives[path]
+
     def _handle_response(self, response: dict) -> dict:
         """Process Slack API response and handle errors."""
         if not response["ok"]:
             error_msg = response.get("error", "Unknown error")
             logger.error(f"Slack API error: {error_msg}")
             raise SlackApiError(f"API call failed: {error_msg}", response)
-        return response
\ No newline at end of file
+        return response
+
+    async def _call(self, method: str, **kwargs) -> dict:
+        """
+        Call a Web API method (e.g. "conversations.list") within its tier's rate limit.
+
+        Requests wait for a token from the method's bucket; a 429 response blocks the
+        method for its Retry-After period and the request is retried.
+        """
+        api_method = getattr(self.client, method.replace(".", "_"))
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.acquire(method)
+            try:
+                return self._handle_response(await api_method(**kwargs))
+            except SlackApiError as e:
+                if getattr(e.response, "status_code", None) != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                headers = {k.lower(): v for k, v in (e.response.headers or {}).items()}
+                retry_after = int(headers.get("retry-after", DEFAULT_RETRY_AFTER))
+                logger.warning(f"Rate limited on {method}, retrying in {retry_after}s")
+                self.rate_limiter.block(method, retry_after)
+
+    async def _paginate(
+        self,
+        method: str,
+        key: str,
+        limit: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[dict]:
+        """
+        Yield items from a cursor-paginated method, requesting the largest pages allowed.
+
+        Args:
+            method: Web API method name, e.g. "users.list"
+            key: Response key holding the items, e.g. "members"
+            limit: Maximum number of items to yield, or None for all
+            **kwargs: Further arguments for the method
+        """
+        page_size = PAGE_SIZES.get(method, DEFAULT_PAGE_SIZE)
+        cursor = None
+        count = 0
+        start_time = time.time()
+        pages = 0
+        while limit is None or count < limit:
+            response = await self._call(
+                method,
+                cursor=cursor,
+                limit=page_size if limit is None else min(page_size, limit - count),
+                **kwargs
+            )
+            pages += 1
+            for item in response[key]:
+                yield item
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor or not response[key]:
+                break
+        logger.debug(f"{method}: {count} items in {pages} pages ({time.time() - start_time:.2f}s)")
+
+    async def _collect(self, method: str, key: str, limit: Optional[int] = None, **kwargs) -> List[dict]:
+        """Collect the items of a cursor-paginated method into a list."""
+        return [item async for item in self._paginate(method, key, limit, **kwargs)]
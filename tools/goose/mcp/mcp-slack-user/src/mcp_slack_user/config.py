@@ -1,3 +1,5 @@
+import os
+from pathlib import Path
 from pydantic import BaseModel, Field
 
 class SlackConfig(BaseModel):
@@ -7,4 +9,24 @@ class SlackConfig(BaseModel):
     workspace_id: str = Field(None, description="Workspace identifier")
 
     class Config:
-        frozen = True  # Make config immutable
\ No newline at end of file
+        frozen = True  # Make config immutable
+
+
+def get_cache_dir() -> Path:
+    """Directory for on-disk caches, from SLACK_CACHE_DIR or ~/.cache/mcp-slack-user."""
+    return Path(os.getenv("SLACK_CACHE_DIR", "~/.cache/mcp-slack-user")).expanduser()
+
+
+def get_directory_ttl() -> float:
+    """Seconds before the user and channel directory is re-synced from Slack."""
+    return float(os.getenv("SLACK_DIRECTORY_TTL", 3600))
+
+
+def get_archive_enabled() -> bool:
+    """Whether the local message archive is enabled (SLACK_ARCHIVE=1)."""
+    return os.getenv("SLACK_ARCHIVE", "").lower() in ("1", "true", "yes")
+
+
+def get_archive_initial_messages() -> int:
+    """Maximum number of messages fetched when a channel is first archived."""
+    return int(os.getenv("SLACK_ARCHIVE_INITIAL_MESSAGES", 1000))
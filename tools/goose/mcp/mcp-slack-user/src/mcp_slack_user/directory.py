@@ -0,0 +1,312 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("mcp-slack")
+
+# Minimum similarity for a fuzzy match, as with difflib.get_close_matches
+FUZZY_CUTOFF = 0.6
+# Candidates sharing the most trigrams with the query that are scored exactly
+FUZZY_CANDIDATES = 20
+# A lookup miss re-syncs the directory at most this often, so unknown names don't crawl Slack every time
+MISS_RESYNC_INTERVAL = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    real_name TEXT,
+    display_name TEXT,
+    email TEXT,
+    is_bot INTEGER,
+    deleted INTEGER,
+    updated INTEGER,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS channels (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    is_private INTEGER,
+    is_archived INTEGER,
+    updated INTEGER,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS names (
+    kind TEXT NOT NULL,
+    norm TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (kind, norm, id)
+);
+CREATE INDEX IF NOT EXISTS names_id ON names(kind, id);
+CREATE TABLE IF NOT EXISTS trigrams (
+    kind TEXT NOT NULL,
+    trigram TEXT NOT NULL,
+    id TEXT NOT NULL,
+    label TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trigrams_lookup ON trigrams(kind, trigram);
+CREATE INDEX IF NOT EXISTS trigrams_id ON trigrams(kind, id);
+CREATE TABLE IF NOT EXISTS dms (
+    user_id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    kind TEXT PRIMARY KEY,
+    synced_at REAL
+);
+"""
+
+
+def normalize_name(name: str) -> str:
+    """Normalise a name for matching: lowercase, no accents, no leading @/#, single spaces."""
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = name.strip().lstrip("@#").lower()
+    return re.sub(r"[\s._-]+", " ", name).strip()
+
+
+def trigrams(norm: str) -> set:
+    """Trigrams of a normalised name, padded so short names and word starts still match."""
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _user_names(user: dict) -> List[str]:
+    """Names a user can be looked up by."""
+    profile = user.get("profile") or {}
+    email = profile.get("email") or ""
+    names = [
+        user.get("name"),
+        user.get("real_name") or profile.get("real_name"),
+        profile.get("display_name"),
+        email,
+        email.split("@")[0] if email else None,
+    ]
+    return [n for n in dict.fromkeys(normalize_name(n) for n in names if n) if n]
+
+
+class SlackDirectory:
+    """
+    Local SQLite directory of workspace users and channels.
+
+    Every name a user or channel can be looked up by is stored normalised, for
+    indexed exact lookups, and split into trigrams, so fuzzy matching only scores
+    the few entries sharing trigrams with the query. Syncs from full listings only
+    rewrite entries whose `updated` timestamp changed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection keeps lookups fast; the lock makes it safe across threads
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def synced_at(self, kind: str) -> Optional[float]:
+        """Time of the last full sync of "user" or "channel" entries, or None if never synced."""
+        with self._lock:
+            row = self._conn.execute("SELECT synced_at FROM sync_state WHERE kind = ?", (kind,)).fetchone()
+        return row["synced_at"] if row else None
+
+    def is_stale(self, kind: str, max_age: float) -> bool:
+        """Whether entries of a kind were last fully synced more than max_age seconds ago."""
+        synced_at = self.synced_at(kind)
+        return synced_at is None or time.time() - synced_at > max_age
+
+    def _index_names(self, conn: sqlite3.Connection, kind: str, entry_id: str, names: List[str]):
+        conn.execute("DELETE FROM names WHERE kind = ? AND id = ?", (kind, entry_id))
+        conn.execute("DELETE FROM trigrams WHERE kind = ? AND id = ?", (kind, entry_id))
+        conn.executemany(
+            "INSERT OR IGNORE INTO names (kind, norm, id) VALUES (?, ?, ?)",
+            [(kind, norm, entry_id) for norm in names],
+        )
+        conn.executemany(
+            "INSERT INTO trigrams (kind, trigram, id, label) VALUES (?, ?, ?, ?)",
+            [(kind, trigram, entry_id, norm) for norm in names for trigram in trigrams(norm)],
+        )
+
+    def _write_user(self, conn: sqlite3.Connection, user: dict):
+        profile = user.get("profile") or {}
+        conn.execute(
+            "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                user["id"],
+                user.get("name"),
+                user.get("real_name") or profile.get("real_name"),
+                profile.get("display_name"),
+                profile.get("email"),
+                int(bool(user.get("is_bot"))),
+                int(bool(user.get("deleted"))),
+                user.get("updated"),
+                json.dumps(user),
+            ),
+        )
+        self._index_names(conn, "user", user["id"], _user_names(user))
+
+    def _write_channel(self, conn: sqlite3.Connection, channel: dict):
+        conn.execute(
+            "INSERT OR REPLACE INTO channels VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                channel["id"],
+                channel.get("name"),
+                int(bool(channel.get("is_private"))),
+                int(bool(channel.get("is_archived"))),
+                channel.get("updated"),
+                json.dumps(channel),
+            ),
+        )
+        names = [normalize_name(channel["name"])] if channel.get("name") else []
+        self._index_names(conn, "channel", channel["id"], names)
+
+    def _sync(self, table: str, kind: str, entries: Iterable[dict], writer) -> int:
+        """Write changed entries, drop entries missing from the listing and mark the kind synced."""
+        with self._lock, self._conn as conn:
+            known = {row["id"]: row["updated"] for row in conn.execute(f"SELECT id, updated FROM {table}")}
+            seen = set()
+            changed = 0
+            for entry in entries:
+                seen.add(entry["id"])
+                updated = entry.get("updated")
+                if updated is not None and known.get(entry["id"]) == updated:
+                    continue
+                writer(conn, entry)
+                changed += 1
+            removed = [(entry_id,) for entry_id in known if entry_id not in seen]
+            conn.executemany(f"DELETE FROM {table} WHERE id = ?", removed)
+            conn.executemany(f"DELETE FROM names WHERE kind = '{kind}' AND id = ?", removed)
+            conn.executemany(f"DELETE FROM trigrams WHERE kind = '{kind}' AND id = ?", removed)
+            conn.execute("INSERT OR REPLACE INTO sync_state (kind, synced_at) VALUES (?, ?)", (kind, time.time()))
+        logger.info(f"Directory sync: {changed} {kind}s updated, {len(removed)} removed")
+        return changed
+
+    def sync_users(self, users: Iterable[dict]) -> int:
+        """Sync the directory with a full users.list listing; returns the number of users rewritten."""
+        return self._sync("users", "user", users, self._write_user)
+
+    def sync_channels(self, channels: Iterable[dict]) -> int:
+        """Sync the directory with a full conversations.list listing; returns the number of channels rewritten."""
+        return self._sync("channels", "channel", channels, self._write_channel)
+
+    def upsert_user(self, user: dict):
+        """Add or update a single user, e.g. from users.info or users.lookupByEmail."""
+        with self._lock, self._conn as conn:
+            self._write_user(conn, user)
+
+    def upsert_channel(self, channel: dict):
+        """Add or update a single channel, e.g. from conversations.info."""
+        with self._lock, self._conn as conn:
+            self._write_channel(conn, channel)
+
+    def remove_channel(self, channel_id: str):
+        """Remove a channel that no longer exists or is no longer visible."""
+        with self._lock, self._conn as conn:
+            conn.execute("DELETE FROM channels WHERE id = ?", (channel_id,))
+            conn.execute("DELETE FROM names WHERE kind = 'channel' AND id = ?", (channel_id,))
+            conn.execute("DELETE FROM trigrams WHERE kind = 'channel' AND id = ?", (channel_id,))
+
+    def get_dm(self, user_id: str) -> Optional[str]:
+        """Get the cached ID of the DM channel with a user."""
+        with self._lock:
+            row = self._conn.execute("SELECT channel_id FROM dms WHERE user_id = ?", (user_id,)).fetchone()
+        return row["channel_id"] if row else None
+
+    def set_dms(self, dms: Dict[str, str]):
+        """Cache DM channel IDs by user ID; a user's DM channel never changes."""
+        with self._lock, self._conn as conn:
+            conn.executemany("INSERT OR REPLACE INTO dms (user_id, channel_id) VALUES (?, ?)", dms.items())
+
+    def remove_dm(self, user_id: str):
+        """Forget a cached DM channel that turned out to be invalid."""
+        with self._lock, self._conn as conn:
+            conn.execute("DELETE FROM dms WHERE user_id = ?", (user_id,))
+
+    def _exact(self, kind: str, table: str, order: str, name: str) -> Optional[str]:
+        norm = normalize_name(name)
+        if not norm:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT n.id FROM names n JOIN {table} t ON t.id = n.id "
+                f"WHERE n.kind = ? AND n.norm = ? ORDER BY {order} LIMIT 1",
+                (kind, norm),
+            ).fetchone()
+        return row["id"] if row else None
+
+    def _fuzzy(self, kind: str, table: str, where: str, name: str, limit: int) -> List[Tuple[str, str, float]]:
+        norm = normalize_name(name)
+        grams = sorted(trigrams(norm)) if norm else []
+        if not grams:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT g.id, g.label, COUNT(*) AS shared FROM trigrams g JOIN {table} t ON t.id = g.id "
+                f"WHERE g.kind = ? AND g.trigram IN ({','.join('?' * len(grams))}) AND {where} "
+                f"GROUP BY g.id, g.label ORDER BY shared DESC LIMIT ?",
+                [kind] + grams + [FUZZY_CANDIDATES],
+            ).fetchall()
+
+        best: Dict[str, Tuple[str, float]] = {}
+        for row in rows:
+            score = SequenceMatcher(None, norm, row["label"]).ratio()
+            if score >= FUZZY_CUTOFF and score > best.get(row["id"], ("", 0.0))[1]:
+                best[row["id"]] = (row["label"], score)
+        matches = sorted(((entry_id, label, score) for entry_id, (label, score) in best.items()), key=lambda m: -m[2])
+        return matches[:limit]
+
+    def find_user(self, name: str) -> Optional[str]:
+        """Exact lookup of a user ID by username, real name, display name or email; active users first."""
+        return self._exact("user", "users", "t.deleted, t.is_bot", name)
+
+    def fuzzy_users(self, name: str, limit: int = 1) -> List[Tuple[str, str, float]]:
+        """Closest active users to a name, as (user ID, matched name, similarity) best first."""
+        return self._fuzzy("user", "users", "t.deleted = 0", name, limit)
+
+    def find_channel(self, name: str) -> Optional[str]:
+        """Exact lookup of a channel ID by name, with or without the leading #."""
+        return self._exact("channel", "channels", "t.is_archived", name)
+
+    def fuzzy_channels(self, name: str, limit: int = 1) -> List[Tuple[str, str, float]]:
+        """Closest channels to a name, as (channel ID, matched name, similarity) best first."""
+        return self._fuzzy("channel", "channels", "t.is_archived = 0", name, limit)
+
+    def _names(self, sql: str, ids: Iterable[str]) -> Dict[str, str]:
+        ids = list(ids)
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(sql.format(",".join("?" * len(ids))), ids).fetchall()
+        return {row["id"]: row["label"] for row in rows if row["label"]}
+
+    def user_names(self, user_ids: Iterable[str]) -> Dict[str, str]:
+        """Display names (falling back to real name and username) of the given users."""
+        return self._names(
+            "SELECT id, COALESCE(NULLIF(display_name, ''), NULLIF(real_name, ''), name) AS label "
+            "FROM users WHERE id IN ({})",
+            user_ids,
+        )
+
+    def channel_names(self, channel_ids: Iterable[str]) -> Dict[str, str]:
+        """Names of the given channels."""
+        return self._names("SELECT id, name AS label FROM channels WHERE id IN ({})", channel_ids)
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        """Get the stored users.list entry for a user."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM users WHERE id = ?", (user_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_channel(self, channel_id: str) -> Optional[dict]:
+        """Get the stored conversations.list entry for a channel."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM channels WHERE id = ?", (channel_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
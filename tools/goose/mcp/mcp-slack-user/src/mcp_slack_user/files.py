@@ -1,11 +1,15 @@
 from typing import List, Optional, BinaryIO
+import logging
 from slack_sdk.errors import SlackApiError
 from .client import SlackClient
 
+# Configure logging
+logger = logging.getLogger("mcp-slack")
+
 class SlackFiles(SlackClient):
     """Handles Slack file operations."""
 
-    def upload_file(
+    async def upload_file(
         self,
         file: BinaryIO,
         filename: str,
@@ -15,7 +19,7 @@ class SlackFiles(SlackClient):
     ) -> dict:
         """Upload a file to Slack."""
         try:
-            response = self.client.files_upload_v2(
+            response = await self.client.files_upload_v2(
                 file=file,
                 filename=filename,
                 channel_ids=channels,
@@ -25,10 +29,10 @@ class SlackFiles(SlackClient):
             self._handle_response(response)
             return response["file"]
         except SlackApiError as e:
-            self.logger.error(f"Error uploading file: {str(e)}")
+            logger.error(f"Error uploading file: {str(e)}")
             raise
 
-    def list_files(
+    async def list_files(
         self,
         channel: Optional[str] = None,
         user: Optional[str] = None,
@@ -37,7 +41,7 @@ class SlackFiles(SlackClient):
     ) -> List[dict]:
         """List files in a channel or by a user."""
         try:
-            response = self.client.files_list(
+            response = await self.client.files_list(
                 channel=channel,
                 user=user,
                 types=types,
@@ -46,51 +50,51 @@ class SlackFiles(SlackClient):
             self._handle_response(response)
             return response["files"]
         except SlackApiError as e:
-            self.logger.error(f"Error listing files: {str(e)}")
+            logger.error(f"Error listing files: {str(e)}")
             raise
 
-    def get_file_info(self, file_id: str) -> dict:
+    async def get_file_info(self, file_id: str) -> dict:
         """Get information about a file."""
         try:
-            response = self.client.files_info(file=file_id)
+            response = await self.client.files_info(file=file_id)
             self._handle_response(response)
             return response["file"]
         except SlackApiError as e:
-            self.logger.error(f"Error getting file info: {str(e)}")
+            logger.error(f"Error getting file info: {str(e)}")
             raise
 
-    def delete_file(self, file_id: str) -> dict:
+    async def delete_file(self, file_id: str) -> dict:
         """Delete a file."""
         try:
-            response = self.client.files_delete(file=file_id)
+            response = await self.client.files_delete(file=file_id)
             self._handle_response(response)
             return response
         except SlackApiError as e:
-            self.logger.error(f"Error deleting file: {str(e)}")
+            logger.error(f"Error deleting file: {str(e)}")
             raise
 
-    def add_file_comment(self, file_id: str, comment: str) -> dict:
+    async def add_file_comment(self, file_id: str, comment: str) -> dict:
         """Add a comment to a file."""
         try:
-            response = self.client.files_comments_add(
+            response = await self.client.files_comments_add(
                 file=file_id,
                 comment=comment
             )
             self._handle_response(response)
             return response
         except SlackApiError as e:
-            self.logger.error(f"Error adding file comment: {str(e)}")
+            logger.error(f"Error adding file comment: {str(e)}")
             raise
 
-    def delete_file_comment(self, file_id: str, comment_id: str) -> dict:
+    async def delete_file_comment(self, file_id: str, comment_id: str) -> dict:
         """Delete a comment from a file."""
         try:
-            response = self.client.files_comments_delete(
+            response = await self.client.files_comments_delete(
                 file=file_id,
                 id=comment_id
             )
             self._handle_response(response)
             return response
         except SlackApiError as e:
-            self.logger.error(f"Error deleting file comment: {str(e)}")
+            logger.error(f"Error deleting file comment: {str(e)}")
             raise
\ No newline at end of file
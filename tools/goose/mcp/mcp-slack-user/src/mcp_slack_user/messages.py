@@ -2,93 +2,159 @@ from typing import Optional, List
 import logging
 import time
 from slack_sdk.errors import SlackApiError
-from .client import SlackClient
+from .client import SlackClient, gather_limited
+from .rate_limit import METHOD_TIERS, TIER_LIMITS
+from .config import get_archive_initial_messages
 
 # Configure logging
 logger = logging.getLogger("mcp-slack")
 
+# search.messages returns at most 100 matches per page
+SEARCH_PAGE_SIZE = 100
+
+# Archived channel reads within this many seconds of the last sync don't call Slack
+ARCHIVE_FRESHNESS = 60
+# Archived threads with replies in this window are checked for new replies on each sync
+THREAD_ACTIVE_WINDOW = 7 * 24 * 3600
+
+# Threads fetched at once: the conversations.replies tier's burst size, so the
+# rate limiter only has to delay requests beyond the burst
+THREAD_CONCURRENCY = max(1, TIER_LIMITS[METHOD_TIERS["conversations.replies"]] // 5)
+# Replies fetched per expanded thread
+REPLIES_PER_THREAD = 200
+
 class SlackMessages(SlackClient):
     """Handles Slack message operations."""
 
-    def get_channel_messages(self, channel_id: str, limit: int = 10) -> List[dict]:
-        """Get messages from a channel using pagination."""
+    async def get_channel_messages(self, channel_id: str, limit: int = 10) -> List[dict]:
+        """Get messages from a channel using pagination, from the archive when enabled."""
         try:
-            all_messages = []
-            cursor = None
-            
-            while len(all_messages) < limit:
-                # Get a page of messages
-                response = self.client.conversations_history(
-                    channel=channel_id,
-                    cursor=cursor,
-                    limit=min(limit - len(all_messages), 50)  # More conservative limit
-                )
-                self._handle_response(response)
-                
-                # Add messages from this page
-                all_messages.extend(response["messages"])
-                
-                # Check if there are more pages
-                cursor = response.get("response_metadata", {}).get("next_cursor")
-                if not cursor or len(all_messages) >= limit:
-                    break
-                
-                logger.debug(f"Fetched {len(all_messages)} messages, getting next page...")
-                # Add delay between requests to avoid rate limiting
-                time.sleep(1)
-            
+            archive = self.archive
+            if archive is not None:
+                synced_at = archive.synced_at(channel_id)
+                if synced_at is None or time.time() - synced_at > ARCHIVE_FRESHNESS:
+                    await self.sync_archive(channel_id, include_threads=False)
+                messages = archive.get_history(channel_id, limit)
+                if len(messages) >= limit or archive.is_complete(channel_id):
+                    logger.info(f"Total messages read from archive: {len(messages)}")
+                    return messages
+
+            all_messages = await self._collect("conversations.history", "messages", limit=limit, channel=channel_id)
             logger.info(f"Total messages fetched: {len(all_messages)}")
-            return all_messages[:limit]  # Ensure we don't return more than requested
+            return all_messages
         except SlackApiError as e:
             logger.error(f"Error fetching messages: {str(e)}")
             raise
 
-    def get_dm_messages(self, user_id: str, limit: int = 10) -> List[dict]:
-        """Get direct messages with a user using pagination."""
+    async def expand_threads(self, channel_id: str, messages: List[dict]) -> List[dict]:
+        """
+        Attach the replies of every thread among the messages, fetching threads concurrently.
+
+        Each thread parent gets a "replies" list (without the parent itself), so one
+        call returns the whole conversation tree.
+        """
+        parents = [m for m in messages if m.get("reply_count") and m.get("ts")]
+        threads = await gather_limited(
+            (self.get_message_replies(channel_id, m["ts"], limit=REPLIES_PER_THREAD) for m in parents),
+            THREAD_CONCURRENCY
+        )
+        for parent, thread in zip(parents, threads):
+            parent["replies"] = [r for r in thread if r.get("ts") != parent["ts"]]
+        logger.info(f"Expanded {len(parents)} threads in {channel_id}")
+        return messages
+
+    async def sync_archive(self, channel_id: str, include_threads: bool = True) -> dict:
+        """
+        Incrementally sync a channel's history, and optionally its threads, into the archive.
+
+        Only messages newer than the channel's watermark are fetched; the first sync
+        fetches the newest SLACK_ARCHIVE_INITIAL_MESSAGES messages. Threads are fetched
+        when new, or when they had replies within THREAD_ACTIVE_WINDOW.
+
+        Returns:
+            Dict with the number of new "messages" and of "threads" synced
+        """
+        archive = self.archive
+        if archive is None:
+            raise ValueError("Message archive is disabled (set SLACK_ARCHIVE=1)")
+
         try:
-            # List all DM channels with pagination
-            all_channels = []
-            cursor = None
-            
-            while True:
-                # Get a page of DM channels
-                response = self.client.conversations_list(
-                    types="im",
-                    cursor=cursor,
-                    limit=200  # Conservative limit
+            watermark = archive.get_watermark(channel_id)
+            if watermark:
+                messages = await self._collect("conversations.history", "messages", channel=channel_id, oldest=watermark)
+                archive.add_history(channel_id, messages)
+            else:
+                initial = get_archive_initial_messages()
+                messages = await self._collect("conversations.history", "messages", limit=initial, channel=channel_id)
+                archive.add_history(channel_id, messages, complete=len(messages) < initial)
+
+            threads = {}
+            if include_threads:
+                threads = archive.threads_to_sync(channel_id, time.time() - THREAD_ACTIVE_WINDOW)
+                await gather_limited(
+                    (self._sync_thread(channel_id, thread_ts, latest_reply) for thread_ts, latest_reply in threads.items()),
+                    THREAD_CONCURRENCY
                 )
-                self._handle_response(response)
-                
-                # Add channels from this page
-                all_channels.extend(response["channels"])
-                
-                # Check if there are more pages
-                cursor = response.get("response_metadata", {}).get("next_cursor")
-                if not cursor:
-                    break
-                
-                logger.debug(f"Fetched {len(all_channels)} DM channels, getting next page...")
-                # Add delay between requests to avoid rate limiting
-                time.sleep(1)
-            
-            # Find the DM channel with this user
-            dm_channel = None
-            for channel in all_channels:
-                if channel["user"] == user_id:
-                    dm_channel = channel
-                    break
-            
-            if not dm_channel:
-                logger.error(f"No DM channel found in {len(all_channels)} channels for user {user_id}")
-                raise ValueError(f"No DM channel found with user {user_id}")
 
-            # Then get messages from that channel
-            return self.get_channel_messages(dm_channel["id"], limit)
+            logger.info(f"Archived {len(messages)} new messages and {len(threads)} threads from {channel_id}")
+            return {"messages": len(messages), "threads": len(threads)}
+        except SlackApiError as e:
+            logger.error(f"Error syncing archive: {str(e)}")
+            raise
+
+    async def _sync_thread(self, channel_id: str, thread_ts: str, latest_reply: Optional[str]):
+        """Fetch a thread's replies newer than the latest archived one into the archive."""
+        kwargs = {"oldest": latest_reply} if latest_reply else {}
+        replies = await self._collect("conversations.replies", "messages", channel=channel_id, ts=thread_ts, **kwargs)
+        self.archive.add_replies(channel_id, thread_ts, replies)
+
+    async def get_dm_channel_id(self, user_id: str) -> str:
+        """
+        Get the ID of the DM channel with a user.
+
+        IDs are cached in the directory; a miss costs one conversations.open call.
+        Tokens without im:write fall back to listing IM channels once and caching
+        all of them.
+        """
+        channel_id = self.directory.get_dm(user_id)
+        if channel_id:
+            return channel_id
+
+        try:
+            response = await self._call("conversations.open", users=user_id)
+            channel_id = response["channel"]["id"]
+            self.directory.set_dms({user_id: channel_id})
+            return channel_id
+        except SlackApiError as e:
+            if "missing_scope" not in str(e):
+                raise
+            logger.info("conversations.open not permitted, listing DM channels instead")
+
+        dms = {channel["user"]: channel["id"] async for channel in self._paginate("conversations.list", "channels", types="im")}
+        self.directory.set_dms(dms)
+        if user_id not in dms:
+            logger.error(f"No DM channel found in {len(dms)} channels for user {user_id}")
+            raise ValueError(f"No DM channel found with user {user_id}")
+        return dms[user_id]
+
+    async def get_dm_messages(self, user_id: str, limit: int = 10) -> List[dict]:
+        """Get direct messages with a user using pagination."""
+        try:
+            channel_id = await self.get_dm_channel_id(user_id)
+            try:
+                return await self.get_channel_messages(channel_id, limit)
+            except SlackApiError as e:
+                if "channel_not_found" not in str(e):
+                    raise
+                # The cached channel is gone, e.g. the cache was copied from another workspace
+                logger.info(f"Cached DM channel {channel_id} invalid, resolving again")
+                self.directory.remove_dm(user_id)
+                return await self.get_channel_messages(await self.get_dm_channel_id(user_id), limit)
         except SlackApiError as e:
             logger.error(f"Error fetching DMs: {str(e)}")
             raise
 
-    def send_message(
+    async def send_message(
         self,
         channel: str,
         text: str,
@@ -97,19 +163,19 @@ class SlackMessages(SlackClient):
     ) -> dict:
         """Send a message to a channel or thread."""
         try:
-            response = self.client.chat_postMessage(
+            response = await self._call(
+                "chat.postMessage",
                 channel=channel,
                 text=text,
                 thread_ts=thread_ts,
                 reply_broadcast=reply_broadcast
             )
-            self._handle_response(response)
             return response
         except SlackApiError as e:
             logger.error(f"Error sending message: {str(e)}")
             raise
 
-    def update_message(
+    async def update_message(
         self,
         channel: str,
         ts: str,
@@ -117,74 +183,57 @@ class SlackMessages(SlackClient):
     ) -> dict:
         """Update an existing message."""
         try:
-            response = self.client.chat_update(
+            response = await self._call(
+                "chat.update",
                 channel=channel,
                 ts=ts,
                 text=text
             )
-            self._handle_response(response)
             return response
         except SlackApiError as e:
             logger.error(f"Error updating message: {str(e)}")
             raise
 
-    def delete_message(
+    async def delete_message(
         self,
         channel: str,
         ts: str
     ) -> dict:
         """Delete a message."""
         try:
-            response = self.client.chat_delete(
+            response = await self._call(
+                "chat.delete",
                 channel=channel,
                 ts=ts
             )
-            self._handle_response(response)
             return response
         except SlackApiError as e:
             logger.error(f"Error deleting message: {str(e)}")
             raise
 
-    def get_message_replies(
+    async def get_message_replies(
         self,
         channel: str,
         thread_ts: str,
         limit: int = 10
     ) -> List[dict]:
-        """Get replies in a message thread using pagination."""
+        """Get replies in a message thread using pagination, from the archive when enabled."""
         try:
-            all_replies = []
-            cursor = None
-            
-            while len(all_replies) < limit:
-                # Get a page of replies
-                response = self.client.conversations_replies(
-                    channel=channel,
-                    ts=thread_ts,
-                    cursor=cursor,
-                    limit=min(limit - len(all_replies), 50)  # More conservative limit
-                )
-                self._handle_response(response)
-                
-                # Add replies from this page
-                all_replies.extend(response["messages"])
-                
-                # Check if there are more pages
-                cursor = response.get("response_metadata", {}).get("next_cursor")
-                if not cursor or len(all_replies) >= limit:
-                    break
-                
-                logger.debug(f"Fetched {len(all_replies)} replies, getting next page...")
-                # Add delay between requests to avoid rate limiting
-                time.sleep(1)
-            
+            archive = self.archive
+            if archive is not None:
+                await self._sync_thread(channel, thread_ts, archive.get_latest_reply(channel, thread_ts))
+                return archive.get_thread(channel, thread_ts)[:limit]
+
+            all_replies = await self._collect(
+                "conversations.replies", "messages", limit=limit, channel=channel, ts=thread_ts
+            )
             logger.info(f"Total replies fetched: {len(all_replies)}")
-            return all_replies[:limit]  # Ensure we don't return more than requested
+            return all_replies
         except SlackApiError as e:
             logger.error(f"Error fetching replies: {str(e)}")
             raise
 
-    def search_messages(
+    async def search_messages(
         self,
         query: str,
         channel: Optional[str] = None,
@@ -194,15 +243,17 @@ class SlackMessages(SlackClient):
         try:
             all_results = []
             page = 1
+            # Channel filtering happens client-side, so fetch full pages in that case
+            count = SEARCH_PAGE_SIZE if channel else min(limit, SEARCH_PAGE_SIZE)
             
             while len(all_results) < limit:
                 # Get a page of search results
-                response = self.client.search_messages(
+                response = await self._call(
+                    "search.messages",
                     query=query,
                     page=page,
-                    count=min(limit - len(all_results), 50)  # More conservative limit
+                    count=count
                 )
-                self._handle_response(response)
                 
                 # Add messages from this page
                 matches = response["messages"]["matches"]
@@ -216,11 +267,9 @@ class SlackMessages(SlackClient):
                 
                 page += 1
                 logger.debug(f"Fetched {len(all_results)} search results, getting next page...")
-                # Add delay between requests to avoid rate limiting
-                time.sleep(1)
             
             logger.info(f"Total search results fetched: {len(all_results)}")
             return all_results[:limit]  # Ensure we don't return more than requested
         except SlackApiError as e:
             logger.error(f"Error searching messages: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -1,69 +1,82 @@
 import re
-from typing import Optional
-from markdownify import markdownify as md
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .directory import SlackDirectory
+
+# One pass over the text matches every Slack control sequence (<...>) and escaped entity
+SLACK_TOKEN_PATTERN = re.compile(r"<([^<>]*)>|&(lt|gt|amp);")
+USER_MENTION_PATTERN = re.compile(r"<@([UW][A-Z0-9]+)(?:\|[^>]*)?>")
+CHANNEL_MENTION_PATTERN = re.compile(r"<#(C[A-Z0-9]+)(?:\|[^>]*)?>")
+
+MARKDOWN_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+PLAIN_URL_PATTERN = re.compile(r"(?<!<)(https?://\S+)(?!>)")
+
+ENTITY_PATTERN = re.compile(r"&(lt|gt|amp);")
+ENTITIES = {"lt": "<", "gt": ">", "amp": "&"}
+SPECIAL_MENTIONS = {"here": "@here", "channel": "@channel", "everyone": "@everyone"}
+
 
 class TextPreprocessor:
     """Handles text preprocessing for Slack content."""
 
-    def __init__(self, workspace_url: Optional[str] = None):
+    def __init__(self, workspace_url: Optional[str] = None, directory: Optional[SlackDirectory] = None):
         self.workspace_url = workspace_url
+        self.directory = directory
+
+    def _lookup_names(self, texts: Iterable[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Resolve every user and channel mentioned in the texts with one directory query each."""
+        texts = [t for t in texts if t]
+        if self.directory is None or not texts:
+            return {}, {}
+        user_ids = {m for t in texts for m in USER_MENTION_PATTERN.findall(t)}
+        channel_ids = {m for t in texts for m in CHANNEL_MENTION_PATTERN.findall(t)}
+        return self.directory.user_names(user_ids), self.directory.channel_names(channel_ids)
+
+    def _replacer(self, users: Dict[str, str], channels: Dict[str, str]) -> Callable[[re.Match], str]:
+        """Build the replacement for SLACK_TOKEN_PATTERN matches, given resolved names."""
+        def replace(match: re.Match) -> str:
+            entity = match.group(2)
+            if entity:
+                return ENTITIES[entity]
+
+            inner = match.group(1)
+            if "&" in inner:
+                inner = ENTITY_PATTERN.sub(lambda m: ENTITIES[m.group(1)], inner)
+            token, _, label = inner.partition("|")
+            if token.startswith("@"):
+                user_id = token[1:]
+                return f"@{users.get(user_id) or label or f'user_{user_id}'}"
+            if token.startswith("#"):
+                channel_id = token[1:]
+                return f"#{label or channels.get(channel_id) or f'channel_{channel_id}'}"
+            if token.startswith("!"):
+                # Special mentions (<!here>), user groups (<!subteam^S123|@team>) and dates
+                command = token[1:].split("^")[0]
+                return label or SPECIAL_MENTIONS.get(command, f"@{command}")
+            if label and token.startswith(("http://", "https://")):
+                return f"[{label}]({token})"
+            # Plain URLs, mailto: links and anything unknown
+            return label or token
+
+        return replace
 
     def clean_slack_text(self, text: str) -> str:
         """
-        Clean and format Slack text content:
-        1. Convert user mentions to readable format
+        Clean and format Slack text content in a single pass:
+        1. Convert user mentions to names from the directory
         2. Convert channel mentions to readable format
         3. Process links and URLs
-        4. Handle special characters and formatting
+        4. Decode escaped special characters
         """
         if not text:
             return ""
+        replace = self._replacer(*self._lookup_names([text]))
+        return SLACK_TOKEN_PATTERN.sub(replace, text).strip()
 
-        # Process user mentions (<@U123ABC>)
-        text = re.sub(
-            r"<@([A-Z0-9]+)>",
-            lambda m: f"@user_{m.group(1)}",
-            text
-        )
-
-        # Process channel mentions (<#C123ABC>)
-        text = re.sub(
-            r"<#([A-Z0-9]+)(?:\|([^>]+))?>",
-            lambda m: f"#{m.group(2) if m.group(2) else f'channel_{m.group(1)}'}",
-            text
-        )
-
-        # Process links (<http://example.com|text>)
-        text = re.sub(
-            r"<((?:http|https)://[^|>]+)\|([^>]+)>",
-            lambda m: f"[{m.group(2)}]({m.group(1)})",
-            text
-        )
-
-        # Process plain URLs (<http://example.com>)
-        text = re.sub(
-            r"<((?:http|https)://[^>]+)>",
-            lambda m: m.group(1),
-            text
-        )
-
-        # Convert HTML to markdown if present
-        if re.search(r"<[^>]+>", text):
-            text = md(text)
-
-        # Handle special characters
-        text = text.replace("&lt;", "<") \
-                   .replace("&gt;", ">") \
-                   .replace("&amp;", "&")
-
-        # Process emoji
-        text = re.sub(
-            r":([a-z0-9_+-]+):",
-            lambda m: f":{m.group(1)}:",
-            text
-        )
-
-        return text.strip()
+    def clean_batch(self, texts: List[str]) -> List[str]:
+        """Clean many texts, resolving all their mentions with a single directory lookup."""
+        replace = self._replacer(*self._lookup_names(texts))
+        return [SLACK_TOKEN_PATTERN.sub(replace, text).strip() if text else "" for text in texts]
 
     def format_for_slack(self, text: str) -> str:
         """
@@ -81,17 +94,15 @@ class TextPreprocessor:
                    .replace(">", "&gt;")
 
         # Format markdown links
-        text = re.sub(
-            r"\[([^\]]+)\]\(([^)]+)\)",
+        text = MARKDOWN_LINK_PATTERN.sub(
             lambda m: f"<{m.group(2)}|{m.group(1)}>",
             text
         )
 
         # Format plain URLs
-        text = re.sub(
-            r"(?<!<)(https?://\S+)(?!>)",
+        text = PLAIN_URL_PATTERN.sub(
             lambda m: f"<{m.group(1)}>",
             text
         )
 
-        return text.strip()
\ No newline at end of file
+        return text.strip()
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+# Slack Web API rate limit tiers, in requests per minute
+# https://api.slack.com/docs/rate-limits
+TIER_LIMITS = {
+    1: 1,
+    2: 20,
+    3: 50,
+    4: 100,
+}
+
+# Tier of each Web API method used by this server; unknown methods are treated as Tier 3
+METHOD_TIERS = {
+    "auth.test": 4,
+    "bots.info": 4,
+    "chat.delete": 3,
+    "chat.postMessage": 4,
+    "chat.update": 3,
+    "conversations.archive": 2,
+    "conversations.create": 2,
+    "conversations.history": 3,
+    "conversations.info": 3,
+    "conversations.invite": 3,
+    "conversations.join": 3,
+    "conversations.leave": 3,
+    "conversations.list": 2,
+    "conversations.members": 4,
+    "conversations.open": 3,
+    "conversations.rename": 2,
+    "conversations.replies": 3,
+    "conversations.unarchive": 2,
+    "search.messages": 2,
+    "users.getPresence": 3,
+    "users.info": 4,
+    "users.list": 2,
+    "users.lookupByEmail": 3,
+    "users.profile.get": 4,
+}
+DEFAULT_TIER = 3
+
+
+class TokenBucket:
+    """Token bucket refilled at a tier's per-minute rate, allowing short bursts up to capacity."""
+
+    def __init__(self, per_minute: int, capacity: Optional[int] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or max(1, per_minute // 5)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def block(self, now: float, seconds: float):
+        """Stop handing out tokens for the given time, e.g. after a 429 with Retry-After."""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimiter:
+    """
+    Per-method token buckets sized by Slack's rate limit tiers.
+
+    Slack applies tier limits per method and workspace, so every client sharing a
+    token shares one limiter. Reservations are computed under a lock and return the
+    delay to wait, so concurrent tasks each get their own slot without holding the lock.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, method: str) -> TokenBucket:
+        bucket = self._buckets.get(method)
+        if bucket is None:
+            tier = METHOD_TIERS.get(method, DEFAULT_TIER)
+            bucket = self._buckets[method] = TokenBucket(TIER_LIMITS[tier])
+        return bucket
+
+    def reserve(self, method: str) -> float:
+        """Reserve a request slot for a method and return the seconds to wait before sending it."""
+        with self._lock:
+            return self._bucket(method).reserve(time.monotonic())
+
+    def block(self, method: str, seconds: float):
+        """Hold back all requests for a method, honouring a Retry-After header."""
+        with self._lock:
+            self._bucket(method).block(time.monotonic(), seconds)
+
+    async def acquire(self, method: str):
+        """Wait until a request for the method may be sent."""
+        wait = self.reserve(method)
+        if wait > 0:
+            await asyncio.sleep(wait)
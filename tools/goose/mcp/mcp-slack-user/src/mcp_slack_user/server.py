@@ -1,8 +1,8 @@
+import asyncio
 import json
 import logging
 import urllib.parse
 from typing import Any, List, Sequence
-from difflib import get_close_matches
 from mcp.server import Server
 from mcp.types import Resource, TextContent, Tool
 from pydantic import AnyUrl
@@ -11,6 +11,7 @@ from .messages import SlackMessages
 from .channels import SlackChannels
 from .users import SlackUsers
 from .files import SlackFiles
+from .preprocessing import TextPreprocessor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,9 +27,10 @@ class SlackHandlers:
     channels: SlackChannels = None
     users: SlackUsers = None
     files: SlackFiles = None
+    preprocessor: TextPreprocessor = None
 
     @classmethod
-    def initialize(cls):
+    async def initialize(cls):
         """Initialize Slack handlers if not already initialized."""
         if cls._instance is None:
             try:
@@ -36,6 +38,13 @@ class SlackHandlers:
                 cls.channels = SlackChannels()
                 cls.users = SlackUsers()
                 cls.files = SlackFiles()
+                await asyncio.gather(
+                    cls.messages.connect(),
+                    cls.channels.connect(),
+                    cls.users.connect(),
+                    cls.files.connect(),
+                )
+                cls.preprocessor = TextPreprocessor(directory=cls.users.directory)
                 cls._instance = cls
                 logger.info("Slack handlers initialized successfully")
             except ValueError as e:
@@ -44,66 +53,24 @@ class SlackHandlers:
         return cls._instance
 
     @classmethod
-    def get_instance(cls):
+    async def get_instance(cls):
         """Get the singleton instance, initializing if needed."""
         if cls._instance is None:
-            cls.initialize()
+            await cls.initialize()
         return cls._instance
 
-def _get_user_id(name: str) -> str:
+async def _get_user_id(name: str) -> str:
     """Get user ID from name or email."""
-    handlers = SlackHandlers.get_instance()
+    handlers = await SlackHandlers.get_instance()
     
     # URL decode the name
     name = urllib.parse.unquote(name)
     logger.info(f"Looking up user: {name}")
-    
-    # If it's an email, try direct lookup
-    if '@' in name:
-        try:
-            user = handlers.users.get_user_by_email(name)
-            logger.info(f"Found user by email: {user.get('real_name', '')}")
-            return user['id']
-        except Exception as e:
-            logger.error(f"Error looking up by email: {str(e)}")
-            # Fall through to name-based lookup
-    
-    # Try name-based lookup
-    users = handlers.users.list_users()
-    # Create list of names (both real names and usernames)
-    names = [(user['id'], user.get('real_name', ''), user.get('name', '')) for user in users]
-    
-    # Try exact match first
-    for user_id, real_name, username in names:
-        if name in (real_name, username):
-            logger.info(f"Found exact match: {real_name} (@{username})")
-            return user_id
-    
-    # Try fuzzy match on real names
-    real_names = [real_name for _, real_name, _ in names if real_name]
-    matches = get_close_matches(name, real_names, n=1, cutoff=0.6)
-    if matches:
-        matched_name = matches[0]
-        logger.info(f"Found fuzzy match on real name: {matched_name}")
-        for user_id, real_name, _ in names:
-            if real_name == matched_name:
-                return user_id
-    
-    # Try fuzzy match on usernames
-    usernames = [username for _, _, username in names if username]
-    matches = get_close_matches(name, usernames, n=1, cutoff=0.6)
-    if matches:
-        matched_name = matches[0]
-        logger.info(f"Found fuzzy match on username: {matched_name}")
-        for user_id, _, username in names:
-            if username == matched_name:
-                return user_id
-    
-    raise ValueError(f"User not found: {name}")
+    return await handlers.users.find_user_id(name)
 
-def _get_channel_id(channel_name_or_id: str) -> str:
+async def _get_channel_id(channel_name_or_id: str) -> str:
     """Get channel ID from name or return the ID if already an ID."""
-    handlers = SlackHandlers.get_instance()
+    handlers = await SlackHandlers.get_instance()
     
     if channel_name_or_id.startswith('C'):  # It's already an ID
         return channel_name_or_id
@@ -113,21 +80,49 @@ def _get_channel_id(channel_name_or_id: str) -> str:
     
     # Try to get channel directly
     try:
-        channel = handlers.channels.get_channel_by_name(channel_name_or_id)
+        channel = await handlers.channels.get_channel_by_name(channel_name_or_id)
         return channel['id']
     except ValueError as e:
         logger.error(f"Error getting channel: {str(e)}")
         raise
 
+async def _format_messages(messages: List[dict]) -> str:
+    """Render messages for reading, with author and mention names resolved from the directory."""
+    handlers = await SlackHandlers.get_instance()
+    await handlers.users.refresh_directory()
+    # Expanded thread replies are cleaned and resolved in the same batch as their parents
+    replies = [reply for msg in messages for reply in msg.get('replies', [])]
+    texts = handlers.preprocessor.clean_batch([msg.get('text', '') for msg in messages + replies])
+    reply_texts = iter(texts[len(messages):])
+    authors = handlers.users.directory.user_names({msg['user'] for msg in messages + replies if msg.get('user')})
+    content = []
+    for msg, text in zip(messages, texts):
+        author = authors.get(msg.get('user')) or msg.get('user', 'Unknown')
+        block = f"# {author}: {msg.get('ts')}\n\n{text}\n"
+        for reply in msg.get('replies', []):
+            reply_author = authors.get(reply.get('user')) or reply.get('user', 'Unknown')
+            reply_text = next(reply_texts).replace("\n", "\n    ")
+            block += f"\n    ↳ {reply_author}: {reply.get('ts')}\n    {reply_text}\n"
+        content.append(f"{block}---")
+    return "\n\n".join(content)
+
 @app.list_resources()
 async def list_resources() -> List[Resource]:
     """List available Slack channels and users as resources."""
-    handlers = SlackHandlers.get_instance()
+    handlers = await SlackHandlers.get_instance()
     resources = []
 
+    # Fetch channels and users concurrently
+    channels, users = await asyncio.gather(
+        handlers.channels.list_channels(),
+        handlers.users.list_users(),
+        return_exceptions=True,
+    )
+
     # Add channels
-    try:
-        channels = handlers.channels.list_channels()
+    if isinstance(channels, Exception):
+        logger.error(f"Error fetching channels: {str(channels)}")
+    else:
         resources.extend([
             Resource(
                 uri=AnyUrl(f"slack://channel/{channel['id']}"),
@@ -137,42 +132,40 @@ async def list_resources() -> List[Resource]:
             )
             for channel in channels
         ])
-    except Exception as e:
-        logger.error(f"Error fetching channels: {str(e)}")
 
     # Add users
-    try:
-        users = handlers.users.list_users()
+    if isinstance(users, Exception):
+        logger.error(f"Error fetching users: {str(users)}")
+    else:
         resources.extend([
             Resource(
                 uri=AnyUrl(f"slack://user/{user['id']}"),
-                name=f"User: {user['real_name'] or user['name']}",
+                name=f"User: {user.get('real_name') or user['name']}",
                 mimeType="text/plain",
                 description=user.get("profile", {}).get("status_text", ""),
             )
             for user in users
             if not user.get("is_bot", False) and not user.get("deleted", False)
         ])
-    except Exception as e:
-        logger.error(f"Error fetching users: {str(e)}")
 
     return resources
 
 @app.read_resource()
 async def read_resource(uri: AnyUrl) -> str:
     """Read content from Slack."""
-    handlers = SlackHandlers.get_instance()
+    handlers = await SlackHandlers.get_instance()
     uri_str = str(uri)
 
     if uri_str.startswith("slack://channel/"):
-        channel_name_or_id = uri_str.replace("slack://channel/", "")
+        # slack://channel/<name or id>?threads=true also expands every thread in the result
+        channel_name_or_id, _, query = uri_str.replace("slack://channel/", "").partition("?")
+        expand_threads = urllib.parse.parse_qs(query).get("threads", ["false"])[0].lower() in ("1", "true", "yes")
         try:
-            channel_id = _get_channel_id(channel_name_or_id)
-            messages = handlers.messages.get_channel_messages(channel_id, limit=10)
-            content = []
-            for msg in messages:
-                content.append(f"# {msg.get('user', 'Unknown')}: {msg.get('ts')}\n\n{msg.get('text', '')}\n---")
-            return "\n\n".join(content)
+            channel_id = await _get_channel_id(channel_name_or_id)
+            messages = await handlers.messages.get_channel_messages(channel_id, limit=10)
+            if expand_threads:
+                messages = await handlers.messages.expand_threads(channel_id, messages)
+            return await _format_messages(messages)
         except ValueError as e:
             logger.error(f"Error reading channel: {str(e)}")
             raise
@@ -182,14 +175,11 @@ async def read_resource(uri: AnyUrl) -> str:
         try:
             # If it's a name or email, get the ID
             if not user_name_or_id.startswith('U'):
-                user_name_or_id = _get_user_id(user_name_or_id)
+                user_name_or_id = await _get_user_id(user_name_or_id)
             
             # Get DMs with user
-            messages = handlers.messages.get_dm_messages(user_name_or_id, limit=10)
-            content = []
-            for msg in messages:
-                content.append(f"# {msg.get('user', 'Unknown')}: {msg.get('ts')}\n\n{msg.get('text', '')}\n---")
-            return "\n\n".join(content)
+            messages = await handlers.messages.get_dm_messages(user_name_or_id, limit=10)
+            return await _format_messages(messages)
         except ValueError as e:
             logger.error(f"Error reading DMs: {str(e)}")
             raise
@@ -232,16 +222,19 @@ async def list_tools() -> List[Tool]:
                 "Just provide either:\n"
                 "1. Channel name (with or without #)\n"
                 "2. Channel ID if known\n\n"
-                "Returns the last 10 messages from the channel.\n\n"
+                "Returns the last 10 messages from the channel.\n"
+                "Set include_threads to also return every thread's replies under its parent message.\n\n"
                 "Example usage:\n"
                 '- Get by name: slack_get_channel(name="general-mangopay")\n'
-                '- Get by ID: slack_get_channel(id="C1234567890")'
+                '- Get by ID: slack_get_channel(id="C1234567890")\n'
+                '- With threads: slack_get_channel(name="general-mangopay", include_threads=true)'
             ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "name": {"type": "string", "description": "Channel name with or without # (e.g., 'general-mangopay' or '#general-mangopay')"},
                     "id": {"type": "string", "description": "Channel ID if known"},
+                    "include_threads": {"type": "boolean", "description": "Include thread replies under their parent messages", "default": False},
                 },
                 "anyOf": [{"required": ["name"]}, {"required": ["id"]}],
                 "examples": [
@@ -303,20 +296,49 @@ async def list_tools() -> List[Tool]:
                 "required": ["query"],
             },
         ),
+        Tool(
+            name="slack_archive_sync",
+            description=(
+                "Incrementally sync channel history and threads into the local message archive "
+                "(requires SLACK_ARCHIVE=1). Only messages newer than the last sync are fetched."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "channels": {"type": "array", "items": {"type": "string"}, "description": "Channel names or IDs to sync"},
+                    "include_threads": {"type": "boolean", "description": "Also sync thread replies", "default": True},
+                },
+                "required": ["channels"],
+            },
+        ),
+        Tool(
+            name="slack_local_search",
+            description="Search the local message archive by keywords, without calling Slack (run slack_archive_sync first)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Keywords (SQLite FTS5 syntax, e.g. 'deploy AND failed', 'incident*')"},
+                    "channel": {"type": "string", "description": "Channel name or ID to search in", "default": None},
+                    "user": {"type": "string", "description": "User ID of the author", "default": None},
+                    "limit": {"type": "number", "description": "Max results to return", "default": 20},
+                },
+                "required": ["query"],
+            },
+        ),
     ]
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     """Handle tool calls for Slack operations."""
-    handlers = SlackHandlers.get_instance()
+    handlers = await SlackHandlers.get_instance()
     
     try:
         if name == "slack_get_user":
             # Get user ID from email or name
             if "email" in arguments:
-                user_id = _get_user_id(arguments["email"])
+                user_id = await _get_user_id(arguments["email"])
             else:
-                user_id = _get_user_id(arguments["name"])
+                user_id = await _get_user_id(arguments["name"])
             
             # Use read_resource to get DMs
             uri = AnyUrl(f"slack://user/{user_id}")
@@ -325,16 +347,17 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
 
         elif name == "slack_get_channel":
             # Get channel ID from name or use provided ID
-            channel_id = arguments.get("id") or _get_channel_id(arguments["name"])
+            channel_id = arguments.get("id") or await _get_channel_id(arguments["name"])
             
             # Use read_resource to get messages
-            uri = AnyUrl(f"slack://channel/{channel_id}")
+            query = "?threads=true" if arguments.get("include_threads") else ""
+            uri = AnyUrl(f"slack://channel/{channel_id}{query}")
             content = await read_resource(uri)
             return [TextContent(type="text", text=content)]
 
         elif name == "slack_send_message":
-            channel = _get_channel_id(arguments["channel"])
-            response = handlers.messages.send_message(
+            channel = await _get_channel_id(arguments["channel"])
+            response = await handlers.messages.send_message(
                 channel=channel,
                 text=arguments["text"],
                 thread_ts=arguments.get("thread_ts")
@@ -342,7 +365,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             return [TextContent(type="text", text=json.dumps(response, indent=2))]
 
         elif name == "slack_create_channel":
-            response = handlers.channels.create_channel(
+            response = await handlers.channels.create_channel(
                 name=arguments["name"],
                 is_private=arguments.get("is_private", False),
                 user_ids=arguments.get("user_ids")
@@ -353,8 +376,8 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             from io import BytesIO
             file_content = arguments["content"].encode()
             file_obj = BytesIO(file_content)
-            channels = [_get_channel_id(c) for c in arguments.get("channels", [])] if arguments.get("channels") else None
-            response = handlers.files.upload_file(
+            channels = [await _get_channel_id(c) for c in arguments.get("channels", [])] if arguments.get("channels") else None
+            response = await handlers.files.upload_file(
                 file=file_obj,
                 filename=arguments["filename"],
                 channels=channels,
@@ -363,14 +386,37 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
             return [TextContent(type="text", text=json.dumps(response, indent=2))]
 
         elif name == "slack_search_messages":
-            channel = _get_channel_id(arguments["channel"]) if arguments.get("channel") else None
-            messages = handlers.messages.search_messages(
+            channel = await _get_channel_id(arguments["channel"]) if arguments.get("channel") else None
+            messages = await handlers.messages.search_messages(
                 query=arguments["query"],
                 channel=channel,
                 limit=arguments.get("limit", 10)
             )
             return [TextContent(type="text", text=json.dumps(messages, indent=2))]
 
+        elif name in ("slack_archive_sync", "slack_local_search"):
+            archive = handlers.messages.archive
+            if archive is None:
+                raise ValueError("Message archive is disabled (set SLACK_ARCHIVE=1)")
+
+            if name == "slack_archive_sync":
+                synced = {}
+                for channel in arguments["channels"]:
+                    channel_id = await _get_channel_id(channel)
+                    synced[channel] = await handlers.messages.sync_archive(
+                        channel_id, include_threads=arguments.get("include_threads", True)
+                    )
+                return [TextContent(type="text", text=json.dumps({"synced": synced}, indent=2))]
+
+            channel = await _get_channel_id(arguments["channel"]) if arguments.get("channel") else None
+            messages = archive.search(
+                arguments["query"],
+                channel_id=channel,
+                user=arguments.get("user"),
+                limit=int(arguments.get("limit", 20))
+            )
+            return [TextContent(type="text", text=json.dumps(messages, indent=2))]
+
         raise ValueError(f"Unknown tool: {name}")
 
     except Exception as e:
@@ -380,7 +426,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
 async def main():
     """Initialize Slack handlers and run server."""
     # Initialize handlers
-    SlackHandlers.initialize()
+    await SlackHandlers.initialize()
 
     # Import here to avoid issues with event loops
     from mcp.server.stdio import stdio_server
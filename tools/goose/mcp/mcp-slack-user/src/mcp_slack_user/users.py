@@ -1,8 +1,9 @@
 from typing import List, Optional
 import logging
-import time
 from slack_sdk.errors import SlackApiError
 from .client import SlackClient
+from .config import get_directory_ttl
+from .directory import MISS_RESYNC_INTERVAL
 
 # Configure logging
 logger = logging.getLogger("mcp-slack")
@@ -10,117 +11,111 @@ logger = logging.getLogger("mcp-slack")
 class SlackUsers(SlackClient):
     """Handles Slack user operations."""
 
-    def list_users(self, include_presence: bool = False) -> List[dict]:
+    async def list_users(self, include_presence: bool = False) -> List[dict]:
         """List all users in the workspace using pagination."""
         try:
-            all_users = []
-            cursor = None
-            
-            while True:
-                # Get a page of users
-                response = self.client.users_list(
-                    presence=include_presence,
-                    cursor=cursor,
-                    limit=200  # More conservative limit to avoid rate limiting
-                )
-                self._handle_response(response)
-                
-                # Add users from this page
-                all_users.extend(response["members"])
-                
-                # Check if there are more pages
-                cursor = response.get("response_metadata", {}).get("next_cursor")
-                if not cursor:
-                    break
-                
-                logger.debug(f"Fetched {len(all_users)} users, getting next page...")
-                # Add delay between requests to avoid rate limiting
-                time.sleep(1)
-            
+            all_users = await self._collect("users.list", "members", presence=include_presence)
             logger.info(f"Total users fetched: {len(all_users)}")
+            self.directory.sync_users(all_users)
             return all_users
         except SlackApiError as e:
             logger.error(f"Error listing users: {str(e)}")
             raise
 
-    def get_user_info(self, user_id: str) -> dict:
+    async def get_user_info(self, user_id: str) -> dict:
         """Get information about a specific user."""
         try:
-            response = self.client.users_info(user=user_id)
-            self._handle_response(response)
+            response = await self._call("users.info", user=user_id)
+            self.directory.upsert_user(response["user"])
             return response["user"]
         except SlackApiError as e:
             logger.error(f"Error getting user info: {str(e)}")
             raise
 
-    def get_user_presence(self, user_id: str) -> dict:
+    async def refresh_directory(self):
+        """Re-sync users into the directory if it is older than SLACK_DIRECTORY_TTL."""
+        if self.directory.is_stale("user", get_directory_ttl()):
+            await self.list_users()
+
+    async def find_user_id(self, name: str) -> str:
+        """
+        Get a user ID from an email, username, real name or display name.
+
+        Lookups go to the local directory: exact matches on normalised names first,
+        then the closest fuzzy match. The directory is re-synced when older than
+        SLACK_DIRECTORY_TTL, or on a miss if the last sync is a few minutes old.
+        """
+        await self.refresh_directory()
+
+        for attempt in range(2):
+            user_id = self.directory.find_user(name)
+            if user_id:
+                logger.info(f"Found exact match for {name}: {user_id}")
+                return user_id
+
+            # Emails of users outside the directory can still be resolved directly
+            if '@' in name and attempt == 0:
+                try:
+                    return (await self.get_user_by_email(name))["id"]
+                except SlackApiError as e:
+                    logger.info(f"No user with email {name}: {str(e)}")
+
+            matches = self.directory.fuzzy_users(name)
+            if matches:
+                user_id, matched_name, score = matches[0]
+                logger.info(f"Found fuzzy match for {name}: {matched_name} ({score:.2f})")
+                return user_id
+
+            if attempt == 0 and self.directory.is_stale("user", MISS_RESYNC_INTERVAL):
+                logger.info(f"User {name} not in directory, re-syncing")
+                await self.list_users()
+            else:
+                break
+
+        raise ValueError(f"User not found: {name}")
+
+    async def get_user_presence(self, user_id: str) -> dict:
         """Get a user's presence status."""
         try:
-            response = self.client.users_getPresence(user=user_id)
-            self._handle_response(response)
+            response = await self._call("users.getPresence", user=user_id)
             return response
         except SlackApiError as e:
             logger.error(f"Error getting user presence: {str(e)}")
             raise
 
-    def get_user_by_email(self, email: str) -> dict:
+    async def get_user_by_email(self, email: str) -> dict:
         """Look up a user by their email address."""
         try:
-            response = self.client.users_lookupByEmail(email=email)
-            self._handle_response(response)
+            response = await self._call("users.lookupByEmail", email=email)
+            self.directory.upsert_user(response["user"])
             return response["user"]
         except SlackApiError as e:
             logger.error(f"Error looking up user by email: {str(e)}")
             raise
 
-    def get_user_profile(self, user_id: str) -> dict:
+    async def get_user_profile(self, user_id: str) -> dict:
         """Get a user's profile information."""
         try:
-            response = self.client.users_profile_get(user=user_id)
-            self._handle_response(response)
+            response = await self._call("users.profile.get", user=user_id)
             return response["profile"]
         except SlackApiError as e:
             logger.error(f"Error getting user profile: {str(e)}")
             raise
 
-    def get_users_in_channel(self, channel_id: str) -> List[str]:
+    async def get_users_in_channel(self, channel_id: str) -> List[str]:
         """Get list of user IDs in a channel using pagination."""
         try:
-            all_members = []
-            cursor = None
-            
-            while True:
-                # Get a page of members
-                response = self.client.conversations_members(
-                    channel=channel_id,
-                    cursor=cursor,
-                    limit=200  # More conservative limit to avoid rate limiting
-                )
-                self._handle_response(response)
-                
-                # Add members from this page
-                all_members.extend(response["members"])
-                
-                # Check if there are more pages
-                cursor = response.get("response_metadata", {}).get("next_cursor")
-                if not cursor:
-                    break
-                
-                logger.debug(f"Fetched {len(all_members)} channel members, getting next page...")
-                # Add delay between requests to avoid rate limiting
-                time.sleep(1)
-            
+            all_members = await self._collect("conversations.members", "members", channel=channel_id)
             logger.info(f"Total channel members fetched: {len(all_members)}")
             return all_members
         except SlackApiError as e:
             logger.error(f"Error getting channel members: {str(e)}")
             raise
 
-    def get_bot_info(self, bot_id: str) -> dict:
+    async def get_bot_info(self, bot_id: str) -> dict:
         """Get information about a bot user."""
         try:
-            response = self.client.bots_info(bot=bot_id)
-            self._handle_response(response)
+            response = await self._call("bots.info", bot=bot_id)
             return response["bot"]
         except SlackApiError as e:
             logger.error(f"Error getting bot info: {str(e)}")
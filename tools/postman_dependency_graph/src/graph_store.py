@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Postman Dependency Graph Store
+Compiled adjacency store with transitive closures, so that dependency, impact
+and setup-path queries don't need to re-read the YAML. Closures are computed
+on first use per endpoint, and for every endpoint when the graph is saved.
+"""
+
+import pickle
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Set, Any, Optional, FrozenSet, Iterable
+
+FORMAT_VERSION = 1
+
+
+class DependencyGraph:
+    def __init__(self, endpoints: Dict[str, Dict[str, Any]]):
+        """Build adjacency lists from endpoint data; closures are filled in lazily."""
+        self.endpoints = endpoints
+        # endpoint -> endpoints it depends on (setters of its dynamic variables)
+        self.dependencies: Dict[str, List[str]] = {}
+        # endpoint -> endpoints that depend on it
+        self.dependents: Dict[str, List[str]] = {ep: [] for ep in endpoints}
+
+        for endpoint, data in endpoints.items():
+            setters: Set[str] = set()
+            for var_data in (data.get('uses_variables') or {}).values():
+                if var_data.get('type') == 'dynamic':
+                    setters.update(s for s in var_data.get('set_by', []) if s in endpoints)
+            self.dependencies[endpoint] = sorted(setters)
+            for setter in setters:
+                self.dependents[setter].append(endpoint)
+
+        for endpoint in self.dependents:
+            self.dependents[endpoint].sort()
+
+        # Closure caches, filled per endpoint on first use, or all at once by save()
+        self.ancestors: Dict[str, FrozenSet[str]] = {}
+        self.descendants: Dict[str, FrozenSet[str]] = {}
+        self.setup_paths: Dict[str, List[str]] = {}
+
+    def compute_closures(self):
+        """Compute the closures of every endpoint, e.g. before writing a compiled graph."""
+        for endpoint in self.endpoints:
+            self.ancestors_of(endpoint)
+            self.descendants_of(endpoint)
+            self.setup_path_of(endpoint)
+
+    def ancestors_of(self, endpoint: str) -> FrozenSet[str]:
+        """Everything endpoint transitively depends on (cached)."""
+        if endpoint not in self.ancestors:
+            self.ancestors[endpoint] = self._reachable(endpoint, self.dependencies)
+        return self.ancestors[endpoint]
+
+    def descendants_of(self, endpoint: str) -> FrozenSet[str]:
+        """Everything that transitively depends on endpoint (cached)."""
+        if endpoint not in self.descendants:
+            self.descendants[endpoint] = self._reachable(endpoint, self.dependents)
+        return self.descendants[endpoint]
+
+    def setup_path_of(self, endpoint: str) -> List[str]:
+        """Setup path of endpoint over the whole graph (cached)."""
+        if endpoint not in self.setup_paths:
+            self.setup_paths[endpoint] = self._compute_setup_path(endpoint)
+        return self.setup_paths[endpoint]
+
+    @classmethod
+    def from_dependencies(cls, dependencies: Dict) -> 'DependencyGraph':
+        """Build graph from the postman_collection_dependencies structure."""
+        endpoints = dependencies.get('postman_collection_dependencies', {}).get('endpoints', {})
+        return cls(endpoints)
+
+    @classmethod
+    def load(cls, path: str) -> 'DependencyGraph':
+        """Load a compiled graph produced by save()."""
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Graph file not found: {path}")
+
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+
+        if not isinstance(payload, dict) or payload.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph file format: {path}")
+        return payload['graph']
+
+    def save(self, path: str):
+        """Write the compiled graph, with every closure precomputed, to disk."""
+        self.compute_closures()
+        with open(path, 'wb') as f:
+            pickle.dump({'format_version': FORMAT_VERSION, 'graph': self}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _reachable(start: str, adjacency: Dict[str, List[str]],
+                   excluded: FrozenSet[str] = frozenset()) -> FrozenSet[str]:
+        """Return every node reachable from start without passing through
+        excluded nodes, excluding start itself."""
+        seen = set()
+        queue = deque(adjacency.get(start, []))
+        while queue:
+            node = queue.popleft()
+            if node in seen or node == start or node in excluded:
+                continue
+            seen.add(node)
+            queue.extend(adjacency.get(node, []))
+        return frozenset(seen)
+
+    def _closure(self, endpoint: str, cached: FrozenSet[str], adjacency: Dict[str, List[str]],
+                 excluded: FrozenSet[str]) -> FrozenSet[str]:
+        """Filter a cached closure by excluded endpoints. Only when an excluded
+        endpoint lies inside the closure can it cut off other nodes, and only then
+        is the closure walked again without it."""
+        if not excluded or cached.isdisjoint(excluded):
+            return cached
+        return self._reachable(endpoint, adjacency, excluded)
+
+    def _compute_setup_path(self, endpoint: str, excluded: FrozenSet[str] = frozenset()) -> List[str]:
+        """Pick one setter per dynamic variable, preferring the cheapest one,
+        and return the requests to run before endpoint in execution order."""
+        required: List[str] = []
+        visiting: Set[str] = set()
+        done: Set[str] = set()
+
+        def visit(ep: str):
+            if ep in done or ep in visiting:
+                return
+            visiting.add(ep)
+            uses = self.endpoints[ep].get('uses_variables') or {}
+            for var in sorted(uses):
+                var_data = uses[var]
+                if var_data.get('type') != 'dynamic':
+                    continue
+                setters = [s for s in var_data.get('set_by', [])
+                           if s in self.endpoints and s not in visiting and s not in excluded]
+                if not setters or any(s in done for s in setters):
+                    continue
+                # Cheapest setter is the one with the smallest transitive closure
+                best = min(setters, key=lambda s: (len(self.ancestors_of(s)), s))
+                visit(best)
+            visiting.discard(ep)
+            done.add(ep)
+            required.append(ep)
+
+        visit(endpoint)
+        return required[:-1]
+
+    def depends_on(self, endpoint: str, transitive: bool = True,
+                   excluded: Iterable[str] = ()) -> List[str]:
+        """What does endpoint depend on, ignoring excluded endpoints."""
+        self._check_endpoint(endpoint)
+        excluded = frozenset(excluded)
+        if transitive:
+            return sorted(self._closure(endpoint, self.ancestors_of(endpoint), self.dependencies, excluded))
+        return [ep for ep in self.dependencies[endpoint] if ep not in excluded]
+
+    def impacted_by(self, endpoint: str, transitive: bool = True,
+                    excluded: Iterable[str] = ()) -> List[str]:
+        """What breaks if endpoint changes, ignoring excluded endpoints."""
+        self._check_endpoint(endpoint)
+        excluded = frozenset(excluded)
+        if transitive:
+            return sorted(self._closure(endpoint, self.descendants_of(endpoint), self.dependents, excluded))
+        return [ep for ep in self.dependents[endpoint] if ep not in excluded]
+
+    def setup_path(self, endpoint: str, excluded: Iterable[str] = ()) -> List[str]:
+        """Shortest ordered list of requests to run before endpoint, without excluded endpoints."""
+        self._check_endpoint(endpoint)
+        excluded = frozenset(excluded)
+        path = self.setup_path_of(endpoint)
+        # Excluded setters that weren't picked don't change the choice of the others
+        if excluded.intersection(path):
+            return self._compute_setup_path(endpoint, excluded)
+        return list(path)
+
+    def dependency_chain(self, endpoint: str, excluded: Iterable[str] = ()) -> List[str]:
+        """Endpoint and everything it depends on, each after its dependencies."""
+        self._check_endpoint(endpoint)
+        excluded = frozenset(excluded)
+        members = self._closure(endpoint, self.ancestors_of(endpoint), self.dependencies, excluded)
+        order: List[str] = []
+        done: Set[str] = set()
+        # Iterative post-order walk over the dependencies within the closure,
+        # visiting setters in the order the collection declares them
+        stack = [(endpoint, self._declared_setters(endpoint))]
+        done.add(endpoint)
+        while stack:
+            node, deps = stack[-1]
+            dep = next((d for d in deps if d in members and d not in done), None)
+            if dep is None:
+                stack.pop()
+                order.append(node)
+            else:
+                done.add(dep)
+                stack.append((dep, self._declared_setters(dep)))
+        return order
+
+    def _declared_setters(self, endpoint: str) -> Iterable[str]:
+        """Setters of endpoint's dynamic variables, in declaration order."""
+        for var_data in (self.endpoints[endpoint].get('uses_variables') or {}).values():
+            if var_data.get('type') == 'dynamic':
+                yield from var_data.get('set_by', [])
+
+    def _check_endpoint(self, endpoint: str):
+        if endpoint not in self.endpoints:
+            available = "\n  ".join(sorted(self.endpoints.keys()))
+            raise ValueError(f"Endpoint not found: {endpoint}\n\nAvailable endpoints:\n  {available}")
+
+    def __contains__(self, endpoint: str) -> bool:
+        return endpoint in self.endpoints
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
@@ -7,77 +7,44 @@ Shows dependency relationships between API endpoints based on variable usage.
 import sys
 import yaml
 from pathlib import Path
-from typing import Dict, Set, List, Any, Optional
+from typing import Dict, List, Any, Optional
+
+from graph_store import DependencyGraph
+
+# File suffixes treated as compiled graphs produced by main.py --compile
+COMPILED_SUFFIXES = ('.graph', '.pickle', '.pkl')
+QUERIES = ('depends-on', 'impact', 'setup')
 
 class DependencyGraphViewer:
     def __init__(self, yaml_path: str, target_endpoint: str, exclude_folders: Optional[List[str]] = None):
-        """Initialize with YAML file path and target endpoint."""
+        """Initialize with YAML or compiled graph file path and target endpoint."""
         self.yaml_path = yaml_path
         self.target_endpoint = target_endpoint
         self.exclude_folders = exclude_folders or []
-        self.dependencies = self._load_dependencies()
+        self.graph = self._load_graph()
+        # Excluded endpoints are filtered out of query results rather than removed from the graph
+        self.excluded = frozenset(ep for ep in self.graph.endpoints if self._should_exclude(ep))
         
-    def _load_dependencies(self) -> Dict:
-        """Load and validate dependencies from YAML file."""
+    def _load_graph(self) -> DependencyGraph:
+        """Load and validate dependencies from YAML file or compiled graph."""
         if not Path(self.yaml_path).exists():
             raise FileNotFoundError(f"YAML file not found: {self.yaml_path}")
             
-        with open(self.yaml_path) as f:
-            dependencies = yaml.safe_load(f)
+        if Path(self.yaml_path).suffix in COMPILED_SUFFIXES:
+            graph = DependencyGraph.load(self.yaml_path)
+        else:
+            with open(self.yaml_path) as f:
+                dependencies = yaml.safe_load(f)
+            graph = DependencyGraph.from_dependencies(dependencies)
             
-        endpoints = dependencies.get('postman_collection_dependencies', {}).get('endpoints', {})
-        if not endpoints:
+        if not len(graph):
             raise ValueError("No endpoints found in dependencies")
             
-        if self.target_endpoint not in endpoints:
-            available = "\n  ".join(sorted(endpoints.keys()))
+        if self.target_endpoint not in graph:
+            available = "\n  ".join(sorted(graph.endpoints.keys()))
             raise ValueError(f"Endpoint not found: {self.target_endpoint}\n\nAvailable endpoints:\n  {available}")
             
-        return self._filter_dependencies(dependencies)
-    
-    def _filter_dependencies(self, dependencies: Dict) -> Dict:
-        """Filter out excluded endpoints and their references."""
-        if not self.exclude_folders:
-            return dependencies
-            
-        filtered = dependencies.copy()
-        endpoints = filtered['postman_collection_dependencies']['endpoints']
-        
-        # Get all endpoints that should be kept
-        keep_endpoints = {
-            ep: data for ep, data in endpoints.items() 
-            if not self._should_exclude(ep)
-        }
-        
-        # Create new filtered dependencies with only kept endpoints
-        filtered['postman_collection_dependencies']['endpoints'] = {}
-        
-        # Process each kept endpoint
-        for ep, data in keep_endpoints.items():
-            new_data = data.copy()
-            
-            # Filter uses_variables to only reference kept endpoints
-            if 'uses_variables' in new_data:
-                new_uses = {}
-                for var, var_data in new_data['uses_variables'].items():
-                    if var_data['type'] == 'dynamic':
-                        # Only keep setters that aren't excluded
-                        new_setters = [
-                            setter for setter in var_data['set_by']
-                            if setter in keep_endpoints
-                        ]
-                        if new_setters:
-                            new_uses[var] = {
-                                'type': 'dynamic',
-                                'set_by': new_setters
-                            }
-                    else:
-                        new_uses[var] = var_data
-                new_data['uses_variables'] = new_uses
-            
-            filtered['postman_collection_dependencies']['endpoints'][ep] = new_data
-        
-        return filtered
+        return graph
     
     def _should_exclude(self, endpoint: str) -> bool:
         """Check if endpoint should be excluded."""
@@ -99,18 +66,24 @@ class DependencyGraphViewer:
     
     def _get_endpoint_info(self, endpoint: str) -> Dict[str, Any]:
         """Get endpoint's variable usage and setting info."""
-        endpoint_data = self.dependencies['postman_collection_dependencies']['endpoints'][endpoint]
+        endpoint_data = self.graph.endpoints[endpoint]
         info = {'endpoint': endpoint, 'uses': [], 'sets': [], 'dependencies': []}
         
         # Get variables used by endpoint
         if 'uses_variables' in endpoint_data:
             for var, data in endpoint_data['uses_variables'].items():
                 var_type = data['type']
+                setters = data.get('set_by', [])
+                if var_type == 'dynamic' and self.exclude_folders:
+                    # Dynamic variables only set by excluded endpoints are left out
+                    setters = [s for s in setters if s in self.graph and s not in self.excluded]
+                    if not setters:
+                        continue
                 info['uses'].append((var, var_type))
                 
                 # Track dependencies for dynamic variables
                 if var_type == 'dynamic':
-                    info['dependencies'].extend(data.get('set_by', []))
+                    info['dependencies'].extend(setters)
         
         # Get variables set by endpoint
         if 'sets_variables' in endpoint_data:
@@ -118,36 +91,19 @@ class DependencyGraphViewer:
         
         return info
     
-    def _build_dependency_chain(self, endpoint: str, visited: Optional[Set[str]] = None, seen_endpoints: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
-        """Build complete dependency chain for endpoint."""
-        if visited is None:
-            visited = set()
-        if seen_endpoints is None:
-            seen_endpoints = set()
-            
-        if endpoint in visited or self._should_exclude(endpoint):
+    def _build_dependency_chain(self, endpoint: str) -> List[Dict[str, Any]]:
+        """Build complete dependency chain for endpoint from the graph store."""
+        if endpoint in self.excluded:
             return []
             
-        visited.add(endpoint)
         chain = []
-        
-        # Get endpoint info
-        info = self._get_endpoint_info(endpoint)
-        
-        # Process dependencies first
-        for dep_endpoint in info['dependencies']:
-            if dep_endpoint not in visited and not self._should_exclude(dep_endpoint):
-                chain.extend(self._build_dependency_chain(dep_endpoint, visited, seen_endpoints))
-        
-        # Add this endpoint's info if we haven't seen it before
-        if endpoint not in seen_endpoints:
-            seen_endpoints.add(endpoint)
+        for dep_endpoint in self.graph.dependency_chain(endpoint, self.excluded):
+            info = self._get_endpoint_info(dep_endpoint)
             chain.append({
-                'endpoint': endpoint,
+                'endpoint': dep_endpoint,
                 'uses': sorted(info['uses']),
                 'sets': sorted(info['sets'])
             })
-        
         return chain
     
     def _format_chain(self, chain: List[Dict[str, Any]], indent: str = "  ") -> List[str]:
@@ -187,14 +143,40 @@ class DependencyGraphViewer:
         chain = self._build_dependency_chain(self.target_endpoint)
         lines = self._format_chain(chain)
         print("\n".join(lines))
+    
+    def display_query(self, query: str):
+        """Display the result of a depends-on, impact or setup query."""
+        if query == 'depends-on':
+            title = "Transitive dependencies of"
+            results = self.graph.depends_on(self.target_endpoint, excluded=self.excluded)
+        elif query == 'impact':
+            title = "Endpoints impacted by changes to"
+            results = self.graph.impacted_by(self.target_endpoint, excluded=self.excluded)
+        elif query == 'setup':
+            title = "Shortest setup path for"
+            results = self.graph.setup_path(self.target_endpoint, excluded=self.excluded)
+        else:
+            raise ValueError(f"Unknown query: {query} (expected one of: {', '.join(QUERIES)})")
+        
+        print(f"\n{title}: {self.target_endpoint}")
+        if self.exclude_folders:
+            print(f"Excluding folders: {', '.join(self.exclude_folders)}")
+        print("=" * 50)
+        
+        if query == 'setup':
+            lines = [f"{i}. {ep}" for i, ep in enumerate(results, 1)]
+        else:
+            lines = results
+        print("\n".join(lines) if lines else "(none)")
 
 def main():
     """Main entry point."""
     if len(sys.argv) < 3:
-        print("Usage: python graph_viewer.py <dependency_file.yml> <endpoint> [--exclude-folder <folder>...]")
+        print("Usage: python graph_viewer.py <dependency_file.yml|deps.graph> <endpoint> [--exclude-folder <folder>...] [--query <query>]")
         print("Example: python graph_viewer.py deps.yml 'GET Workflows/View Card' --exclude-folder 'tutorials' 'examples'")
         print("Options:")
         print("  --exclude-folder  Exclude requests from specified folders (can be used multiple times)")
+        print(f"  --query           Run a graph query instead of showing the chain: {', '.join(QUERIES)}")
         sys.exit(1)
     
     yaml_path = sys.argv[1]
@@ -202,9 +184,13 @@ def main():
     
     # Get excluded folders
     exclude_folders = []
+    query = None
     i = 3
     while i < len(sys.argv):
-        if sys.argv[i] == "--exclude-folder":
+        if sys.argv[i] == "--query" and i + 1 < len(sys.argv):
+            query = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == "--exclude-folder":
             i += 1
             while i < len(sys.argv) and not sys.argv[i].startswith("--"):
                 exclude_folders.append(sys.argv[i])
@@ -214,7 +200,10 @@ def main():
     
     try:
         viewer = DependencyGraphViewer(yaml_path, target_endpoint, exclude_folders)
-        viewer.display()
+        if query:
+            viewer.display_query(query)
+        else:
+            viewer.display()
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
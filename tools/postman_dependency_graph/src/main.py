@@ -5,11 +5,16 @@ Analyzes Postman collections to generate a text-based dependency graph
 showing relationships between API endpoints based on variable usage.
 """
 
+import hashlib
 import json
+import os
 import sys
 import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Any
+from typing import Dict, List, Set, Tuple, Any, Optional
+
+from graph_store import DependencyGraph
 
 def extract_script_variables(script: dict) -> Tuple[Set[str], Set[str]]:
     """Extract variables that are set and used in pre/post request scripts."""
@@ -170,15 +175,9 @@ def consolidate_variable_sets(endpoint_data: Dict) -> List[str]:
             all_vars.add(var)
     return sorted(list(all_vars))
 
-def analyze_collection(collection_path: str) -> Dict[str, Any]:
-    """Analyze Postman collection and generate dependency text output."""
-    with open(collection_path) as f:
-        collection = json.load(f)
-    
-    # Store endpoint dependencies
-    dependencies: Dict[str, Set[str]] = {}
-    # Store variables set by each endpoint
-    variables_set: Dict[str, Set[str]] = {}
+def collect_requests(collection: dict) -> Dict[str, dict]:
+    """Flatten collection folders into an ordered endpoint -> item mapping."""
+    requests: Dict[str, dict] = {}
     
     def process_item(item: dict, folder_path: str = ""):
         """Process a collection item (request or folder)."""
@@ -186,13 +185,7 @@ def analyze_collection(collection_path: str) -> Dict[str, Any]:
             # This is a request
             name = f"{folder_path}/{item['name']}" if folder_path else item['name']
             endpoint = f"{item['request'].get('method', 'GET')} {name}"
-            
-            # Analyze all dependencies including URL and scripts
-            set_vars, used_vars = analyze_request_dependencies(item)
-            
-            # Store used and set variables
-            dependencies[endpoint] = used_vars
-            variables_set[endpoint] = set_vars
+            requests[endpoint] = item
                 
         elif 'item' in item:
             # This is a folder
@@ -204,61 +197,321 @@ def analyze_collection(collection_path: str) -> Dict[str, Any]:
     for item in collection['item']:
         process_item(item)
     
+    return requests
+
+def hash_item(item: dict) -> str:
+    """Hash the parts of an item that affect its variable usage."""
+    payload = json.dumps({'request': item.get('request'), 'event': item.get('event')},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def build_endpoint_data(endpoint: str, used_vars: Set[str], set_vars: Set[str],
+                        setters_by_var: Dict[str, Set[str]]) -> Dict[str, Any]:
+    """Build the YAML entry for a single endpoint."""
+    endpoint_data = {}
+    
+    if used_vars:
+        used_variables = {}
+        for var in sorted(used_vars):
+            # Find setters for this variable, excluding self-references
+            setters = setters_by_var.get(var, set()) - {endpoint}
+            
+            if setters:
+                used_variables[var] = {
+                    "type": "dynamic",
+                    "set_by": sorted(setters)  # Sort for consistent output
+                }
+            else:
+                used_variables[var] = {
+                    "type": "environment"
+                }
+        endpoint_data["uses_variables"] = used_variables
+    
+    # Get variables set by this endpoint
+    if set_vars:
+        endpoint_data["sets_variables"] = sorted(list(set_vars))
+    
+    return endpoint_data
+
+def analyze_collection(collection_path: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Analyze Postman collection and generate dependency text output.
+    
+    When previous output is given, only requests whose hash changed are
+    re-analysed, and only endpoints using variables whose setters may have
+    changed get their set_by entries rebuilt.
+    """
+    with open(collection_path) as f:
+        collection = json.load(f)
+    
+    requests = collect_requests(collection)
+    item_hashes = {endpoint: hash_item(item) for endpoint, item in requests.items()}
+    
+    previous_data = (previous or {}).get('postman_collection_dependencies', {})
+    previous_endpoints = previous_data.get('endpoints') or {}
+    previous_hashes = previous_data.get('item_hashes') or {}
+    
+    # Store endpoint dependencies
+    dependencies: Dict[str, Set[str]] = {}
+    # Store variables set by each endpoint
+    variables_set: Dict[str, Set[str]] = {}
+    changed: Set[str] = set()
+    
+    for endpoint, item in requests.items():
+        if (endpoint in previous_endpoints
+                and previous_hashes.get(endpoint) == item_hashes[endpoint]):
+            previous_entry = previous_endpoints[endpoint] or {}
+            dependencies[endpoint] = set(previous_entry.get('uses_variables') or {})
+            variables_set[endpoint] = set(previous_entry.get('sets_variables') or [])
+        else:
+            # Analyze all dependencies including URL and scripts
+            set_vars, used_vars = analyze_request_dependencies(item)
+            dependencies[endpoint] = used_vars
+            variables_set[endpoint] = set_vars
+            changed.add(endpoint)
+    
+    # Variables whose set of setters may differ from the previous run
+    touched_vars: Set[str] = set()
+    for endpoint in changed | (set(previous_endpoints) - set(requests)):
+        previous_entry = previous_endpoints.get(endpoint) or {}
+        touched_vars.update(previous_entry.get('sets_variables') or [])
+        touched_vars.update(variables_set.get(endpoint, set()))
+    
+    setters_by_var: Dict[str, Set[str]] = {}
+    collection_setters: Dict[str, Dict[str, Set[str]]] = {}
+    for endpoint, vars_set in variables_set.items():
+        for var in vars_set:
+            setters_by_var.setdefault(var, set()).add(endpoint)
+            collection_setters.setdefault(endpoint_collection[endpoint], {}).setdefault(var, set()).add(endpoint)
+    
     # Generate YAML structure
     output = {
         "postman_collection_dependencies": {
-            "endpoints": {}
+            "endpoints": {},
+            "item_hashes": item_hashes
         }
     }
     
     # Build endpoint dependencies
     for endpoint, used_vars in dependencies.items():
-        endpoint_data = {}
-        
-        if used_vars:
-            used_variables = {}
-            for var in sorted(used_vars):
-                # Find which endpoints set this variable
-                # Find setters for this variable
-                setters = [ep for ep, vars_set in variables_set.items() 
-                          if var in vars_set and ep != endpoint]  # Exclude self-references
-                
-                if setters:
-                    used_variables[var] = {
-                        "type": "dynamic",
-                        "set_by": sorted(setters)  # Sort for consistent output
-                    }
-                else:
-                    used_variables[var] = {
-                        "type": "environment"
-                    }
-            endpoint_data["uses_variables"] = used_variables
-        
-        # Get variables set by this endpoint
-        vars_set = variables_set.get(endpoint, set())
-        if vars_set:
-            endpoint_data["sets_variables"] = sorted(list(vars_set))
-        
+        if (previous is not None and endpoint not in changed
+                and not used_vars & touched_vars):
+            endpoint_data = previous_endpoints[endpoint] or {}
+        else:
+            endpoint_data = build_endpoint_data(endpoint, used_vars, variables_set[endpoint],
+                                                setters_by_var)
         output["postman_collection_dependencies"]["endpoints"][endpoint] = endpoint_data
     
+    if previous is not None:
+        print(f"Incremental analysis: re-analysed {len(changed)} of {len(requests)} requests",
+              file=sys.stderr)
+    
+    return output
+
+def find_collection_files(paths: List[str]) -> List[Path]:
+    """Expand directories into the JSON files they contain."""
+    files: List[Path] = []
+    for path in paths:
+        p = Path(path)
+        if p.is_dir():
+            files.extend(sorted(p.rglob('*.json')))
+        else:
+            files.append(p)
+    return files
+
+def collection_ids(files: List[Path]) -> Dict[Path, str]:
+    """Name each collection by file stem, falling back to its path on clashes.
+    
+    Clashing paths are taken relative to the common parent of all inputs, so
+    IDs don't depend on where the workspace lives on disk.
+    """
+    stems: Dict[str, int] = {}
+    for f in files:
+        stem = f.name.split('.')[0]
+        stems[stem] = stems.get(stem, 0) + 1
+    
+    common = Path(os.path.commonpath([f.resolve().parent for f in files])) if files else Path()
+    ids = {}
+    for f in files:
+        stem = f.name.split('.')[0]
+        ids[f] = stem if stems[stem] == 1 else f.resolve().with_name(stem).relative_to(common).as_posix()
+    return ids
+
+def analyze_collection_file(collection_path: str) -> Optional[Tuple[Dict[str, Tuple[List[str], List[str]]], Dict[str, str]]]:
+    """Analyze one collection file in a worker process.
+    
+    Returns endpoint -> (used variables, set variables) and item hashes, or
+    None if the file is not a Postman collection.
+    """
+    with open(collection_path) as f:
+        collection = json.load(f)
+    
+    if not isinstance(collection, dict) or 'item' not in collection:
+        return None
+    
+    requests = collect_requests(collection)
+    analysis = {}
+    for endpoint, item in requests.items():
+        set_vars, used_vars = analyze_request_dependencies(item)
+        analysis[endpoint] = (sorted(used_vars), sorted(set_vars))
+    item_hashes = {endpoint: hash_item(item) for endpoint, item in requests.items()}
+    return analysis, item_hashes
+
+def qualify_endpoint(collection_id: str, endpoint: str) -> str:
+    """Prefix the endpoint path with its collection, keeping the method first."""
+    method, _, name = endpoint.partition(" ")
+    return f"{method} {collection_id}/{name}"
+
+def analyze_workspace(collection_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Analyze many collections concurrently and merge them into one graph.
+    
+    Endpoint IDs are qualified with the collection name. Setters are resolved
+    within the consumer's collection first; only variables that collection
+    never sets are resolved against the other collections, and those are
+    reported as cross-collection variables.
+    """
+    files = find_collection_files(collection_paths)
+    ids = collection_ids(files)
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(analyze_collection_file, str(f)): f for f in files}
+        for future in as_completed(futures):
+            f = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Warning: skipping {f}: {e}", file=sys.stderr)
+                continue
+            if result is None:
+                print(f"Warning: skipping {f}: not a Postman collection", file=sys.stderr)
+                continue
+            results[f] = result
+    
+    dependencies: Dict[str, Set[str]] = {}
+    variables_set: Dict[str, Set[str]] = {}
+    item_hashes: Dict[str, str] = {}
+    endpoint_collection: Dict[str, str] = {}
+    
+    # Merge in file order so output is stable regardless of completion order
+    for f in files:
+        if f not in results:
+            continue
+        analysis, hashes = results[f]
+        for endpoint, (used_vars, set_vars) in analysis.items():
+            qualified = qualify_endpoint(ids[f], endpoint)
+            dependencies[qualified] = set(used_vars)
+            variables_set[qualified] = set(set_vars)
+            item_hashes[qualified] = hashes[endpoint]
+            endpoint_collection[qualified] = ids[f]
+    
+    setters_by_var: Dict[str, Set[str]] = {}
+    collection_setters: Dict[str, Dict[str, Set[str]]] = {}
+    for endpoint, vars_set in variables_set.items():
+        for var in vars_set:
+            setters_by_var.setdefault(var, set()).add(endpoint)
+            collection_setters.setdefault(endpoint_collection[endpoint], {}).setdefault(var, set()).add(endpoint)
+    
+    output = {
+        "postman_collection_dependencies": {
+            "collections": [ids[f] for f in files if f in results],
+            "endpoints": {},
+            "cross_collection_variables": {},
+            "item_hashes": item_hashes
+        }
+    }
+    
+    cross_collection: Dict[str, Dict[str, Set[str]]] = {}
+    for endpoint, used_vars in dependencies.items():
+        consumer = endpoint_collection[endpoint]
+        own_setters = collection_setters.get(consumer, {})
+        resolved_setters: Dict[str, Set[str]] = {}
+        for var in used_vars:
+            if var in own_setters:
+                resolved_setters[var] = own_setters[var]
+            elif var in setters_by_var:
+                # Fall back to other collections only for variables this one never sets
+                resolved_setters[var] = setters_by_var[var]
+                entry = cross_collection.setdefault(var, {"set_in": set(), "used_in": set()})
+                entry["set_in"].update(endpoint_collection[s] for s in setters_by_var[var])
+                entry["used_in"].add(consumer)
+        
+        output["postman_collection_dependencies"]["endpoints"][endpoint] = build_endpoint_data(
+            endpoint, used_vars, variables_set[endpoint], resolved_setters)
+    
+    output["postman_collection_dependencies"]["cross_collection_variables"] = {
+        var: {"set_in": sorted(entry["set_in"]), "used_in": sorted(entry["used_in"])}
+        for var, entry in sorted(cross_collection.items())
+    }
+    
     return output
 
 def main():
     """Main entry point."""
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <path_to_collection.json>")
+    args = sys.argv[1:]
+    workspace = "--workspace" in args
+    if workspace:
+        args.remove("--workspace")
+    options = {}
+    for flag in ("--compile", "--previous", "--workers"):
+        if flag in args:
+            idx = args.index(flag)
+            if idx + 1 >= len(args):
+                print(f"Error: {flag} requires {'a number' if flag == '--workers' else 'a path'}")
+                sys.exit(1)
+            options[flag] = args[idx + 1]
+            del args[idx:idx + 2]
+    graph_path = options.get("--compile")
+    previous_path = options.get("--previous")
+    workers = None
+    if "--workers" in options:
+        try:
+            workers = int(options["--workers"])
+        except ValueError:
+            workers = 0
+        if workers < 1:
+            print(f"Error: --workers must be a positive integer, got '{options['--workers']}'")
+            sys.exit(1)
+    
+    if workspace:
+        if not args or previous_path:
+            print("Usage: python main.py --workspace <collection.json|dir>... [--workers <n>] [--compile <deps.graph>]")
+            sys.exit(1)
+        try:
+            output = analyze_workspace(args, workers)
+            yaml_str = yaml.dump(output, sort_keys=False, allow_unicode=True, default_flow_style=False)
+            print(yaml_str)
+            if graph_path:
+                DependencyGraph.from_dependencies(output).save(graph_path)
+        except Exception as e:
+            print(f"Error analyzing workspace: {e}")
+            sys.exit(1)
+        return
+    
+    if len(args) != 1:
+        print("Usage: python main.py <path_to_collection.json> [--previous <deps.yml>] [--compile <deps.graph>]")
+        print("       python main.py --workspace <collection.json|dir>... [--workers <n>] [--compile <deps.graph>]")
         sys.exit(1)
     
-    collection_path = sys.argv[1]
+    collection_path = args[0]
     if not Path(collection_path).exists():
         print(f"Error: Collection file not found: {collection_path}")
         sys.exit(1)
     
+    previous = None
+    if previous_path:
+        if not Path(previous_path).exists():
+            print(f"Error: Previous dependencies file not found: {previous_path}")
+            sys.exit(1)
+        with open(previous_path) as f:
+            previous = yaml.safe_load(f) or {}
+    
     try:
-        output = analyze_collection(collection_path)
+        output = analyze_collection(collection_path, previous)
         # Output YAML with proper formatting
         yaml_str = yaml.dump(output, sort_keys=False, allow_unicode=True, default_flow_style=False)
         print(yaml_str)
+        if graph_path:
+            DependencyGraph.from_dependencies(output).save(graph_path)
     except Exception as e:
         print(f"Error analyzing collection: {e}")
         sys.exit(1)
@@ -4,6 +4,9 @@ from jql_validator import JQLValidator
 from color_utils import Colors
 from prompts import JQL_QUERY
 
+# Fields shown when listing search results
+LIST_FIELDS = ['summary', 'status', 'created', 'updated']
+
 class JQLCommandHandler(BaseCommandHandler):
     def handle_jql(self, cmd, current_ticket=None, ticket_data=None):
         """Handle JQL search command"""
@@ -12,7 +15,7 @@ class JQLCommandHandler(BaseCommandHandler):
         fixed_query = JQLValidator.validate_and_fix(original_query)
         
         # Handle LIMIT clause
-        max_results = 50  # Default
+        max_results = None  # Default: all results
         if 'LIMIT' in fixed_query.upper():
             # Extract limit value
             limit_match = re.search(r'LIMIT\s+(\d+)', fixed_query, re.IGNORECASE)
@@ -26,25 +29,18 @@ class JQLCommandHandler(BaseCommandHandler):
         else:
             print(f"\nExecuting JQL: {Colors.colorize(fixed_query, Colors.YELLOW)}")
         
-        # Get all results and handle limit manually
-        issues = self.jira.search_issues(fixed_query)
-        if not issues:
-            return self.error("No tickets found")
-        
-        # Limit results if needed
-        if len(issues) > max_results:
-            issues = issues[:max_results]
-        
-        # Store first issue for comments command
-        if issues:
-            self.last_issue = issues[0]
-            
+        # Print tickets as result pages arrive
         result = []
-        print("\nFound tickets:")
-        for issue in issues:
+        for issue in self.jira.iter_issues(fixed_query, fields=LIST_FIELDS, max_results=max_results):
+            if not result:
+                # Store first issue for comments command
+                self.last_issue = issue
+                print("\nFound tickets:")
             ticket_info = self.format_ticket_info(issue)
             result.append(ticket_info)
             print(ticket_info)
+        if not result:
+            return self.error("No tickets found")
         result = "\n".join(result)
         
         # Add to history
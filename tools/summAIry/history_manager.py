@@ -1,11 +1,26 @@
 import readline
 import atexit
+import re
 from pathlib import Path
 from collections import deque
+from utils import estimate_tokens
+
+# Estimated tokens of command history included in each prompt
+CONTEXT_TOKEN_BUDGET = 1500
+# Characters of each result kept in the history
+MAX_RESULT_CHARS = 2000
+# Characters of a result kept in the one-line digest of an older command
+DIGEST_CHARS = 150
+# Older commands kept as one-line digests
+MAX_DIGESTS = 50
+
+ANSI_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
 
 class HistoryManager:
-    def __init__(self):
+    def __init__(self, token_budget=CONTEXT_TOKEN_BUDGET):
         self.command_history = deque(maxlen=10)  # Keep last 10 commands and their results
+        self.digests = deque(maxlen=MAX_DIGESTS)  # One-line digests of commands older than that
+        self.token_budget = token_budget
         self.last_ticket_url = None  # Store the last ticket URL
         self.setup_history()
 
@@ -36,13 +51,30 @@ class HistoryManager:
         """Add command and result to history"""
         if ticket_id and jira_url:
             self.last_ticket_url = f"{jira_url}/browse/{ticket_id}"
-            
+
+        # Keep the oldest entry as a digest before it drops out of the recent history
+        if len(self.command_history) == self.command_history.maxlen:
+            self.digests.append(self.command_history[0]['digest'])
+
+        # Store results without color codes and repeated whitespace, capped in length
+        result = ANSI_PATTERN.sub('', str(result))
+        result = re.sub(r'[ \t]+', ' ', re.sub(r'\n\s*\n+', '\n', result)).strip()
+        if len(result) > MAX_RESULT_CHARS:
+            result = result[:MAX_RESULT_CHARS] + '...'
+
+        text = f"\nCommand: {command}\nResult: {result}\n"
+        if ticket_id:
+            text += f"Ticket: {ticket_id}\n"
+        first_line = result.split('\n', 1)[0][:DIGEST_CHARS]
         self.command_history.append({
             'command': command,
             'result': result,
             'ticket_id': ticket_id,
             'ticket_data': ticket_data,
-            'url': self.last_ticket_url if ticket_id else None
+            'url': self.last_ticket_url if ticket_id else None,
+            'text': text,
+            'tokens': estimate_tokens(text),
+            'digest': f"- {command}{f' ({ticket_id})' if ticket_id else ''}: {first_line}"
         })
 
     def get_last_ticket_url(self):
@@ -50,14 +82,34 @@ class HistoryManager:
         return self.last_ticket_url
 
     def get_context(self):
-        """Get formatted history context"""
-        if not self.command_history:
+        """
+        Get formatted history context within the token budget.
+
+        The most recent commands are included with their results, newest first
+        until the budget is used; older commands only as one-line digests.
+        """
+        if not self.command_history and not self.digests:
             return ""
-            
-        context = "\nPrevious commands and results:\n"
-        for entry in self.command_history:
-            context += f"\nCommand: {entry['command']}\n"
-            context += f"Result: {entry['result']}\n"
-            if entry.get('ticket_id'):
-                context += f"Ticket: {entry['ticket_id']}\n"
-        return context
\ No newline at end of file
+
+        budget = self.token_budget
+        recent = []
+        entries = list(self.command_history)
+        while entries and entries[-1]['tokens'] <= budget:
+            entry = entries.pop()
+            recent.insert(0, entry['text'])
+            budget -= entry['tokens']
+
+        older = []
+        for digest in reversed(list(self.digests) + [entry['digest'] for entry in entries]):
+            tokens = estimate_tokens(digest)
+            if tokens > budget:
+                break
+            older.insert(0, digest)
+            budget -= tokens
+
+        context = ""
+        if older:
+            context += "\nEarlier commands:\n" + "\n".join(older) + "\n"
+        if recent:
+            context += "\nPrevious commands and results:\n" + "".join(recent)
+        return context
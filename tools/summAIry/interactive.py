@@ -2,13 +2,15 @@ import sys
 import re
 from jira_client import JiraTicketManager
 from ollama_client import OllamaClient
+from summarizer import Summarizer
 from history_manager import HistoryManager
 from command_executor import CommandExecutor
 
 class InteractiveSession:
-    def __init__(self, jira_manager, ollama_client, debug=False):
+    def __init__(self, jira_manager, ollama_client, summarizer=None, debug=False):
         self.jira = jira_manager
         self.ollama = ollama_client
+        self.summarizer = summarizer or Summarizer(ollama_client)
         self.last_ticket = None
         self.last_summary = None
         self.chat_history = []
@@ -34,7 +36,7 @@ class InteractiveSession:
         print("Formatting ticket data...", file=sys.stderr)
         self.ticket_data = self.jira.format_ticket_data(issues)
 
-        summary = self.ollama.generate_summary(self.ticket_data, detailed=True)
+        summary = self.summarizer.summarize(self.ticket_data, detailed=True)
         if summary:
             self.last_ticket = ticket_id
             self.last_summary = summary
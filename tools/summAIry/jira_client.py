@@ -1,5 +1,5 @@
 from jira.exceptions import JIRAError
-from jiraclient import JiraClient, IssueFormatter
+from jiraclient import JiraClient, IssueFormatter, FORMAT_FIELDS
 
 class JiraTicketManager:
     def __init__(self, url, email, token):
@@ -49,6 +49,10 @@ class JiraTicketManager:
             print(f"Unexpected error: {e}")
             return None
 
+    def search_tickets(self, jql, max_results=None):
+        """Stream the tickets matching a JQL query, with the fields the formatter needs"""
+        return self.client.iter_issues(jql, fields=FORMAT_FIELDS, max_results=max_results)
+
     def format_ticket_data(self, issues):
         """Format ticket data for the LLM"""
         if not self.formatter:
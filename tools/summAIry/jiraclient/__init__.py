@@ -2,12 +2,13 @@ from .client import JiraClient
 from .comments import CommentManager
 from .stakeholders import StakeholderManager
 from .links import LinkManager
-from .formatter import IssueFormatter
+from .formatter import IssueFormatter, FORMAT_FIELDS
 
 __all__ = [
     'JiraClient',
     'CommentManager',
     'StakeholderManager',
     'LinkManager',
-    'IssueFormatter'
+    'IssueFormatter',
+    'FORMAT_FIELDS'
 ]
\ No newline at end of file
@@ -1,8 +1,16 @@
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from jira import JIRA
 from jira.exceptions import JIRAError
 from datetime import datetime, timedelta
 
+# Issues per search request; Jira returns at most 100 per page
+SEARCH_PAGE_SIZE = 100
+# Search pages requested at once from Jira Server/Data Center
+MAX_PARALLEL_PAGES = 4
+
 class JiraClient:
     def __init__(self, url, email, token):
         self.url = url
@@ -49,20 +57,88 @@ class JiraClient:
             print(f"Unexpected error: {e}", file=sys.stderr)
             return None
 
-    def search_issues(self, jql, max_results=50):
-        """Search for issues using JQL"""
+    def search_issues(self, jql, max_results=None, fields=None):
+        """Search for issues using JQL, returning all results unless max_results is given"""
         if not self.client:
             print("Error: Not connected to Jira", file=sys.stderr)
             return None
 
+        return list(self.iter_issues(jql, fields=fields, max_results=max_results))
+
+    def iter_issues(self, jql, fields=None, max_results=None):
+        """
+        Search for issues using JQL, yielding them as pages arrive.
+
+        Later pages load in the background while earlier issues are processed. Only
+        the given fields are fetched (all fields if None).
+        """
+        if not self.client:
+            print("Error: Not connected to Jira", file=sys.stderr)
+            return
+
+        page_size = min(SEARCH_PAGE_SIZE, max_results) if max_results else SEARCH_PAGE_SIZE
+        kwargs = {'maxResults': page_size}
+        if fields:
+            kwargs['fields'] = fields
+
         try:
-            return self.client.search_issues(jql, maxResults=max_results)
+            # Jira Cloud chains pages by token, other deployments page by offset
+            if getattr(self.client, '_is_cloud', False) and hasattr(self.client, 'enhanced_search_issues'):
+                pages = self._iter_token_pages(jql, kwargs, max_results)
+            else:
+                pages = self._iter_offset_pages(jql, kwargs, max_results)
+
+            count = 0
+            for page in pages:
+                for issue in page:
+                    yield issue
+                    count += 1
+                    if max_results and count >= max_results:
+                        return
         except JIRAError as e:
             print(f"Error searching issues: {e}", file=sys.stderr)
-            return None
         except Exception as e:
             print(f"Unexpected error: {e}", file=sys.stderr)
-            return None
+
+    def _iter_token_pages(self, jql, kwargs, max_results=None):
+        """Yield search pages chained by nextPageToken, prefetching the next page"""
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.client.enhanced_search_issues, jql, **kwargs)
+            while future:
+                page = future.result()
+                fetched += len(page)
+                token = getattr(page, 'nextPageToken', None)
+                if max_results and fetched >= max_results:
+                    token = None
+                future = executor.submit(
+                    self.client.enhanced_search_issues, jql, nextPageToken=token, **kwargs
+                ) if token else None
+                yield page
+
+    def _iter_offset_pages(self, jql, kwargs, max_results=None):
+        """Yield search pages by offset, fetching up to MAX_PARALLEL_PAGES at once"""
+        first = self.client.search_issues(jql, startAt=0, **kwargs)
+        yield first
+
+        total = first.total if not max_results else min(first.total, max_results)
+        starts = iter(range(kwargs['maxResults'], total, kwargs['maxResults']))
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_PAGES) as executor:
+            pending = deque(
+                executor.submit(self.client.search_issues, jql, startAt=start, **kwargs)
+                for start in islice(starts, MAX_PARALLEL_PAGES)
+            )
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    start = next(starts, None)
+                    if start is not None:
+                        pending.append(executor.submit(self.client.search_issues, jql, startAt=start, **kwargs))
+                    yield page
+            finally:
+                # Don't wait for pages nobody will read when the caller stops early
+                for future in pending:
+                    future.cancel()
 
     def get_recent_issues_by_user(self, username, days=30):
         """Get issues created by user in the last N days"""
@@ -5,11 +5,28 @@ class CommentManager:
     def __init__(self, client):
         self.client = client
 
-    def get_comments(self, issue):
-        """Fetch comments for a ticket"""
+    def fetch_comments(self, issue):
+        """Fetch the raw comments of a ticket, once, for formatting and stakeholders"""
         try:
+            # Issues fetched with all fields already embed their comments
+            embedded = getattr(issue.fields, 'comment', None)
+            if embedded is not None and len(embedded.comments) >= getattr(embedded, 'total', 0):
+                return embedded.comments
+
             print(f"Fetching comments for {issue.key}...", file=sys.stderr)
-            comments = self.client.comments(issue)
+            return self.client.comments(issue)
+        except JIRAError as e:
+            print(f"Warning: Could not fetch comments for {issue.key}: {e}", file=sys.stderr)
+            return []
+        except Exception as e:
+            print(f"Warning: Error fetching comments for {issue.key}: {e}", file=sys.stderr)
+            return []
+
+    def get_comments(self, issue, comments=None):
+        """Format comments for a ticket, fetching them unless already fetched"""
+        try:
+            if comments is None:
+                comments = self.fetch_comments(issue)
             return [
                 {
                     'author': comment.author.displayName,
@@ -18,9 +35,6 @@ class CommentManager:
                 }
                 for comment in comments
             ]
-        except JIRAError as e:
-            print(f"Warning: Could not fetch comments for {issue.key}: {e}", file=sys.stderr)
-            return []
         except Exception as e:
             print(f"Warning: Error processing comments for {issue.key}: {e}", file=sys.stderr)
-            return []
\ No newline at end of file
+            return []
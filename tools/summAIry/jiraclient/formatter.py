@@ -1,27 +1,57 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from .comments import CommentManager
 from .stakeholders import StakeholderManager
 from .links import LinkManager
+from .rate_limit import RateLimiter, RateLimitedClient
+
+# Jira requests made at once while enriching tickets
+MAX_WORKERS = 8
+# Requests per second across all workers, well below Jira Cloud's rate limits
+MAX_REQUESTS_PER_SECOND = 10
+
+# Fields format_ticket_data reads, for searches whose results are formatted
+FORMAT_FIELDS = [
+    'summary', 'description', 'status', 'issuetype', 'created', 'updated', 'reporter',
+    'assignee', 'comment', 'issuelinks', 'subtasks', 'customfield_10014'
+]
 
 class IssueFormatter:
-    def __init__(self, client):
-        self.client = client
-        self.comment_manager = CommentManager(client)
-        self.stakeholder_manager = StakeholderManager(client)
-        self.link_manager = LinkManager(client)
+    def __init__(self, client, max_workers=MAX_WORKERS, max_requests_per_second=MAX_REQUESTS_PER_SECOND):
+        self.client = RateLimitedClient(client, RateLimiter(max_requests_per_second))
+        self.max_workers = max_workers
+        self.comment_manager = CommentManager(self.client)
+        self.stakeholder_manager = StakeholderManager(self.client)
+        self.link_manager = LinkManager(self.client)
 
     def format_ticket_data(self, issues):
-        """Format ticket data for the LLM"""
+        """Format ticket data for the LLM, from a list or a stream of issues"""
         formatted = []
         all_stakeholders = set()
-        
-        for issue in issues:
+
+        # Fetch comments, watchers and links of all tickets concurrently, starting as
+        # soon as each issue arrives; comments are fetched once and shared between
+        # the comment list and the stakeholders
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            issues_seen = []
+            fetches = []
+            for issue in issues:
+                issues_seen.append(issue)
+                fetches.append((
+                    executor.submit(self.comment_manager.fetch_comments, issue),
+                    executor.submit(self.stakeholder_manager.fetch_watchers, issue),
+                    executor.submit(self.link_manager.get_linked_issues, issue)
+                ))
+        issues = issues_seen
+
+        for issue, (comments_future, watchers_future, links_future) in zip(issues, fetches):
             print(f"Processing data for {issue.key}...", file=sys.stderr)
             
             # Get all related data
-            comments = self.comment_manager.get_comments(issue)
-            stakeholders = self.stakeholder_manager.get_stakeholders(issue)
-            linked_issues = self.link_manager.get_linked_issues(issue)
+            raw_comments = comments_future.result()
+            comments = self.comment_manager.get_comments(issue, raw_comments)
+            stakeholders = self.stakeholder_manager.get_stakeholders(issue, raw_comments, watchers_future.result())
+            linked_issues = links_future.result()
             
             # Add stakeholders to global set
             all_stakeholders.update(stakeholders)
@@ -40,6 +70,7 @@ class IssueFormatter:
                 'description': issue.fields.description or '',
                 'status': issue.fields.status.name,
                 'type': issue.fields.issuetype.name,
+                'updated': getattr(issue.fields, 'updated', None),
                 'comments': comments,
                 'stakeholders': stakeholders,
                 'links': links
@@ -1,59 +1,90 @@
 import sys
 from jira.exceptions import JIRAError
 
+# Default bounds of the linked-issue traversal
+MAX_LINK_DEPTH = 2      # Levels of links followed from the ticket
+MAX_LINKED_ISSUES = 50  # Linked issues returned per ticket
+
+# Only the fields format_link_data needs, plus the links to continue the traversal
+LINK_FIELDS = ['summary', 'issuelinks']
+
+# Keys per `key in (...)` search, keeping the JQL well within request limits
+SEARCH_BATCH_SIZE = 100
+
 class LinkManager:
-    def __init__(self, client):
+    def __init__(self, client, max_depth=MAX_LINK_DEPTH, max_issues=MAX_LINKED_ISSUES):
         self.client = client
-        self.visited = set()  # Track visited tickets to prevent cycles
+        self.max_depth = max_depth
+        self.max_issues = max_issues
+        self.fetched = {}  # Linked issues already fetched, by key
+
+    def fetch_issues(self, keys):
+        """Fetch issues by key with one JQL search per batch, reusing already fetched issues"""
+        missing = [key for key in keys if key not in self.fetched]
+        for start in range(0, len(missing), SEARCH_BATCH_SIZE):
+            batch = missing[start:start + SEARCH_BATCH_SIZE]
+            try:
+                # Without query validation, deleted or inaccessible keys are skipped instead of failing the search
+                issues = self.client.search_issues(
+                    f"key in ({','.join(batch)})",
+                    maxResults=len(batch),
+                    fields=LINK_FIELDS,
+                    validate_query=False
+                )
+                for issue in issues:
+                    self.fetched[issue.key] = issue
+            except JIRAError as e:
+                print(f"Warning: Could not fetch linked issues {', '.join(batch)}: {e}", file=sys.stderr)
+        return {key: self.fetched[key] for key in keys if key in self.fetched}
 
     def get_linked_issues(self, issue):
-        """Get all linked issues"""
+        """
+        Get issues linked to a ticket, breadth first.
+
+        Each level of links is fetched with a single search. The traversal stops after
+        max_depth levels or once max_issues linked issues have been found.
+        """
         linked_issues = []
-        
-        # Skip if we've already processed this ticket
-        if issue.key in self.visited:
-            return linked_issues
-            
-        self.visited.add(issue.key)
-        
+        visited = {issue.key}  # Tickets already reached, to prevent cycles
+        frontier = [issue]
+        depth = 0
+
         try:
-            if hasattr(issue.fields, 'issuelinks') and issue.fields.issuelinks:
-                print(f"Fetching linked issues for {issue.key}...", file=sys.stderr)
-                for link in issue.fields.issuelinks:
-                    try:
+            while frontier and depth < self.max_depth:
+                depth += 1
+                pending = []
+                for parent in frontier:
+                    for link in getattr(parent.fields, 'issuelinks', None) or []:
                         if hasattr(link, 'outwardIssue'):
-                            linked_key = link.outwardIssue.key
-                            if linked_key not in self.visited:
-                                linked = self.client.issue(linked_key)
-                                linked_issues.append({
-                                    'issue': linked,
-                                    'type': link.type.outward,
-                                    'direction': 'outward'
-                                })
-                                
-                                # Recursively get links from linked issues
-                                nested_links = self.get_linked_issues(linked)
-                                linked_issues.extend(nested_links)
-                            
+                            linked_key, link_type, direction = link.outwardIssue.key, link.type.outward, 'outward'
                         elif hasattr(link, 'inwardIssue'):
-                            linked_key = link.inwardIssue.key
-                            if linked_key not in self.visited:
-                                linked = self.client.issue(linked_key)
-                                linked_issues.append({
-                                    'issue': linked,
-                                    'type': link.type.inward,
-                                    'direction': 'inward'
-                                })
-                                
-                                # Recursively get links from linked issues
-                                nested_links = self.get_linked_issues(linked)
-                                linked_issues.extend(nested_links)
-                            
-                    except JIRAError as e:
-                        print(f"Warning: Could not fetch linked issue: {e}", file=sys.stderr)
+                            linked_key, link_type, direction = link.inwardIssue.key, link.type.inward, 'inward'
+                        else:
+                            continue
+                        if linked_key in visited or len(visited) > self.max_issues:
+                            continue
+                        visited.add(linked_key)
+                        pending.append((linked_key, link_type, direction))
+
+                if not pending:
+                    break
+                print(f"Fetching {len(pending)} linked issues for {issue.key} (depth {depth})...", file=sys.stderr)
+                fetched = self.fetch_issues([key for key, _, _ in pending])
+
+                frontier = []
+                for linked_key, link_type, direction in pending:
+                    linked = fetched.get(linked_key)
+                    if linked is None:
+                        continue
+                    linked_issues.append({
+                        'issue': linked,
+                        'type': link_type,
+                        'direction': direction
+                    })
+                    frontier.append(linked)
         except Exception as e:
             print(f"Warning: Error processing issue links for {issue.key}: {e}", file=sys.stderr)
-        
+
         return linked_issues
 
     def format_link_data(self, link):
@@ -67,4 +98,4 @@ class LinkManager:
             }
         except Exception as e:
             print(f"Warning: Error formatting link data: {e}", file=sys.stderr)
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,36 @@
+import threading
+import time
+
+class RateLimiter:
+    """Space calls evenly so all threads together stay under a request rate"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Wait for the next free request slot"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class RateLimitedClient:
+    """Jira client proxy passing every API call through a shared rate limiter"""
+
+    def __init__(self, client, limiter):
+        self.client = client
+        self.limiter = limiter
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.limiter.acquire()
+            return attr(*args, **kwargs)
+        return call
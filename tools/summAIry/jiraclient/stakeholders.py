@@ -5,8 +5,19 @@ class StakeholderManager:
     def __init__(self, client):
         self.client = client
 
-    def get_stakeholders(self, issue):
-        """Extract stakeholders from ticket"""
+    def fetch_watchers(self, issue):
+        """Fetch the watchers of a ticket"""
+        try:
+            return self.client.watchers(issue).watchers
+        except JIRAError as e:
+            print(f"Warning: Could not fetch watchers for {issue.key}: {e}", file=sys.stderr)
+            return []
+        except Exception as e:
+            print(f"Warning: Error fetching watchers for {issue.key}: {e}", file=sys.stderr)
+            return []
+
+    def get_stakeholders(self, issue, comments=None, watchers=None):
+        """Extract stakeholders from ticket, reusing already fetched comments and watchers"""
         stakeholders = set()
         
         try:
@@ -27,28 +38,28 @@ class StakeholderManager:
                 ))
             
             # Add commenters
-            try:
-                comments = self.client.comments(issue)
-                for comment in comments:
-                    stakeholders.add((
-                        comment.author.displayName,
-                        'Commenter',
-                        comment.author.emailAddress
-                    ))
-            except JIRAError as e:
-                print(f"Warning: Could not fetch commenters for {issue.key}: {e}", file=sys.stderr)
+            if comments is None:
+                try:
+                    comments = self.client.comments(issue)
+                except JIRAError as e:
+                    print(f"Warning: Could not fetch commenters for {issue.key}: {e}", file=sys.stderr)
+                    comments = []
+            for comment in comments:
+                stakeholders.add((
+                    comment.author.displayName,
+                    'Commenter',
+                    comment.author.emailAddress
+                ))
             
             # Add watchers
-            try:
-                watchers = self.client.watchers(issue)
-                for watcher in watchers.watchers:
-                    stakeholders.add((
-                        watcher.displayName,
-                        'Watcher',
-                        watcher.emailAddress
-                    ))
-            except JIRAError as e:
-                print(f"Warning: Could not fetch watchers for {issue.key}: {e}", file=sys.stderr)
+            if watchers is None:
+                watchers = self.fetch_watchers(issue)
+            for watcher in watchers:
+                stakeholders.add((
+                    watcher.displayName,
+                    'Watcher',
+                    watcher.emailAddress
+                ))
             
             return list(stakeholders)
             
@@ -5,6 +5,7 @@ import sys
 from dotenv import load_dotenv
 from jira_client import JiraTicketManager
 from ollama_client import OllamaClient
+from summarizer import Summarizer, TOKEN_BUDGET
 from interactive import InteractiveSession
 from utils import validate_ticket_id, get_missing_credentials
 
@@ -14,12 +15,14 @@ def main():
 
     parser = argparse.ArgumentParser(description='Summarize Jira tickets using Ollama')
     parser.add_argument('ticket_id', nargs='?', help='Jira ticket ID (e.g. PROJ-123)')
+    parser.add_argument('--jql', help='Summarize all tickets matching a JQL query instead of a single ticket')
     parser.add_argument('--jira-url', help='Jira instance URL (or set JIRA_URL env var)')
     parser.add_argument('--jira-token', help='Jira API token (or set JIRA_TOKEN env var)')
     parser.add_argument('--jira-email', help='Jira account email (or set JIRA_EMAIL env var)')
     parser.add_argument('--ollama-url', help='Ollama API URL (or set OLLAMA_URL env var)')
     parser.add_argument('--ollama-model', help='Ollama model to use (or set OLLAMA_MODEL env var)')
     parser.add_argument('--summary', action='store_true', help='Generate detailed summary instead of key points')
+    parser.add_argument('--token-budget', type=int, help=f'Estimated tokens of ticket data per prompt before summarizing in chunks (or set OLLAMA_TOKEN_BUDGET env var, default {TOKEN_BUDGET})')
     parser.add_argument('--interactive', '-i', action='store_true', help='Run in interactive mode')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging of model messages')
     parser.add_argument('--debug', '-d', action='store_true', help='Enable debug logging')
@@ -31,6 +34,14 @@ def main():
     jira_email = args.jira_email or os.getenv('JIRA_EMAIL')
     ollama_url = args.ollama_url or os.getenv('OLLAMA_URL', 'http://localhost:11434')
     ollama_model = args.ollama_model or os.getenv('OLLAMA_MODEL', 'mistral')
+    token_budget = args.token_budget or os.getenv('OLLAMA_TOKEN_BUDGET', TOKEN_BUDGET)
+    try:
+        token_budget = int(token_budget)
+        if token_budget <= 0:
+            raise ValueError
+    except ValueError:
+        print(f"Error: Invalid token budget '{token_budget}', expected a positive integer", file=sys.stderr)
+        sys.exit(1)
     
     # Check for missing credentials
     missing = get_missing_credentials(jira_url, jira_token, jira_email)
@@ -46,37 +57,47 @@ def main():
         
     # Initialize Ollama client
     ollama = OllamaClient(ollama_url, ollama_model, verbose=args.verbose, debug=args.debug)
+    summarizer = Summarizer(ollama, token_budget=token_budget)
     
     if args.interactive:
         # Run interactive session
-        session = InteractiveSession(jira, ollama, debug=args.debug)
+        session = InteractiveSession(jira, ollama, summarizer, debug=args.debug)
         if args.ticket_id and validate_ticket_id(args.ticket_id):
             session.process_ticket(args.ticket_id)
         session.run()
     else:
-        # Single ticket mode
-        if not args.ticket_id:
-            parser.error("ticket_id is required in non-interactive mode")
+        if args.jql:
+            # JQL mode: tickets are formatted while later result pages are still loading
+            print(f"Searching tickets matching: {args.jql}", file=sys.stderr)
+            ticket_data = jira.format_ticket_data(jira.search_tickets(args.jql))
+            if not ticket_data or not ticket_data['tickets']:
+                print("No tickets found or accessible", file=sys.stderr)
+                sys.exit(1)
+            print(f"Found {len(ticket_data['tickets'])} tickets", file=sys.stderr)
+        else:
+            # Single ticket mode
+            if not args.ticket_id:
+                parser.error("ticket_id or --jql is required in non-interactive mode")
+                
+            # Validate ticket ID format
+            if not validate_ticket_id(args.ticket_id):
+                print("Error: Invalid ticket ID format. Expected format: PROJECT-123", file=sys.stderr)
+                sys.exit(1)
             
-        # Validate ticket ID format
-        if not validate_ticket_id(args.ticket_id):
-            print("Error: Invalid ticket ID format. Expected format: PROJECT-123", file=sys.stderr)
-            sys.exit(1)
-        
-        # Get tickets
-        issues = jira.get_related_tickets(args.ticket_id)
-        if not issues:
-            print("No tickets found or accessible", file=sys.stderr)
-            sys.exit(1)
-        
-        print(f"Found {len(issues)} related tickets", file=sys.stderr)
-        
-        # Format data
-        print("Formatting ticket data...", file=sys.stderr)
-        ticket_data = jira.format_ticket_data(issues)
+            # Get tickets
+            issues = jira.get_related_tickets(args.ticket_id)
+            if not issues:
+                print("No tickets found or accessible", file=sys.stderr)
+                sys.exit(1)
+            
+            print(f"Found {len(issues)} related tickets", file=sys.stderr)
+            
+            # Format data
+            print("Formatting ticket data...", file=sys.stderr)
+            ticket_data = jira.format_ticket_data(issues)
         
         # Get summary
-        summary = ollama.generate_summary(ticket_data, detailed=args.summary)
+        summary = summarizer.summarize(ticket_data, detailed=args.summary)
         if not summary:
             sys.exit(1)
         
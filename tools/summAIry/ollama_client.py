@@ -1,8 +1,13 @@
 import sys
 import json
+import time
 import requests
 import re
-from prompts import DETAILED_SUMMARY, CONCISE_SUMMARY, QUERY_RESPONSE
+from color_utils import Colors
+from prompts import DETAILED_SUMMARY, CONCISE_SUMMARY, QUERY_RESPONSE, CHUNK_SUMMARY, MERGE_NOTES
+
+# Seconds the server's model list and working API endpoint are reused before probing again
+CAPABILITY_TTL = 300
 
 class OllamaClient:
     def __init__(self, url, model, verbose=False, debug=False):
@@ -10,22 +15,39 @@ class OllamaClient:
         self.model = model
         self.verbose = verbose
         self.debug = debug
+        self.session = requests.Session()  # Keeps connections to the server open between requests
+        self.models = None
+        self.models_checked_at = 0
+        self.endpoint = None  # 'generate', or 'chat' for servers without /api/generate
+        self.endpoint_checked_at = 0
         
     def debug_log(self, message):
         """Print debug message if debug mode is enabled"""
         if self.debug:
             print(Colors.colorize(f"[DEBUG] {message}", Colors.MAGENTA), file=sys.stderr)
 
-    def check_model_availability(self):
-        """Check if the specified model is available"""
+    def get_models(self):
+        """Get the models available on the server, cached for CAPABILITY_TTL seconds"""
+        if self.models is not None and time.monotonic() - self.models_checked_at < CAPABILITY_TTL:
+            return self.models
         try:
-            response = requests.get(f"{self.url}/api/tags")
+            response = self.session.get(f"{self.url}/api/tags")
             if response.status_code == 200:
-                models = [m['name'] for m in response.json().get('models', [])]
-                return self.model in models
-            return False
+                self.models = [m['name'] for m in response.json().get('models', [])]
+                self.debug_log(f"Available models: {self.models}")
+            else:
+                self.models = []
         except:
-            return False
+            self.models = []
+        # Failed probes are cached too, so an unreachable server isn't probed before every request
+        self.models_checked_at = time.monotonic()
+        return self.models
+
+    def check_model_availability(self):
+        """Check if the specified model is available"""
+        models = self.get_models()
+        # Models pulled without a tag are listed as name:latest
+        return self.model in models or f"{self.model}:latest" in models
 
     def clean_response(self, text):
         """Remove thinking blocks and clean up the response"""
@@ -58,11 +80,63 @@ class OllamaClient:
     def generate_summary(self, ticket_data, detailed=False):
         """Generate a summary using Ollama"""
         prompt = DETAILED_SUMMARY if detailed else CONCISE_SUMMARY
-        return self._send_request(prompt.format(ticket_data=json.dumps(ticket_data, indent=2)))
+        return self._send_request(prompt.format(ticket_data=json.dumps(ticket_data, separators=(',', ':'))))
+
+    def generate_ticket_notes(self, tickets):
+        """Generate one short note per ticket, for map-reduce summaries"""
+        return self._send_request(CHUNK_SUMMARY.format(tickets=tickets))
+
+    def merge_notes(self, notes):
+        """Condense ticket notes into fewer lines, for map-reduce summaries"""
+        return self._send_request(MERGE_NOTES.format(notes="\n".join(notes)))
 
     def generate_response(self, context, query):
         """Generate a response to a user query about a ticket"""
         return self._send_request(QUERY_RESPONSE.format(context=context, query=query))
+
+    def is_missing_endpoint(self, response):
+        """Check if a 404 means the endpoint is missing, rather than an error such as an unknown model"""
+        if response.status_code != 404:
+            return False
+        try:
+            # Ollama's own errors are JSON with an 'error' field; missing routes are plain text
+            return 'error' not in response.json()
+        except ValueError:
+            return True
+
+    def _post(self, prompt):
+        """Send a prompt to the cached API endpoint, falling back to /api/chat on older Ollama versions"""
+        if self.endpoint is None or time.monotonic() - self.endpoint_checked_at >= CAPABILITY_TTL:
+            self.endpoint = 'generate'
+            self.endpoint_checked_at = time.monotonic()
+
+        if self.endpoint == 'generate':
+            response = self.session.post(
+                f"{self.url}/api/generate",
+                json={
+                    'model': self.model,
+                    'prompt': prompt,
+                    'stream': False
+                }
+            )
+            if not self.is_missing_endpoint(response):
+                response.raise_for_status()
+                return response.json()
+
+            print("Trying alternative endpoint...", file=sys.stderr)
+            self.endpoint = 'chat'
+
+        response = self.session.post(
+            f"{self.url}/api/chat",
+            json={
+                'model': self.model,
+                'messages': [{'role': 'user', 'content': prompt}],
+                'stream': False
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+
     def _send_request(self, prompt):
         """Send request to Ollama API"""
         try:
@@ -78,56 +152,20 @@ class OllamaClient:
                 print(f"Warning: Model '{self.model}' not found. You may need to run: ollama pull {self.model}", file=sys.stderr)
                 print("Attempting to proceed anyway...", file=sys.stderr)
             
-            # Try /api/generate endpoint first
-            try:
-                response = requests.post(
-                    f"{self.url}/api/generate",
-                    json={
-                        'model': self.model,
-                        'prompt': prompt,
-                        'stream': False
-                    }
-                )
-                
-                if response.status_code == 404:
-                    raise requests.exceptions.RequestException("API endpoint not found")
-                    
-                response.raise_for_status()
-                result = response.json()
-                
-                if 'response' in result:
-                    response_text = self.clean_response(result['response'])
-                    if self.verbose:
-                        print("\n=== Model Response ===", file=sys.stderr)
-                        print(response_text, file=sys.stderr)
-                        print("===================\n", file=sys.stderr)
-                    return response_text
-                    
-            except requests.exceptions.RequestException:
-                print("Trying alternative endpoint...", file=sys.stderr)
-                # Try alternative endpoint for older Ollama versions
-                response = requests.post(
-                    f"{self.url}/api/chat",
-                    json={
-                        'model': self.model,
-                        'messages': [{'role': 'user', 'content': prompt}],
-                        'stream': False
-                    }
-                )
-                
-                response.raise_for_status()
-                result = response.json()
-                
-                if 'message' in result:
-                    response_text = self.clean_response(result['message']['content'])
-                    if self.verbose:
-                        print("\n=== Model Response ===", file=sys.stderr)
-                        print(response_text, file=sys.stderr)
-                        print("===================\n", file=sys.stderr)
-                    return response_text
-            
-            print("Warning: Unexpected response format", file=sys.stderr)
-            return self.clean_response(str(result))
+            result = self._post(prompt)
+            if 'response' in result:
+                response_text = self.clean_response(result['response'])
+            elif 'message' in result:
+                response_text = self.clean_response(result['message']['content'])
+            else:
+                print("Warning: Unexpected response format", file=sys.stderr)
+                return self.clean_response(str(result))
+
+            if self.verbose:
+                print("\n=== Model Response ===", file=sys.stderr)
+                print(response_text, file=sys.stderr)
+                print("===================\n", file=sys.stderr)
+            return response_text
                 
         except requests.exceptions.ConnectionError:
             print(f"Error: Could not connect to Ollama at {self.url}", file=sys.stderr)
@@ -135,8 +173,8 @@ class OllamaClient:
             return None
         except requests.exceptions.RequestException as e:
             print(f"Error communicating with Ollama: {e}", file=sys.stderr)
-            print("Response content:", e.response.text if hasattr(e, 'response') else "No response content", file=sys.stderr)
+            print("Response content:", e.response.text if getattr(e, 'response', None) is not None else "No response content", file=sys.stderr)
             return None
         except Exception as e:
             print(f"Unexpected error while getting response: {e}", file=sys.stderr)
-            return None
\ No newline at end of file
+            return None
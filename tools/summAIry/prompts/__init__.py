@@ -12,4 +12,6 @@ def load_prompt(name):
 DETAILED_SUMMARY = load_prompt('detailed_summary')
 CONCISE_SUMMARY = load_prompt('concise_summary')
 QUERY_RESPONSE = load_prompt('query_response')
-JQL_QUERY = load_prompt('jql_query')
\ No newline at end of file
+JQL_QUERY = load_prompt('jql_query')
+CHUNK_SUMMARY = load_prompt('chunk_summary')
+MERGE_NOTES = load_prompt('merge_notes')
\ No newline at end of file
@@ -0,0 +1,179 @@
+import sys
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from utils import estimate_tokens
+
+# Estimated tokens of ticket data per prompt; larger ticket sets are summarized in chunks
+TOKEN_BUDGET = 3000
+# Chunk prompts sent to Ollama at once
+MAX_PARALLEL_REQUESTS = 2
+# Attempts per chunk before falling back to the tickets' own summary lines
+CHUNK_ATTEMPTS = 2
+
+class Summarizer:
+    """
+    Map-reduce summaries for ticket sets too large for a single prompt.
+
+    Tickets are split into chunks that fit the token budget, and each chunk is
+    condensed into one note per ticket, several chunks at a time. Notes are cached
+    by ticket key and `updated` timestamp, so unchanged tickets are not summarized
+    again. While the notes still exceed the budget they are merged into fewer
+    lines, then the usual summary prompt is run over them.
+    """
+
+    def __init__(self, ollama, token_budget=TOKEN_BUDGET, max_parallel=MAX_PARALLEL_REQUESTS):
+        self.ollama = ollama
+        self.token_budget = token_budget
+        self.max_parallel = max_parallel
+        self.cache_file = Path.home() / '.config' / 'summAIry' / 'ticket_notes.json'
+        self.cache = self.load_cache()
+
+    def load_cache(self):
+        """Load cached ticket notes"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file) as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load ticket notes cache: {e}", file=sys.stderr)
+        return {}
+
+    def save_cache(self):
+        """Write cached ticket notes, replacing the file atomically"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.cache, f)
+            os.replace(tmp_path, self.cache_file)
+        except Exception as e:
+            print(f"Warning: Could not save ticket notes cache: {e}", file=sys.stderr)
+
+    def summarize(self, ticket_data, detailed=False):
+        """Summarize ticket data, in one prompt if it fits the token budget"""
+        if estimate_tokens(json.dumps(ticket_data, separators=(',', ':'))) <= self.token_budget:
+            return self.ollama.generate_summary(ticket_data, detailed=detailed)
+
+        tickets = ticket_data['tickets']
+        print(f"Ticket data exceeds the token budget, summarizing {len(tickets)} tickets in chunks...", file=sys.stderr)
+        notes, fallbacks = self.get_ticket_notes(tickets)
+        if len(notes) <= fallbacks:
+            # Nothing came from the model or the cache; it is most likely unreachable
+            print("Error: Could not summarize any tickets", file=sys.stderr)
+            return None
+        while len(notes) > 1 and estimate_tokens("\n".join(notes)) > self.token_budget:
+            merged = self.merge_notes(notes)
+            if estimate_tokens("\n".join(merged)) >= estimate_tokens("\n".join(notes)):
+                break  # The model is not condensing any further
+            notes = merged
+
+        return self.ollama.generate_summary({
+            'ticket_notes': notes,
+            'stakeholders': ticket_data.get('stakeholders', [])
+        }, detailed=detailed)
+
+    def chunk(self, texts):
+        """Group texts into chunks within the token budget"""
+        chunks = []
+        current, current_tokens = [], 0
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if current and current_tokens + tokens > self.token_budget:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def get_ticket_notes(self, tickets):
+        """
+        Get one note per ticket, from the cache or by summarizing chunks concurrently.
+
+        Returns the notes and how many of them are fallback lines for tickets the
+        model could not summarize.
+        """
+        tickets = list({ticket['key']: ticket for ticket in tickets}.values())
+        notes = {}
+        pending = []
+        for ticket in tickets:
+            cached = self.cache.get(ticket['key'])
+            if (cached and ticket.get('updated') and cached['updated'] == ticket['updated']
+                    and cached['model'] == self.ollama.model):
+                notes[ticket['key']] = cached['note']
+            else:
+                pending.append(ticket)
+        print(f"Using {len(notes)} cached ticket notes, summarizing {len(pending)} tickets...", file=sys.stderr)
+
+        # A single ticket larger than the budget is truncated to fit
+        max_chars = self.token_budget * 4
+        texts = {json.dumps(ticket, separators=(',', ':'))[:max_chars]: ticket for ticket in pending}
+        chunks = self.chunk(list(texts))
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            results = list(executor.map(self.summarize_chunk, chunks))
+
+        unmatched = []
+        fallbacks = 0
+        for chunk, result in zip(chunks, results):
+            chunk_tickets = [texts[text] for text in chunk]
+            if not result:
+                # Keep the tickets in the summary with their own summary and status
+                print(f"Warning: Could not summarize {len(chunk_tickets)} tickets, using their summary lines", file=sys.stderr)
+                for ticket in chunk_tickets:
+                    notes[ticket['key']] = self.fallback_note(ticket)
+                fallbacks += len(chunk_tickets)
+                continue
+            parsed = self.parse_notes(result, [ticket['key'] for ticket in chunk_tickets])
+            for ticket in chunk_tickets:
+                note = parsed.get(ticket['key'])
+                if note and ticket.get('updated'):
+                    self.cache[ticket['key']] = {'updated': ticket['updated'], 'model': self.ollama.model, 'note': note}
+                if note:
+                    notes[ticket['key']] = note
+            # Keep the output of chunks whose notes did not follow the expected format
+            if len(parsed) < len(chunk_tickets):
+                unmatched.append(result)
+        self.save_cache()
+
+        notes = [f"{ticket['key']}: {notes[ticket['key']]}" for ticket in tickets if ticket['key'] in notes]
+        return notes + unmatched, fallbacks
+
+    def summarize_chunk(self, chunk):
+        """Get the notes for a chunk of tickets, retrying failed requests"""
+        for _ in range(CHUNK_ATTEMPTS):
+            result = self.ollama.generate_ticket_notes("\n".join(chunk))
+            if result:
+                return result
+        return None
+
+    def fallback_note(self, ticket):
+        """Note built from a ticket's own fields, for tickets the model could not summarize"""
+        return f"{ticket.get('summary', '')} ({ticket.get('type', 'Ticket')}, {ticket.get('status', 'unknown status')})"
+
+    def parse_notes(self, text, keys):
+        """Extract 'KEY: note' lines for the given ticket keys"""
+        pattern = re.compile(r'^\W*(' + '|'.join(re.escape(key) for key in keys) + r')\W*[:\-]\s*(.+)$')
+        parsed = {}
+        for line in text.splitlines():
+            match = pattern.match(line.strip())
+            if match:
+                parsed[match.group(1)] = match.group(2).strip()
+        return parsed
+
+    def merge_notes(self, notes):
+        """Condense notes into fewer lines, merging chunks concurrently"""
+        print(f"Merging {len(notes)} ticket notes...", file=sys.stderr)
+        chunks = self.chunk(notes)
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            results = list(executor.map(self.ollama.merge_notes, chunks))
+
+        merged = []
+        for chunk, result in zip(chunks, results):
+            lines = [line.strip() for line in (result or "").splitlines() if line.strip()]
+            merged.extend(lines or chunk)
+        return merged
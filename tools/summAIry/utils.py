@@ -12,6 +12,10 @@ def validate_ticket_id(ticket_id):
         return False
     return True
 
+def estimate_tokens(text):
+    """Estimate the token count of a prompt; about four characters per token for English text and JSON"""
+    return len(text) // 4 + 1
+
 def validate_url(url):
     """Basic URL validation"""
     if not url: